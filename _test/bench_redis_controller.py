@@ -0,0 +1,177 @@
+"""Benchmark RedisController.get_value latency under concurrent set_value load.
+
+Runs entirely in-process against a fake Redis whose every command costs
+``--io-ms`` milliseconds, so the numbers show how much a reader waits on
+writers rather than raw Redis speed.
+
+    python3 _test/bench_redis_controller.py --seconds 3 --writers 2
+
+The "legacy-lock" row emulates the previous behaviour (get_value and the
+synchronous write path sharing one lock held across network I/O).
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import redis_controller
+from module.redis_controller import ParameterKey, RedisController
+
+
+class SlowRedisError(Exception):
+    pass
+
+
+class SlowPubSub:
+    def subscribe(self, *_channels):
+        pass
+
+    def unsubscribe(self):
+        pass
+
+    def close(self):
+        pass
+
+    def get_message(self, timeout=0.0):
+        time.sleep(min(timeout, 0.05))
+        return None
+
+
+class SlowPipeline:
+    def __init__(self, server):
+        self.server = server
+        self.ops = 0
+
+    def set(self, *_args):
+        self.ops += 1
+
+    def publish(self, *_args):
+        self.ops += 1
+
+    def execute(self):
+        self.server.io()
+
+
+class SlowRedis:
+    def __init__(self, io_s):
+        self.io_s = io_s
+
+    def io(self):
+        time.sleep(self.io_s)
+
+    def pubsub(self):
+        return SlowPubSub()
+
+    def scan_iter(self, match="*", count=None):
+        self.io()
+        return []
+
+    def mget(self, keys):
+        self.io()
+        return [None] * len(keys)
+
+    def set(self, *_args):
+        self.io()
+
+    def publish(self, *_args):
+        self.io()
+
+    def pipeline(self, transaction=True):
+        return SlowPipeline(self)
+
+
+class LegacyLockingController(RedisController):
+    """get_value/set_value as they behaved before the lock-free read path."""
+
+    def get_value(self, key, default=None):
+        with self.lock:
+            return self.cache.get(key, default)
+
+    def set_value(self, key, value):
+        key_name = key.value if isinstance(key, ParameterKey) else str(key)
+        with self.lock:
+            if self.cache.get(key_name) == str(value):
+                return
+            self.cache[key_name] = str(value)
+            self.r.set(key_name, value)
+            self.r.publish(self.channel, key_name)
+
+
+def build(cls, io_s, **kwargs):
+    server = SlowRedis(io_s)
+    fake_module = types.SimpleNamespace(
+        StrictRedis=lambda **_kw: server,
+        RedisError=SlowRedisError,
+    )
+    with patch.object(redis_controller, "redis", fake_module):
+        return cls(**kwargs)
+
+
+def run(label, controller, seconds, writers, write_hz):
+    stop = threading.Event()
+
+    def writer(offset):
+        frame = offset
+        while not stop.is_set():
+            frame += writers
+            controller.set_value(ParameterKey.FRAMECOUNT, frame)
+            controller.set_value(ParameterKey.BUFFER, frame % 17)
+            stop.wait(1.0 / write_hz)   # paced like per-frame stats updates
+
+    threads = [threading.Thread(target=writer, args=(i,), daemon=True) for i in range(writers)]
+    for t in threads:
+        t.start()
+
+    samples = []
+    deadline = time.perf_counter() + seconds
+    clock = time.perf_counter_ns
+    get = controller.get_value
+    while time.perf_counter() < deadline:
+        t0 = clock()
+        get("framecount")
+        get("iso")
+        get("fps")
+        samples.append((clock() - t0) / 3)
+        time.sleep(0)               # let writers run, like a GUI loop would
+
+    stop.set()
+    for t in threads:
+        t.join(timeout=2)
+    controller.stop_listener()
+
+    samples.sort()
+    pct = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))] / 1000.0
+    print(
+        f"{label:<16} reads={len(samples):>9} "
+        f"p50={pct(0.50):8.2f}µs p99={pct(0.99):9.2f}µs "
+        f"max={samples[-1] / 1000.0:10.2f}µs mean={statistics.fmean(samples) / 1000.0:8.2f}µs"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=2.0)
+    ap.add_argument("--writers", type=int, default=2)
+    ap.add_argument("--write-hz", type=float, default=500.0, help="set_value pairs per writer per second")
+    ap.add_argument("--io-ms", type=float, default=1.0, help="simulated cost per Redis command")
+    args = ap.parse_args()
+    io_s = args.io_ms / 1000.0
+
+    run("legacy-lock", build(LegacyLockingController, io_s, coalesce_writes=False),
+        args.seconds, args.writers, args.write_hz)
+    run("sync-writes", build(RedisController, io_s, coalesce_writes=False),
+        args.seconds, args.writers, args.write_hz)
+    run("coalesced", build(RedisController, io_s), args.seconds, args.writers, args.write_hz)
+
+
+if __name__ == "__main__":
+    main()
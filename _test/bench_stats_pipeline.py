@@ -0,0 +1,158 @@
+"""Replay cp_stats payloads through RedisListener and report messages/second.
+
+    python3 _test/bench_stats_pipeline.py --n 50000
+    python3 _test/bench_stats_pipeline.py --file cp_stats.jsonl
+
+``--file`` takes a ``module.stats_replay`` capture or one cp_stats payload
+per line (e.g. captured with ``redis-cli subscribe cp_stats``); otherwise a
+synthetic take is generated.
+The listener runs against a real RedisController backed by an in-memory
+Redis, so the numbers cover parsing, the cache look-ups and the batched
+writes but not the network.
+"""
+import argparse
+import datetime
+import json
+import logging
+import sys
+import time
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import redis_controller, redis_listener
+from module.redis_controller import RedisController
+from module.redis_listener import RedisListener
+from module.stats_pipeline import parse_stats
+from module.stats_replay import read_capture
+
+
+class NullPubSub:
+    def subscribe(self, *_channels):
+        pass
+
+    def unsubscribe(self):
+        pass
+
+    def close(self):
+        pass
+
+    def listen(self):
+        return iter(())
+
+    def get_message(self, timeout=0.0):
+        time.sleep(min(timeout, 0.05))
+        return None
+
+
+class NullPipeline:
+    def set(self, *_args):
+        pass
+
+    def publish(self, *_args):
+        pass
+
+    def execute(self):
+        pass
+
+
+class NullRedis:
+    def __init__(self, **_kwargs):
+        pass
+
+    def pubsub(self):
+        return NullPubSub()
+
+    def scan_iter(self, match="*", count=None):
+        return []
+
+    def mget(self, keys):
+        return [None] * len(keys)
+
+    def set(self, *_args):
+        pass
+
+    def publish(self, *_args):
+        pass
+
+    def pipeline(self, transaction=True):
+        return NullPipeline()
+
+
+def synthetic_take(n, fps, cameras=1):
+    frame_ns = int(1e9 / fps)
+    start = time.time_ns()
+    for j in range(n):
+        i, cam = divmod(j, cameras)
+        yield json.dumps({
+            "framerate": fps,
+            "colorTemp": 5600,
+            "frameCount": i,
+            "tcFrameCount": i + 1,
+            "droppedFrames": 0,
+            "writeFailures": 0,
+            "bufferSize": i % 4,
+            "bufferSizeMax": i % 6,
+            "framesInFlight": i % 3,
+            "sensorTimestamp": i * frame_ns,
+            "timestamp": start + i * frame_ns,
+            "cameraPort": f"cam{cam}",
+        }).encode()
+
+
+def build():
+    fake = types.SimpleNamespace(StrictRedis=NullRedis, RedisError=Exception)
+    with patch.object(redis_controller, "redis", fake), patch.object(redis_listener, "redis", fake):
+        controller = RedisController(host="localhost", port=6379, db=0)
+        listener = RedisListener(controller, ssd_monitor=None)
+    return controller, listener
+
+
+def main():
+    logging.disable(logging.WARNING)
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--file", type=Path, help="recorded cp_stats payloads, one per line")
+    ap.add_argument("--n", type=int, default=20_000, help="synthetic messages")
+    ap.add_argument("--fps", type=float, default=24.0)
+    ap.add_argument("--cameras", type=int, default=1, help="interleaved synthetic streams (1 or 2)")
+    ap.add_argument("--recording", action="store_true", help="replay with is_recording set")
+    args = ap.parse_args()
+
+    if args.file:
+        try:
+            _, records = read_capture(args.file)
+            payloads = [r[2].encode() for r in records if r[1] == "s"]
+        except (ValueError, OSError):
+            payloads = [line.strip().encode() for line in args.file.read_text().splitlines() if line.strip()]
+    else:
+        payloads = list(synthetic_take(args.n, args.fps, args.cameras))
+    if not payloads:
+        ap.error("no payloads to replay")
+
+    t0 = time.perf_counter()
+    for data in payloads:
+        parse_stats(data)
+    parse_s = time.perf_counter() - t0
+
+    controller, listener = build()
+    listener.is_recording = args.recording
+    now = datetime.datetime.now()
+    t0 = time.perf_counter()
+    for data in payloads:
+        listener.handle_stats_payload(data, now)
+    total_s = time.perf_counter() - t0
+    controller.stop_listener()
+
+    n = len(payloads)
+    print(f"messages={n}")
+    print(f"parse only      {n / parse_s:12,.0f} msg/s  {parse_s * 1e6 / n:7.1f} µs/msg")
+    print(f"full pipeline   {n / total_s:12,.0f} msg/s  {total_s * 1e6 / n:7.1f} µs/msg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Micro-benchmark: module.timecode vs the previous RedisController formatter.
+
+    python3 _test/bench_timecode.py --n 200000 --fps 24
+
+Times the per-frame work done for every stats message (epoch ns → TOD
+time-code) and by the recording timer (elapsed seconds → time-code).
+"""
+import argparse
+import math
+import sys
+import time
+import timeit
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.timecode import TimeOfDayClock, formatter_for
+
+
+# ── previous implementation, verbatim apart from dropping `self` ──────
+def legacy_format_timecode(seconds_total, frame_rate):
+    rate = int(round(frame_rate))
+    total_frames = int(round(seconds_total * rate))
+    frames = total_frames % rate
+    whole_seconds = total_frames // rate
+    secs = whole_seconds % 60
+    mins = (whole_seconds // 60) % 60
+    hours = whole_seconds // 3600
+    return f"{hours:02d}:{mins:02d}:{secs:02d}:{frames:02d}"
+
+
+def legacy_nanoseconds_to_timecode(ns, frame_rate):
+    epoch_sec = ns / 1_000_000_000
+    lt = time.localtime(epoch_sec)
+    tod_sec = (
+        lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec
+        + (epoch_sec - math.floor(epoch_sec))
+    )
+    tod_sec %= 86_400
+    return legacy_format_timecode(tod_sec, frame_rate)
+
+
+def bench(label, fn, n):
+    seconds = min(timeit.repeat(fn, number=1, repeat=5))
+    print(f"{label:<34} {seconds * 1e9 / n:8.1f} ns/call")
+    return seconds
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=200_000, help="calls per run")
+    ap.add_argument("--fps", type=float, default=24.0)
+    args = ap.parse_args()
+
+    n, fps = args.n, args.fps
+    frame_ns = int(1e9 / fps)
+    start_ns = time.time_ns()
+    stamps = [start_ns + i * frame_ns for i in range(n)]
+    elapsed = [i / fps for i in range(n)]
+
+    clock = TimeOfDayClock()
+    fmt = formatter_for(fps)
+
+    def old_tod():
+        for ns in stamps:
+            legacy_nanoseconds_to_timecode(ns, fps)
+
+    def new_tod():
+        for ns in stamps:
+            fmt.time_of_day_timecode(clock.since_midnight_ns(ns))
+
+    def old_elapsed():
+        for s in elapsed:
+            legacy_format_timecode(s, fps)
+
+    def new_elapsed():
+        for s in elapsed:
+            fmt.seconds_to_timecode(s)
+
+    print(f"fps={fps} drop_frame={fmt.drop_frame} n={n}")
+    old = bench("legacy  epoch ns → TOD", old_tod, n)
+    new = bench("timecode epoch ns → TOD", new_tod, n)
+    print(f"{'':<34} {old / new:8.2f}x")
+    old = bench("legacy  elapsed s → TC", old_elapsed, n)
+    new = bench("timecode elapsed s → TC", new_elapsed, n)
+    print(f"{'':<34} {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
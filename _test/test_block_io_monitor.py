@@ -0,0 +1,107 @@
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module.block_io_monitor import BlockIOMonitor, read_block_stat, read_dirty_kib
+from module.redis_controller import ParameterKey
+
+
+def stat_line(write_ios, write_sectors, write_ticks, in_flight, io_ticks):
+    fields = [10, 0, 80, 5, write_ios, 0, write_sectors, write_ticks, in_flight, io_ticks, 0, 0, 0, 0, 0]
+    return " ".join(str(v) for v in fields) + "\n"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.batches = []
+
+    def set_values(self, mapping):
+        self.batches.append(dict(mapping))
+
+
+class BlockIOMonitorTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.sys_root = Path(self._tmp.name, "sys")
+        self.proc_root = Path(self._tmp.name, "proc")
+        (self.sys_root / "class" / "block" / "sda1").mkdir(parents=True)
+        self.proc_root.mkdir()
+        self.write_stat(0, 0, 0, 0, 0)
+        self.write_meminfo(2048, 512)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_stat(self, *values):
+        (self.sys_root / "class" / "block" / "sda1" / "stat").write_text(stat_line(*values))
+
+    def write_meminfo(self, dirty_kib, writeback_kib):
+        (self.proc_root / "meminfo").write_text(
+            f"MemTotal:        8000000 kB\nDirty:           {dirty_kib} kB\n"
+            f"Writeback:       {writeback_kib} kB\n"
+        )
+
+    def monitor(self, redis=None):
+        monitor = BlockIOMonitor(redis, sys_root=str(self.sys_root), proc_root=str(self.proc_root))
+        monitor.device = "sda1"
+        return monitor
+
+    def test_derives_throughput_latency_and_backlog(self):
+        monitor = self.monitor()
+        self.assertIsNone(monitor.sample(now=10.0))
+        # 0.5 s: 100 writes, 200 MiB, 300 ms of write ticks, device busy 400 ms
+        self.write_stat(100, 200 * 2048, 300, 7, 400)
+        sample = monitor.sample(now=10.5)
+        self.assertEqual(sample["write_mib_s"], 400.0)
+        self.assertEqual(sample["write_latency_ms"], 3.0)
+        self.assertEqual(sample["in_flight"], 7)
+        self.assertEqual(sample["busy_percent"], 80.0)
+        self.assertEqual((sample["dirty_mib"], sample["writeback_mib"]), (2.0, 0.5))
+        self.assertEqual(monitor.write_mib_s, 400.0)
+
+    def test_idle_device_and_counter_reset(self):
+        monitor = self.monitor()
+        monitor.sample(now=0.0)
+        sample = monitor.sample(now=1.0)
+        self.assertEqual((sample["write_mib_s"], sample["write_latency_ms"]), (0.0, 0.0))
+        self.write_stat(5, 10, 1, 0, 1)
+        monitor.sample(now=2.0)
+        self.write_stat(0, 0, 0, 0, 0)
+        self.assertIsNone(monitor.sample(now=3.0))
+
+    def test_publishes_only_changed_keys(self):
+        redis = FakeRedis()
+        monitor = self.monitor(redis)
+        monitor.sample(now=0.0)
+        monitor._publish(monitor.sample(now=1.0))
+        self.assertEqual(len(redis.batches[0]), len(BlockIOMonitor.KEYS))
+        self.write_stat(0, 2048, 0, 0, 0)
+        monitor._publish(monitor.sample(now=2.0))
+        self.assertEqual(redis.batches[1], {ParameterKey.WRITE_SPEED_TO_DRIVE.value: "1.0"})
+        monitor.stop()
+        self.assertEqual(redis.batches[2][ParameterKey.WRITE_SPEED_TO_DRIVE.value], "0")
+        self.assertIsNone(monitor.device)
+
+    def test_diskstats_fallback_and_missing_device(self):
+        (self.proc_root / "diskstats").write_text(
+            "   8       0 sda " + stat_line(1, 2, 3, 4, 5)
+            + " 259       1 nvme0n1p1 " + stat_line(6, 7, 8, 9, 10)
+        )
+        stats = read_block_stat("nvme0n1p1", sys_root=str(self.sys_root), proc_root=str(self.proc_root))
+        self.assertEqual(stats[4:10], [6, 0, 7, 8, 9, 10])
+        self.assertIsNone(read_block_stat("sdz9", sys_root=str(self.sys_root), proc_root=str(self.proc_root)))
+        self.assertEqual(read_dirty_kib(proc_root=str(self.proc_root)), (2048, 512))
+        monitor = BlockIOMonitor(sys_root=str(self.sys_root), proc_root=str(self.proc_root))
+        self.assertFalse(monitor.start("sdz9"))
+        self.assertFalse(monitor.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import itertools
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+sys.path.insert(0, str(ROOT / "_test"))
+
+from module import redis_listener
+from module.buffer_predictor import BufferOverflowPredictor, frame_mib
+from module.redis_controller import ParameterKey
+from test_stats_pipeline import make_listener, payload
+
+
+class BufferOverflowPredictorTests(unittest.TestCase):
+    def test_steady_fill_converges_on_time_to_full(self):
+        predictor = BufferOverflowPredictor(smoothing_s=0.5)
+        eta = None
+        for i in range(40):
+            # 10 frames/s into a 100-slot buffer
+            eta = predictor.update(i, 100, i * 0.1)
+        self.assertAlmostEqual(predictor.rate, 10.0, places=1)
+        self.assertAlmostEqual(eta, (100 - 39) / 10.0, delta=0.2)
+
+    def test_draining_or_flat_buffer_predicts_nothing(self):
+        predictor = BufferOverflowPredictor()
+        for i in range(20):
+            self.assertIsNone(predictor.update(50 - i, 100, i * 0.1))
+        self.assertIsNone(predictor.update(30, 100, 5.0, inflow_fps=24, drain_fps=20))
+
+    def test_drive_deficit_sharpens_a_slow_trend(self):
+        predictor = BufferOverflowPredictor(smoothing_s=5.0)
+        predictor.update(10, 100, 0.0)
+        eta = predictor.update(11, 100, 1.0, inflow_fps=50, drain_fps=20)
+        self.assertAlmostEqual(eta, 89 / 30.0)
+
+    def test_full_and_reset(self):
+        predictor = BufferOverflowPredictor()
+        self.assertEqual(predictor.update(100, 100, 0.0), 0.0)
+        predictor.reset()
+        self.assertIsNone(predictor.eta_s)
+        self.assertEqual(predictor.rate, 0.0)
+        self.assertAlmostEqual(frame_mib(1920, 1080, 12), 1920 * 1080 * 1.5 / (1024 * 1024))
+        self.assertIsNone(frame_mib(None, 1080, 12))
+
+
+class ListenerOverflowGuardTests(unittest.TestCase):
+    def setUp(self):
+        self.listener, self.controller = make_listener(
+            buffer_size=40, width=1920, height=1080, bit_depth=12, write_speed_to_drive=30
+        )
+        self.listener.is_recording = True
+        self.listener.awaiting_fresh_framecount = False
+        self.listener.recording_was_preroll = False
+        self.warnings = []
+        self.listener.set_buffer_overflow_callback(self.warnings.append)
+
+    def feed(self, levels):
+        clock = itertools.count(0.0, 0.1)
+        with patch.object(redis_listener.time, "monotonic", lambda: next(clock)):
+            for level in levels:
+                self.listener.handle_stats_payload(
+                    payload(bufferSize=level, framesInFlight=level), 1.0
+                )
+
+    def test_filling_buffer_publishes_eta_and_warns_once(self):
+        self.feed(range(0, 40, 2))
+        key = ParameterKey.BUFFER_OVERFLOW_ETA.value
+        self.assertEqual(len(self.warnings), 1)
+        self.assertLessEqual(self.warnings[0], self.listener.buffer_guard_seconds)
+        etas = [int(v) for k, v in self.controller.writes if k == key]
+        self.assertTrue(etas and etas[-1] >= 0)
+
+        self.listener.is_recording = False
+        self.feed([0])
+        self.assertEqual(self.controller.cache[key], "-1")
+
+    def test_idle_buffer_and_preroll_do_not_warn(self):
+        self.feed([0] * 10)
+        self.assertEqual(self.warnings, [])
+        self.assertNotIn(ParameterKey.BUFFER_OVERFLOW_ETA.value, self.controller.cache)
+
+        self.listener.recording_was_preroll = True
+        self.feed(range(0, 40, 2))
+        self.assertEqual(self.warnings, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
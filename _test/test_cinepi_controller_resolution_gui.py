@@ -35,6 +35,12 @@ class FakeRedis:
         self.values[key] = value
         self.sets.append((key, value))
 
+    def get_int(self, key, default=None):
+        try:
+            return int(self.get_value(key))
+        except (TypeError, ValueError):
+            return default
+
 
 class FakeSensorDetect:
     camera_model = "imx585"
@@ -187,6 +193,21 @@ class ResolutionGuiStateTests(unittest.TestCase):
             "\n".join(logs.output),
         )
 
+    def test_buffer_guard_steps_down_without_changing_desired_mode(self):
+        controller = self.controller()
+        controller.dynamic_resolution_desired_mode = 1
+        controller.redis_controller.set_value(ParameterKey.WIDTH.value, "3856")
+        controller.redis_controller.set_value(ParameterKey.HEIGHT.value, "2180")
+        controller.set_resolution = mock.Mock()
+        controller._apply_resolution_mode = mock.Mock(return_value=True)
+
+        with self.assertLogs(level="WARNING"):
+            controller._buffer_guard_step_down("resolution", 3.0)
+
+        controller.set_resolution.assert_not_called()
+        controller._apply_resolution_mode.assert_called_once_with(0, restore_user_fps=24)
+        self.assertEqual(controller.dynamic_resolution_desired_mode, 1)
+
     def test_raw_stream_ready_log_clears_resolution_switching(self):
         controller = self.controller()
         resolution_info = controller.sensor_detect.res_modes[1]
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+class _DummyBus:
+    def read_byte(self, *_args):
+        raise OSError
+
+    def close(self):
+        pass
+
+
+sys.modules.setdefault("smbus", types.SimpleNamespace(SMBus=lambda *_args: _DummyBus()))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import ssd_monitor
+from module.clip_catalog import ClipCatalog, mount_key, scan_clip
+
+
+def make_clip(root, name, frames, *, sub=None, wav=0):
+    folder = Path(root, name, sub) if sub else Path(root, name)
+    folder.mkdir(parents=True, exist_ok=True)
+    for idx in frames:
+        (folder / f"{name}_{idx:06d}.dng").write_bytes(b"x" * 10)
+    for i in range(wav):
+        (folder / f"{name}_{i}.wav").write_bytes(b"")
+    return Path(root, name)
+
+
+class ClipCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.drive = Path(self._tmp.name, "RAW")
+        self.state = Path(self._tmp.name, "state")
+        self.drive.mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_scan_counts_nested_frames(self):
+        clip = make_clip(self.drive, "A001", [0, 1, 7], wav=1)
+        make_clip(self.drive, "A001", [3, 12], sub="cam1")
+        (clip / "notes.txt").write_text("x")
+        entry = scan_clip(str(clip), settle_s=0)
+        self.assertEqual((entry.dng, entry.wav, entry.max_idx, entry.bytes), (5, 1, 12, 50))
+        self.assertEqual(set(entry.dirs), {"", "cam1"})
+        self.assertTrue(entry.settled)
+
+    def test_unchanged_clip_is_served_from_catalog(self):
+        clip = make_clip(self.drive, "A001", range(4))
+        catalog = ClipCatalog(self.state, settle_s=0)
+        self.assertTrue(catalog.open(self.drive))
+        self.assertEqual(catalog.get(clip).dng, 4)
+        self.assertEqual(catalog.get(clip).dng, 4)
+        self.assertEqual((catalog.scans, catalog.hits), (1, 1))
+
+        make_clip(self.drive, "A001", [4])
+        self.assertEqual(catalog.get(clip).max_idx, 4)
+        self.assertEqual(catalog.scans, 2)
+        self.assertIsNone(catalog.get(self.state))
+
+    def test_unsettled_clip_is_rescanned(self):
+        clip = make_clip(self.drive, "A001", range(2))
+        catalog = ClipCatalog(self.state, settle_s=3600)
+        catalog.open(self.drive)
+        catalog.get(clip)
+        catalog.get(clip)
+        self.assertEqual(catalog.scans, 2)
+
+    def test_persisted_per_filesystem(self):
+        clip = make_clip(self.drive, "A001", range(3))
+        gone = make_clip(self.drive, "A000", range(1))
+        catalog = ClipCatalog(self.state, settle_s=0)
+        catalog.open(self.drive)
+        catalog.get(clip)
+        catalog.get(gone)
+        catalog.retain(["A001"])
+        catalog.close()
+        self.assertTrue((self.state / f"{mount_key(self.drive)}.json").exists())
+
+        reloaded = ClipCatalog(self.state, settle_s=0)
+        reloaded.open(self.drive)
+        self.assertEqual(len(reloaded), 1)
+        self.assertNotIn("A000", reloaded)
+        self.assertEqual(reloaded.get(clip).dng, 3)
+        self.assertEqual((reloaded.scans, reloaded.hits), (0, 1))
+
+
+class LatestRecordingTests(unittest.TestCase):
+    def test_latest_recording_uses_catalog(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            drive = Path(tmp, "RAW")
+            drive.mkdir()
+            old = make_clip(drive, "A001", range(5))
+            os.utime(old, (1, 1))
+            make_clip(drive, "A002", range(3), wav=1)
+
+            monitor = ssd_monitor.SSDMonitor.__new__(ssd_monitor.SSDMonitor)
+            monitor._mount_path = drive
+            monitor._is_mounted = True
+            monitor._redis = None
+            monitor._unreadable_dirs = set()
+            monitor._last_recording_log = {}
+            monitor.clip_catalog = ClipCatalog(Path(tmp, "state"), settle_s=0)
+            monitor.clip_catalog.open(drive)
+
+            infos = monitor.get_latest_recording_infos()
+            self.assertEqual(infos, [(str(drive / "A002"), 3, 1, 2)])
+            monitor.get_latest_recording_infos()
+            self.assertEqual(monitor.clip_catalog.hits, 1)
+            self.assertNotIn("A001", monitor.clip_catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.dng_index import ClipIndex, DngIndex
+
+
+def write_frame(folder, idx, size=16):
+    with open(os.path.join(folder, f"CLIP_{idx:06d}.dng"), "wb") as fh:
+        fh.write(b"x" * size)
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class ClipIndexTests(unittest.TestCase):
+    def test_tracks_count_bytes_and_last_index(self):
+        clip = ClipIndex("/clip")
+        clip.add("A_000002.dng", 10)
+        clip.add("A_000000.dng", 10)
+        clip.add("A_000002.dng", 12)         # rewritten, counted once
+        clip.add("A_000001.dng", 0)          # in-flight / empty → ignored
+        clip.add("audio.wav", 100)
+        snap = clip.snapshot()
+        self.assertEqual((snap.count, snap.last_idx, snap.bytes, snap.wav_count), (2, 2, 22, 1))
+        self.assertEqual(clip.frames.runs(), [(0, 0), (2, 2)])
+
+        clip.remove("A_000002.dng")
+        snap = clip.snapshot()
+        self.assertEqual((snap.count, snap.last_idx, snap.last_name), (1, 0, "A_000000.dng"))
+
+
+@unittest.skipUnless(DngIndex().available, "inotify not available")
+class DngIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.index = DngIndex(poll_s=0.05)
+
+    def tearDown(self):
+        self.index.stop()
+        self.tmp.cleanup()
+
+    def test_indexes_clip_created_after_start(self):
+        self.assertTrue(self.index.start(self.root))
+        clip = os.path.join(self.root, "CLIP_cam0")
+        os.mkdir(clip)
+        self.assertTrue(wait_for(lambda: self.index.snapshot(clip) is not None))
+        for idx in range(50):
+            write_frame(clip, idx)
+        self.assertTrue(wait_for(lambda: self.index.snapshot(clip).count == 50))
+        snap = self.index.snapshot(clip)
+        self.assertEqual(snap.last_idx, 49)
+        self.assertEqual(snap.bytes, 50 * 16)
+        self.assertEqual(self.index.frames(clip).runs(), [(0, 49)])
+
+    def test_watch_seeds_existing_files(self):
+        clip = os.path.join(self.root, "EARLY_cam1")
+        os.mkdir(clip)
+        write_frame(clip, 0)
+        write_frame(clip, 1)
+        self.index.start(None)
+        self.assertIsNone(self.index.snapshot(clip))
+        self.assertTrue(self.index.watch(clip))
+        write_frame(clip, 2)
+        self.assertTrue(wait_for(lambda: self.index.snapshot(clip).count == 3))
+
+    def test_overflow_and_stop_disable_lookups(self):
+        self.index.start(self.root)
+        clip = os.path.join(self.root, "C")
+        os.mkdir(clip)
+        self.assertTrue(self.index.watch(clip))
+        self.index.overflowed = True
+        self.assertIsNone(self.index.snapshot(clip))
+        self.index.stop()
+        self.assertFalse(self.index.running)
+        self.assertIsNone(self.index.snapshot(clip))
+
+
+if __name__ == "__main__":
+    unittest.main()
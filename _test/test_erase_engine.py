@@ -0,0 +1,124 @@
+import errno
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.erase_engine import EraseEngine
+
+
+def make_clip(root, name, frames=5, size=100):
+    clip = Path(root, name)
+    (clip / "nested").mkdir(parents=True)
+    for i in range(frames):
+        (clip / f"{name}_{i:06d}.dng").write_bytes(b"x" * size)
+    (clip / "nested" / "audio.wav").write_bytes(b"y" * size)
+    return clip
+
+
+class EraseEngineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_erases_contents_and_keeps_root(self):
+        for i in range(6):
+            make_clip(self.root, f"CLIP_{i}")
+        Path(self.root, "loose.txt").write_bytes(b"z" * 10)
+        os.symlink("CLIP_0", os.path.join(self.root, "link"))
+        states = []
+
+        result = EraseEngine(self.root, workers=3, progress=states.append).run()
+
+        self.assertTrue(result.ok)
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertEqual(result.files, 6 * 6 + 2)
+        self.assertEqual(result.dirs, 6 * 2)
+        self.assertEqual(result.bytes, 6 * 600 + 10 + len("CLIP_0"))
+        self.assertEqual(states[-1]["state"], "done")
+        self.assertEqual(states[-1]["files"], result.files)
+
+    def test_empty_root(self):
+        result = EraseEngine(self.root).run()
+        self.assertTrue(result.ok)
+        self.assertEqual(result.files, 0)
+
+    def test_cancel_stops_between_files(self):
+        for i in range(3):
+            make_clip(self.root, f"CLIP_{i}")
+        states = []
+        engine = EraseEngine(self.root, workers=1, progress=states.append)
+        real_unlink = os.unlink
+
+        def unlink_then_cancel(path):
+            real_unlink(path)
+            engine.cancel()
+
+        with patch("module.erase_engine.os.unlink", unlink_then_cancel):
+            result = engine.run()
+
+        self.assertTrue(result.cancelled)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.files, 1)
+        self.assertEqual(len(os.listdir(self.root)), 3)
+        self.assertEqual(states[-1]["state"], "cancelled")
+
+    def test_busy_file_is_retried_once(self):
+        make_clip(self.root, "CLIP", frames=1)
+        real_unlink = os.unlink
+        attempts = []
+
+        def unlink(path):
+            attempts.append(path)
+            if attempts.count(path) == 1 and path.endswith(".dng"):
+                raise OSError(errno.EBUSY, "Device or resource busy", path)
+            real_unlink(path)
+
+        with patch("module.erase_engine.os.unlink", unlink), \
+                patch("module.erase_engine.time.sleep") as sleep:
+            result = EraseEngine(self.root).run()
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(os.listdir(self.root), [])
+        sleep.assert_any_call(0.5)
+
+    def test_permission_errors_go_to_one_helper_call(self):
+        make_clip(self.root, "LOCKED")
+        make_clip(self.root, "FREE")
+        real_unlink = os.unlink
+        helper_calls = []
+
+        def unlink(path):
+            if "LOCKED" in path:
+                raise PermissionError(13, "Permission denied", path)
+            real_unlink(path)
+
+        engine = EraseEngine(self.root, helper_cmd=("rm", "-rf", "--"))
+        real_run = __import__("subprocess").run
+
+        def run(cmd, **kwargs):
+            helper_calls.append(cmd)
+            return real_run(cmd, **kwargs)
+
+        with patch("module.erase_engine.os.unlink", unlink), \
+                patch("module.erase_engine.subprocess.run", run):
+            result = engine.run()
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertEqual(len(helper_calls), 1)
+        self.assertEqual(helper_calls[0][-1], os.path.join(self.root, "LOCKED"))
+        self.assertEqual(result.files, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.frame_presence import SIDECAR_NAME, FramePresenceBitmap, write_sidecar
+
+
+def brute_runs(frames):
+    runs = []
+    for idx in sorted(frames):
+        if runs and runs[-1][1] == idx - 1:
+            runs[-1][1] = idx
+        else:
+            runs.append([idx, idx])
+    return [tuple(r) for r in runs]
+
+
+class FramePresenceBitmapTests(unittest.TestCase):
+    def test_runs_and_holes_match_brute_force(self):
+        rng = random.Random(11)
+        for density in (0.02, 0.5, 0.97, 1.0):
+            frames = {i for i in range(3, 5000) if rng.random() < density}
+            bitmap = FramePresenceBitmap(frames)
+            self.assertEqual(len(bitmap), len(frames))
+            self.assertEqual(bitmap.runs(), brute_runs(frames))
+            self.assertEqual(bitmap.missing(), bitmap.last + 1 - len(frames))
+            for a, b in bitmap.holes():
+                self.assertFalse(any(i in frames for i in range(a, b + 1)))
+
+    def test_summary_and_bounds(self):
+        bitmap = FramePresenceBitmap([0, 1, 2, 5, 6, 9])
+        summary = bitmap.summary(max_ranges=1)
+        self.assertEqual((summary["first"], summary["last"], summary["frames"]), (0, 9, 6))
+        self.assertEqual(summary["missing"], 4)
+        self.assertEqual(summary["hole_ranges"], 2)
+        self.assertEqual(summary["holes"], [[3, 4]])
+        self.assertTrue(summary["truncated"])
+
+        bitmap.discard(9)
+        bitmap.discard(0)
+        self.assertEqual((bitmap.first, bitmap.last), (1, 6))
+        self.assertNotIn(0, bitmap)
+        self.assertFalse(bitmap.add(5))
+
+    def test_bytes_round_trip(self):
+        bitmap = FramePresenceBitmap([4, 17, 18, 200])
+        copy = FramePresenceBitmap.from_bytes(bitmap.to_bytes())
+        self.assertEqual(copy.runs(), bitmap.runs())
+        self.assertEqual((copy.first, copy.last, len(copy)), (4, 200, 4))
+
+    def test_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_sidecar(tmp, FramePresenceBitmap([0, 1, 3]), clip="A_cam0")
+            self.assertEqual(Path(path).name, SIDECAR_NAME)
+            data = json.loads(Path(path).read_text())
+        self.assertEqual(data["holes"], [[2, 2]])
+        self.assertEqual(data["runs"], [[0, 1], [3, 3]])
+        self.assertEqual(data["clip"], "A_cam0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import statistics
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.frame_stats import FpsHistory, FrameIntervalStats
+
+
+class FrameIntervalStatsTests(unittest.TestCase):
+    def test_matches_brute_force_window(self):
+        rng = random.Random(3)
+        stats = FrameIntervalStats(capacity=20)
+        intervals = []
+        ts = 10**12
+        stats.add_timestamp(ts)
+        for _ in range(500):
+            interval = int(rng.gauss(41_666_667, 300_000))
+            ts += interval
+            intervals.append(interval)
+            self.assertTrue(stats.add_timestamp(ts))
+            window = intervals[-20:]
+            self.assertEqual(len(stats), len(window))
+            self.assertEqual(stats.min_ns, min(window))
+            self.assertEqual(stats.max_ns, max(window))
+            self.assertAlmostEqual(stats.mean_ns, statistics.fmean(window), places=3)
+            self.assertAlmostEqual(stats.stddev_ns, statistics.pstdev(window), delta=1.0)
+            self.assertAlmostEqual(stats.fps, 1e9 / statistics.fmean(window), places=6)
+
+    def test_percentiles_within_bucket(self):
+        stats = FrameIntervalStats(capacity=100, bucket_ns=50_000)
+        for i in range(100):
+            stats.add_interval(40_000_000 + i * 100_000)
+        self.assertLessEqual(abs(stats.percentile_ns(0.5) - 44_900_000), 50_000)
+        self.assertLessEqual(abs(stats.percentile_ns(0.99) - 49_800_000), 50_000)
+
+    def test_first_and_repeated_timestamps(self):
+        stats = FrameIntervalStats()
+        self.assertIsNone(stats.fps)
+        self.assertEqual(stats.summary(), {"frames": 0})
+        self.assertFalse(stats.add_timestamp(1_000))
+        self.assertFalse(stats.add_timestamp(1_000))
+        self.assertTrue(stats.add_timestamp(41_667_000))
+        self.assertAlmostEqual(stats.fps, 1e9 / 41_666_000)
+
+    def test_backwards_timestamp_starts_new_window(self):
+        stats = FrameIntervalStats()
+        for ts in (0, 40_000_000, 80_000_000):
+            stats.add_timestamp(ts)
+        self.assertEqual(len(stats), 2)
+        self.assertFalse(stats.add_timestamp(5_000_000))
+        self.assertEqual(len(stats), 0)
+        stats.add_timestamp(45_000_000)
+        self.assertEqual(stats.max_ns, 40_000_000)
+
+
+class FpsHistoryTests(unittest.TestCase):
+    def test_per_second_aggregates(self):
+        history = FpsHistory(seconds=10)
+        for fps, t in [(24.0, 100.1), (23.0, 100.5), (25.0, 100.9), (24.0, 102.0)]:
+            history.add(fps, t)
+        rows = history.query(now=102.5)
+        self.assertEqual(rows, [(100, 23.0, 24.0, 25.0), (102, 24.0, 24.0, 24.0)])
+        self.assertEqual(history.query(1, now=102.5), [(102, 24.0, 24.0, 24.0)])
+
+    def test_memory_is_bounded_and_old_slots_expire(self):
+        history = FpsHistory(seconds=5)
+        for t in range(1000):
+            history.add(24.0 + (t % 3), t + 0.5)
+        rows = history.query(now=999.9)
+        self.assertEqual([r[0] for r in rows], [995, 996, 997, 998, 999])
+        self.assertEqual(len(history._count), 5)
+        self.assertEqual(history.query(now=2000), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
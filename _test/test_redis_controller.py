@@ -0,0 +1,623 @@
+import fnmatch
+import queue
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import redis_controller
+from module.redis_controller import ParameterKey, RedisController
+
+
+class FakeRedisError(Exception):
+    pass
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.channels = set()
+        self.messages = queue.Queue()
+        self.closed = False
+
+    def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.server.pubsubs.append(self)
+
+    def unsubscribe(self):
+        self.channels.clear()
+
+    def close(self):
+        self.closed = True
+        self.messages.put(None)
+
+    def get_message(self, timeout=0.0):
+        try:
+            msg = self.messages.get(timeout=timeout) if timeout else self.messages.get_nowait()
+        except queue.Empty:
+            return None
+        if msg is None:
+            raise FakeRedisError("connection closed")
+        return msg
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.ops = []
+
+    def set(self, key, value):
+        self.ops.append(("set", key, value))
+
+    def publish(self, channel, message):
+        self.ops.append(("publish", channel, message))
+
+    def execute(self):
+        self.server.round_trips += 1
+        with self.server.lock:
+            for op, a, b in self.ops:
+                if op == "set":
+                    self.server.data[a] = str(b).encode()
+                else:
+                    self.server._deliver(a, b)
+        self.ops = []
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of StrictRedis RedisController uses."""
+
+    def __init__(self, *_args, **_kwargs):
+        self.data = {}
+        self.pubsubs = []
+        self.published = []
+        self.round_trips = 0
+        self.mget_calls = []
+        self.lock = threading.Lock()
+
+    def _deliver(self, channel, message):
+        self.published.append((channel, message))
+        payload = message.encode() if isinstance(message, str) else message
+        for ps in self.pubsubs:
+            if channel in ps.channels:
+                ps.messages.put({"type": "message", "channel": channel.encode(), "data": payload})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def keys(self, _pattern="*"):
+        self.round_trips += 1
+        return list(self.data)
+
+    def scan_iter(self, match="*", count=None):
+        self.round_trips += 1
+        return [key.encode() for key in self.data if fnmatch.fnmatchcase(key, match)]
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key.decode() if isinstance(key, bytes) else key)
+
+    def mget(self, keys):
+        self.round_trips += 1
+        self.mget_calls.append(list(keys))
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value):
+        self.round_trips += 1
+        self.data[key] = str(value).encode()
+
+    def publish(self, channel, message):
+        self.round_trips += 1
+        with self.lock:
+            self._deliver(channel, message)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def make_controller(server=None, **kwargs):
+    server = server or FakeRedis()
+    fake_module = types.SimpleNamespace(
+        StrictRedis=lambda **_kw: server,
+        RedisError=FakeRedisError,
+    )
+    with patch.object(redis_controller, "redis", fake_module):
+        controller = RedisController(**kwargs)
+    controller.r = server
+    return controller, server
+
+
+class RedisControllerWriteCoalescingTests(unittest.TestCase):
+    def test_burst_of_writes_is_sent_as_one_pipeline(self):
+        controller, server = make_controller(flush_interval_s=0.05)
+        try:
+            for frame in range(1, 51):
+                controller.set_value(ParameterKey.FRAMECOUNT, frame)
+            controller.set_value(ParameterKey.BUFFER, 3)
+            self.assertTrue(controller.flush())
+
+            self.assertEqual(server.data["framecount"], b"50")
+            self.assertEqual(server.data["buffer"], b"3")
+            published_keys = [msg for ch, msg in server.published if ch == "cp_controls"]
+            self.assertEqual(published_keys.count("framecount"), 1)
+
+            stats = controller.get_write_stats()
+            self.assertEqual(stats["writes"], 51)
+            self.assertEqual(stats["coalesced"], 49)
+            self.assertEqual(stats["pending"], 0)
+            self.assertGreater(stats["round_trips_saved"], 90)
+        finally:
+            controller.stop_listener()
+
+    def test_set_value_updates_cache_before_flush(self):
+        controller, server = make_controller(flush_interval_s=0.2)
+        try:
+            controller.set_value(ParameterKey.ISO, 800)
+            self.assertEqual(controller.get_value("iso"), "800")
+            self.assertNotIn("iso", server.data)
+            controller.flush()
+            self.assertEqual(server.data["iso"], b"800")
+        finally:
+            controller.stop_listener()
+
+    def test_racing_writers_leave_redis_matching_the_cache(self):
+        controller, server = make_controller(flush_interval_s=0.0)
+        enqueue = controller._enqueue_many
+        rival = threading.Thread(target=controller.set_value, args=(ParameterKey.ISO, 200))
+
+        def slow_enqueue(items):
+            # A second writer gets in between this writer's cache update
+            # and its enqueue.
+            if items.get("iso") == "100" and not rival.is_alive():
+                rival.start()
+                rival.join(timeout=0.2)
+            enqueue(items)
+
+        try:
+            with patch.object(controller, "_enqueue_many", slow_enqueue):
+                controller.set_value(ParameterKey.ISO, 100)
+                rival.join()
+            self.assertTrue(controller.flush())
+            self.assertEqual(controller.get_value("iso"), "200")
+            self.assertEqual(server.data["iso"], b"200")
+        finally:
+            controller.stop_listener()
+
+    def test_flushed_keys_stay_visible_to_the_listener(self):
+        controller, _server = make_controller(flush_interval_s=0.2)
+        try:
+            controller.set_value(ParameterKey.ISO, 100)
+            with controller.lock:
+                flusher = threading.Thread(target=controller._flush_pending)
+                flusher.start()
+                flusher.join(timeout=0.1)
+                # While the cache lock is held the write is either still
+                # queued or already awaiting its echo – never neither.
+                with controller._pending_cond:
+                    queued = "iso" in controller._pending
+                self.assertTrue(queued or controller._echo_pending.get("iso"))
+            flusher.join()
+        finally:
+            controller.stop_listener()
+
+    def test_republish_follows_pending_set(self):
+        controller, server = make_controller(flush_interval_s=0.05)
+        try:
+            controller.set_value(ParameterKey.ZOOM, 2.0)
+            controller.republish(ParameterKey.ZOOM)
+            controller.flush()
+
+            self.assertEqual(server.data["zoom"], b"2.0")
+            self.assertEqual(
+                server.published,
+                [("cp_controls", "zoom"), ("cp_controls_values", "zoom=2.0")],
+            )
+        finally:
+            controller.stop_listener()
+
+    def test_synchronous_mode_writes_immediately(self):
+        controller, server = make_controller(coalesce_writes=False)
+        try:
+            controller.set_value(ParameterKey.ISO, 400)
+            self.assertEqual(server.data["iso"], b"400")
+            self.assertEqual(
+                server.published,
+                [("cp_controls", "iso"), ("cp_controls_values", "iso=400")],
+            )
+        finally:
+            controller.stop_listener()
+
+    def test_synchronous_writes_reach_redis_in_cache_order(self):
+        controller, server = make_controller(coalesce_writes=False)
+        write = controller._write_sync
+        rival = threading.Thread(target=controller.set_value, args=(ParameterKey.ISO, 200))
+
+        def slow_write(changed):
+            if changed.get("iso") == "100" and not rival.is_alive():
+                rival.start()
+                rival.join(timeout=0.2)
+            write(changed)
+
+        try:
+            with patch.object(controller, "_write_sync", slow_write):
+                controller.set_value(ParameterKey.ISO, 100)
+                rival.join()
+            self.assertEqual(controller.get_value("iso"), "200")
+            self.assertEqual(server.data["iso"], b"200")
+        finally:
+            controller.stop_listener()
+
+
+    def test_snapshot_does_not_wait_for_a_slow_synchronous_write(self):
+        controller, server = make_controller(coalesce_writes=False)
+        release = threading.Event()
+        entered = threading.Event()
+        write = controller._write_sync
+
+        def slow_write(changed):
+            entered.set()
+            release.wait(2.0)
+            write(changed)
+
+        writers = [
+            threading.Thread(target=controller.set_value, args=(ParameterKey.ISO, 100)),
+            threading.Thread(target=controller.set_value, args=(ParameterKey.WB, 5600)),
+        ]
+        try:
+            with patch.object(controller, "_write_sync", slow_write):
+                writers[0].start()
+                self.assertTrue(entered.wait(1.0))
+                writers[1].start()                     # queues behind the round trip
+                time.sleep(0.05)
+                reader = threading.Thread(target=controller.snapshot)
+                reader.start()
+                reader.join(timeout=0.5)
+                blocked = reader.is_alive()
+                release.set()
+                for writer in writers:
+                    writer.join()
+                reader.join()
+            self.assertFalse(blocked)
+            self.assertEqual(server.data["iso"], b"100")
+            self.assertEqual(server.data["wb"], b"5600")
+        finally:
+            release.set()
+            controller.stop_listener()
+
+class RedisControllerReadPathTests(unittest.TestCase):
+    def test_get_value_does_not_wait_for_the_write_lock(self):
+        controller, _server = make_controller()
+        try:
+            controller.set_value(ParameterKey.ISO, 640)
+            with controller.lock:
+                self.assertEqual(controller.get_value("iso"), "640")
+        finally:
+            controller.stop_listener()
+
+    def test_snapshot_version_tracks_changes(self):
+        controller, _server = make_controller()
+        try:
+            version, values = controller.snapshot()
+            controller.set_value(ParameterKey.ISO, 100)
+            controller.set_value(ParameterKey.ISO, 100)      # unchanged
+            new_version, new_values = controller.snapshot()
+
+            self.assertEqual(new_version, version + 1)
+            self.assertEqual(new_values["iso"], "100")
+            self.assertNotIn("iso", values)
+        finally:
+            controller.stop_listener()
+
+
+class RedisControllerTypedAccessTests(unittest.TestCase):
+    def test_parameter_keys_declare_types(self):
+        self.assertIs(ParameterKey.FRAMECOUNT.value_type, int)
+        self.assertIs(ParameterKey.FPS_USER.value_type, float)
+        self.assertIs(ParameterKey.IS_RECORDING.value_type, bool)
+        self.assertIs(ParameterKey.SENSOR.value_type, str)
+
+    def test_typed_keys_are_decoded_once_on_write(self):
+        controller, _server = make_controller()
+        try:
+            controller.set_value(ParameterKey.FPS_USER, "23.976")
+            controller.set_value(ParameterKey.BUFFER, "12.0")
+            controller.set_value(ParameterKey.IS_WRITING, "true")
+
+            self.assertEqual(controller._typed["fps_user"], 23.976)
+            self.assertEqual(controller.get_float(ParameterKey.FPS_USER), 23.976)
+            self.assertEqual(controller.get_int("fps_user"), 23)
+            self.assertEqual(controller.get_int(ParameterKey.BUFFER), 12)
+            self.assertTrue(controller.get_bool("is_writing"))
+            self.assertEqual(controller.get_value("buffer"), "12.0")
+        finally:
+            controller.stop_listener()
+
+    def test_missing_or_invalid_values_fall_back_to_default(self):
+        controller, _server = make_controller()
+        try:
+            controller.set_value(ParameterKey.ISO, "auto")
+            controller.set_value("user_changing_fps", "1")
+
+            self.assertEqual(controller.get_int(ParameterKey.ISO, 100), 100)
+            self.assertEqual(controller.get_float("zoom", 1.0), 1.0)
+            self.assertFalse(controller.get_bool(ParameterKey.REC))
+            self.assertTrue(controller.get_bool("user_changing_fps"))
+
+            controller.set_value(ParameterKey.FRAMES_IN_SYNC, "")
+            self.assertTrue(controller.get_bool(ParameterKey.FRAMES_IN_SYNC, True))
+            controller.set_value(ParameterKey.FRAMES_IN_SYNC, "n/a")
+            self.assertTrue(controller.get_bool(ParameterKey.FRAMES_IN_SYNC, True))
+            controller.set_value(ParameterKey.FRAMES_IN_SYNC, "off")
+            self.assertFalse(controller.get_bool(ParameterKey.FRAMES_IN_SYNC, True))
+            controller.set_value(ParameterKey.FRAMES_IN_SYNC, "0")
+            self.assertFalse(controller.get_bool(ParameterKey.FRAMES_IN_SYNC, True))
+        finally:
+            controller.stop_listener()
+
+    def test_remote_updates_refresh_typed_values(self):
+        controller, _server = make_controller()
+        try:
+            controller._process_notifications([
+                {"type": "message", "channel": b"cp_controls_values", "data": b"framecount=42"},
+            ])
+            self.assertEqual(controller.get_int(ParameterKey.FRAMECOUNT), 42)
+        finally:
+            controller.stop_listener()
+
+
+class RedisControllerBatchAndTimerTests(unittest.TestCase):
+    def test_set_values_is_one_transaction(self):
+        controller, server = make_controller(coalesce_writes=False)
+        try:
+            before = server.round_trips
+            controller.set_values({ParameterKey.ISO: 800, "shutter_a": 172.8, "fps": None})
+            self.assertEqual(server.round_trips - before, 1)
+            self.assertEqual(server.data["iso"], b"800")
+            self.assertEqual(server.data["shutter_a"], b"172.8")
+            self.assertNotIn("fps", server.data)
+        finally:
+            controller.stop_listener()
+
+    def test_set_values_lands_in_one_flush(self):
+        controller, server = make_controller(flush_interval_s=0.05)
+        try:
+            controller.set_values({"recording_time": 1.0, "recording_tc_rec": "00:00:01:00"})
+            controller.flush()
+            self.assertEqual(controller.get_write_stats()["flushes"], 1)
+        finally:
+            controller.stop_listener()
+
+    def test_ticker_reports_frame_edges(self):
+        controller, _server = make_controller(conform_frame_rate=100, flush_interval_s=0.0)
+        try:
+            controller.set_value(ParameterKey.REC, 1)
+            self.assertNotEqual(controller.get_int(ParameterKey.RECORDING_START_NS), 0)
+            time.sleep(0.25)
+            controller.set_value(ParameterKey.IS_RECORDING, 0)
+
+            elapsed = controller.get_float(ParameterKey.RECORDING_TIME)
+            self.assertGreater(elapsed, 0.1)
+            frames = round(elapsed * 100)
+            self.assertAlmostEqual(elapsed, frames / 100, places=9)
+            self.assertEqual(controller.get_value("recording_tc_rec"),
+                             f"00:00:00:{frames:02d}")
+            self.assertEqual(controller.get_int(ParameterKey.RECORDING_START_NS), 0)
+            self.assertGreater(controller.rec_timer_stats["ticks"], 10)
+        finally:
+            controller.stop_listener()
+
+    def test_timestamp_mode_publishes_start_and_final_values_only(self):
+        controller, _server = make_controller(recording_timer_mode="timestamp")
+        try:
+            controller.set_value(ParameterKey.REC, 1)
+            self.assertIsNone(controller._rec_timer_thread)
+            start_ns = controller.get_int(ParameterKey.RECORDING_START_NS)
+            self.assertGreater(start_ns, 0)
+            controller.set_value(ParameterKey.REC, 0)
+            controller.set_value(ParameterKey.REC, 1)       # bounce keeps the take
+            self.assertEqual(controller.get_int(ParameterKey.RECORDING_START_NS), start_ns)
+            self.assertEqual(controller.get_float(ParameterKey.RECORDING_TIME), 0.0)
+
+            time.sleep(0.06)
+            controller.set_value(ParameterKey.IS_RECORDING, 0)
+            self.assertGreater(controller.get_float(ParameterKey.RECORDING_TIME), 0.0)
+            self.assertEqual(controller.get_int(ParameterKey.RECORDING_START_NS), 0)
+        finally:
+            controller.stop_listener()
+
+
+class RedisControllerCachePrimingTests(unittest.TestCase):
+    def test_prime_loads_known_namespace_in_bulk(self):
+        server = FakeRedis()
+        server.data.update({
+            "iso": b"800",
+            "fps": b"24",
+            "FSCK_STATUS": b"clean",
+            "cinepi_ready_8000": b"1",
+            "unrelated:session": b"x",
+        })
+        controller, server = make_controller(server=server)
+        try:
+            self.assertEqual(controller.get_value("iso"), "800")
+            self.assertEqual(controller.get_value("FSCK_STATUS"), "clean")
+            self.assertEqual(controller.get_value("cinepi_ready_8000"), "1")
+            self.assertIsNone(controller.get_value("unrelated:session"))
+            self.assertIsNone(controller.get_value("shutter_a"))
+            # one SCAN per dynamic pattern plus a handful of MGET batches
+            self.assertLessEqual(server.round_trips, 4)
+            self.assertGreaterEqual(controller.cache_prime_ms, 0.0)
+        finally:
+            controller.stop_listener()
+
+
+class EventDispatchTests(unittest.TestCase):
+    def test_slow_subscriber_does_not_block_others(self):
+        event = redis_controller.Event()
+        release = threading.Event()
+        fast = []
+        event.subscribe(lambda _data: release.wait(2.0))
+        event.subscribe(fast.append, synchronous=True)
+        try:
+            started = time.perf_counter()
+            for i in range(5):
+                event.emit({"key": "iso", "value": str(i)})
+            self.assertLess(time.perf_counter() - started, 0.5)
+            self.assertEqual(len(fast), 5)
+        finally:
+            release.set()
+            event.close()
+
+    def test_key_filter_and_full_queue_supersedes_same_key(self):
+        event = redis_controller.Event()
+        gate = threading.Event()
+        seen = []
+
+        def handler(data):
+            gate.wait(2.0)
+            seen.append((data["key"], data["value"]))
+
+        event.subscribe(handler, keys={ParameterKey.ISO, "fps"}, queue_size=2)
+        try:
+            event.emit({"key": "iso", "value": "100"})     # picked up, blocks
+            time.sleep(0.05)
+            event.emit({"key": "wb", "value": "5600"})     # filtered out
+            event.emit({"key": "iso", "value": "200"})
+            event.emit({"key": "fps", "value": "24"})
+            event.emit({"key": "iso", "value": "400"})     # supersedes iso=200
+            gate.set()
+            deadline = time.monotonic() + 2.0
+            while len(seen) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(seen, [("iso", "100"), ("fps", "24"), ("iso", "400")])
+            stats = event.get_stats()[0]
+            self.assertEqual(stats["superseded"], 1)
+            self.assertEqual(stats["dropped"], 0)
+            self.assertEqual(stats["delivered"], 3)
+            self.assertGreater(stats["latency_ms_max"], 0.0)
+        finally:
+            event.close()
+
+    def test_handlers_only_receive_subscribed_keys_or_prefixes(self):
+        event = redis_controller.Event()
+        rec, dng, everything = [], [], []
+        event.subscribe(rec.append, keys=(ParameterKey.REC, ParameterKey.IS_RECORDING),
+                        synchronous=True)
+        event.subscribe(dng.append, prefix="last_dng_", synchronous=True)
+        event.subscribe(everything.append, synchronous=True)
+
+        for key in ("rec", "framecount", "last_dng_cam0", "is_recording", "last_dng_cam1"):
+            event.emit({"key": key, "value": "1"})
+
+        self.assertEqual([d["key"] for d in rec], ["rec", "is_recording"])
+        self.assertEqual([d["key"] for d in dng], ["last_dng_cam0", "last_dng_cam1"])
+        self.assertEqual(len(everything), 5)
+        self.assertEqual(len(event._route("framecount")), 1)
+
+    def test_late_subscriber_invalidates_dispatch_table(self):
+        event = redis_controller.Event()
+        seen = []
+        event.emit({"key": "iso", "value": "100"})
+        event.subscribe(seen.append, keys="iso", synchronous=True)
+        event.emit({"key": "iso", "value": "200"})
+        self.assertEqual(seen, [{"key": "iso", "value": "200"}])
+
+    def test_handler_errors_are_counted_not_raised(self):
+        event = redis_controller.Event()
+        event.subscribe(lambda _data: 1 / 0, synchronous=True)
+        with self.assertLogs(level="ERROR"):
+            event.emit({"key": "iso", "value": "1"})
+        self.assertEqual(event.get_stats()[0]["errors"], 1)
+
+
+def message(channel, data):
+    return {"type": "message", "channel": channel.encode(), "data": data.encode()}
+
+
+class RedisControllerNotificationTests(unittest.TestCase):
+    def setUp(self):
+        self.controller, self.server = make_controller(flush_interval_s=0.01)
+        self.server.mget_calls.clear()      # ignore cache priming
+        self.events = []
+        self.controller.redis_parameter_changed.subscribe(self.events.append, synchronous=True)
+
+    def tearDown(self):
+        self.controller.stop_listener()
+
+    def test_legacy_burst_is_refreshed_with_one_mget(self):
+        self.server.data.update({"iso": b"1600", "shutter_a": b"180"})
+        batch = [message("cp_controls", key) for key in ("iso", "shutter_a", "iso", "iso")]
+        self.controller._process_notifications(batch)
+
+        self.assertEqual(self.server.mget_calls, [["shutter_a", "iso"]])
+        self.assertEqual(self.controller.get_value("iso"), "1600")
+        self.assertEqual([e["key"] for e in self.events], ["shutter_a", "iso"])
+        self.assertEqual(self.controller.notify_stats["collapsed"], 2)
+
+    def test_value_message_updates_cache_without_fetch(self):
+        self.controller._process_notifications([message("cp_controls_values", "wb=5600")])
+
+        self.assertEqual(self.server.mget_calls, [])
+        self.assertEqual(self.controller.get_value("wb"), "5600")
+        self.assertEqual(self.events, [{"key": "wb", "value": "5600"}])
+
+    def test_own_writes_are_not_reemitted(self):
+        self.controller.set_value(ParameterKey.ISO, 200)
+        self.controller.set_value(ParameterKey.ISO, 320)
+        self.assertTrue(self.controller.flush())
+        for _ in range(100):
+            if not self.controller._echo_pending:
+                break
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.05)
+
+        self.assertEqual(self.controller._echo_pending, {})
+        self.assertEqual([e["value"] for e in self.events], ["200", "320"])
+        self.assertEqual(self.controller.get_value("iso"), "320")
+
+    def test_legacy_write_during_own_echo_is_fetched(self):
+        self.controller.set_value(ParameterKey.ISO, 200)
+        self.assertTrue(self.controller.flush())
+        for _ in range(100):
+            if not self.controller._echo_pending:
+                break
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.05)
+        with self.controller.lock:
+            self.controller._echo_pending["iso"] = 1    # our echo still in flight
+        self.server.data["iso"] = b"1600"              # legacy publisher SETs after us
+        self.events.clear()
+
+        self.controller._process_notifications([
+            message("cp_controls", "iso"),              # legacy bare key
+            message("cp_controls_values", "iso=200"),   # our echo
+        ])
+
+        self.assertEqual(self.controller._echo_pending, {})
+        self.assertEqual(self.controller.get_value("iso"), "1600")
+        self.assertEqual(self.events, [{"key": "iso", "value": "1600"}])
+
+
+    def test_failed_synchronous_write_does_not_mask_legacy_updates(self):
+        controller, server = make_controller(coalesce_writes=False)
+        try:
+            with patch.object(controller, "_write_sync", side_effect=FakeRedisError("down")):
+                with self.assertRaises(FakeRedisError):
+                    controller.set_value(ParameterKey.ISO, 400)
+            self.assertEqual(controller._echo_pending, {})
+
+            server.data["iso"] = b"800"                 # external SET + bare PUBLISH
+            controller._process_notifications([message("cp_controls", "iso")])
+            self.assertEqual(controller.get_value("iso"), "800")
+        finally:
+            controller.stop_listener()
+
+if __name__ == "__main__":
+    unittest.main()
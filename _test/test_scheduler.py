@@ -0,0 +1,59 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.scheduler import TimerService
+
+
+class TimerServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerService(name="TestTimers")
+
+    def tearDown(self):
+        self.timers.stop()
+
+    def test_fires_in_deadline_order(self):
+        fired = []
+        done = threading.Event()
+        self.timers.call_later(0.06, lambda: (fired.append("late"), done.set()))
+        self.timers.call_later(0.02, fired.append, "early")
+        self.assertTrue(done.wait(2.0))
+        self.assertEqual(fired, ["early", "late"])
+
+    def test_cancel_and_rearm_burst_uses_one_thread(self):
+        fired = []
+        threads_before = threading.active_count()
+        handle = None
+        for _ in range(500):
+            if handle:
+                handle.cancel()
+            handle = self.timers.call_later(0.05, fired.append, 1, name="reset_drop_frame")
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+        pending = self.timers.pending()
+        self.assertEqual([p["name"] for p in pending], ["reset_drop_frame"])
+        self.assertTrue(handle.is_alive())
+        time.sleep(0.2)
+        self.assertEqual(fired, [1])
+        self.assertFalse(handle.active)
+        self.assertEqual(self.timers.pending(), [])
+
+    def test_failing_callback_does_not_stop_service(self):
+        done = threading.Event()
+
+        def boom():
+            raise RuntimeError("boom")
+
+        with self.assertLogs(level="ERROR"):
+            self.timers.call_later(0, boom)
+            self.timers.call_later(0.01, done.set)
+            self.assertTrue(done.wait(2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,6 +103,24 @@ class SSDMonitorStorageErrorTests(unittest.TestCase):
         monitor._unreadable_dirs = set()
         return monitor
 
+    def test_erase_is_reserved_before_the_slow_checks(self):
+        monitor = self._monitor()
+        monitor._is_mounted = True
+        monitor._erase_engine = None
+        monitor._erase_lock = ssd_monitor.threading.Lock()
+        second_request = []
+
+        def reserved(engine):
+            self.assertIs(monitor._erase_engine, engine)
+            second_request.append(monitor.erase_drive())
+            return True
+
+        with patch.object(monitor, "_erase_reserved", side_effect=reserved):
+            self.assertTrue(monitor.erase_drive())
+
+        self.assertEqual(second_request, [False])
+        self.assertIsNone(monitor._erase_engine)
+
     def test_path_is_inside_mount(self):
         m = self._monitor()
         self.assertTrue(m._path_is_inside_mount("/tmp/cinemate-test-RAW/CINEPI_x_cam1"))
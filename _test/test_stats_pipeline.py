@@ -0,0 +1,290 @@
+import datetime
+import json
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import redis_listener
+from module.camera_stats import FRAME_COUNT_STALE_S, CameraStatsAggregator
+from module.redis_controller import Event, ParameterKey
+from module.redis_listener import RedisListener
+from module.stats_pipeline import (
+    fps_deviates,
+    hw_drop_slots,
+    parse_stats,
+    tc_diff_drop_slots,
+)
+
+
+class FakePubSub:
+    def subscribe(self, *_channels):
+        pass
+
+    def listen(self):
+        return iter(())
+
+
+class FakeStrictRedis:
+    def __init__(self, **_kwargs):
+        pass
+
+    def pubsub(self):
+        return FakePubSub()
+
+
+class FakeController:
+    """Dict-backed stand-in for the RedisController calls RedisListener makes."""
+
+    def __init__(self, **values):
+        self.cache = {k: str(v) for k, v in values.items()}
+        self.writes = []
+        self.batches = []
+        self.redis_parameter_changed = Event()
+
+    def get_value(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def get_float(self, key, default=None):
+        try:
+            return float(self.cache[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_int(self, key, default=None):
+        value = self.get_float(key)
+        return int(value) if value is not None else default
+
+    def get_bool(self, key, default=False):
+        value = self.cache.get(key)
+        return default if value is None else value in ("1", "true")
+
+    def set_value(self, key, value):
+        key = key.value if isinstance(key, ParameterKey) else key
+        self.writes.append((key, value))
+        self.cache[key] = str(value)
+        self.redis_parameter_changed.emit({"key": key, "value": str(value)})
+
+    def set_values(self, mapping):
+        self.batches.append(dict(mapping))
+        for key, value in mapping.items():
+            self.set_value(key, value)
+
+    def nanoseconds_to_timecode(self, ns, frame_rate=24):
+        return f"tc-{ns}"
+
+
+def make_listener(**values):
+    controller = FakeController(fps=24, fps_user=24, **values)
+    fake_redis = types.SimpleNamespace(StrictRedis=FakeStrictRedis)
+    with patch.object(redis_listener, "redis", fake_redis):
+        listener = RedisListener(controller, ssd_monitor=None)
+    controller.writes.clear()
+    return listener, controller
+
+
+def payload(**fields):
+    return json.dumps(fields).encode()
+
+
+class ParseStatsTests(unittest.TestCase):
+    def test_parses_and_coerces_fields(self):
+        record = parse_stats(b' {"bufferSize": "3", "framerate": 24.5, "frameCount": 10.0,'
+                             b' "timestamp": 1700000000123456789, "cameraPort": "cam1"} ')
+        self.assertEqual(record.buffer_size, 3)
+        self.assertEqual(record.frame_count, 10)
+        self.assertEqual(record.framerate, 24.5)
+        self.assertEqual(record.timestamp, 1700000000123456789)
+        self.assertEqual(record.camera_port, "cam1")
+        self.assertIsNone(record.dropped_frames)
+
+    def test_defaults_and_rejects(self):
+        self.assertEqual(parse_stats("{}").camera_port, "cam0")
+        self.assertIsNone(parse_stats(b"not json"))
+        self.assertIsNone(parse_stats(json.dumps({"framerate": "nan"}).encode()).framerate)
+        with self.assertRaises(json.JSONDecodeError):
+            parse_stats(b"{broken}")
+
+
+class DropTierTests(unittest.TestCase):
+    def test_hw_tier(self):
+        self.assertEqual(hw_drop_slots(5, 3), 2)
+        self.assertEqual(hw_drop_slots(3, 3), 0)
+
+    def test_tc_diff_tier_honours_deadband(self):
+        self.assertEqual(tc_diff_drop_slots(101, 100, 0, 1), 0)
+        self.assertEqual(tc_diff_drop_slots(104, 100, 0, 1), 4)
+        self.assertEqual(tc_diff_drop_slots(104, 100, 4, 1), 0)
+
+    def test_fps_deviation_tier(self):
+        self.assertTrue(fps_deviates(22.5, 24.0))
+        self.assertFalse(fps_deviates(23.5, 24.0))
+
+
+class ListenerStatsStageTests(unittest.TestCase):
+    def setUp(self):
+        self.listener, self.controller = make_listener()
+        self.now = datetime.datetime(2026, 1, 1, 12, 0, 0)
+
+    def test_buffer_and_flags_written_in_one_batch(self):
+        self.listener.handle_stats_payload(
+            payload(bufferSize=2, bufferSizeMax=5, framesInFlight=1, timestamp=100), self.now
+        )
+        self.assertEqual(
+            self.controller.batches[-1],
+            {
+                ParameterKey.TC_CAM0.value: "tc-100",
+                ParameterKey.BUFFER.value: 5,
+                "is_buffering": 1,
+                ParameterKey.IS_WRITING_BUF.value: 1,
+            },
+        )
+
+    def test_unchanged_message_writes_nothing(self):
+        msg = payload(bufferSize=0, framesInFlight=0, timestamp=100, cameraPort="cam1")
+        self.listener.handle_stats_payload(msg, self.now)
+        batches = len(self.controller.batches)
+        self.listener.handle_stats_payload(msg, self.now)
+        self.assertEqual(len(self.controller.batches), batches)
+
+    def test_hw_tier_raises_drop_alert_while_recording(self):
+        listener = self.listener
+        listener.is_recording = True
+        listener.awaiting_fresh_framecount = False
+        listener.recording_was_preroll = False
+        with patch.object(listener, "timers") as timers:
+            listener.handle_stats_payload(payload(frameCount=50, droppedFrames=3), self.now)
+        self.assertEqual(listener.drop_frame_count_current_take, 3)
+        self.assertIn((ParameterKey.DROP_FRAME_COUNT.value, 3), self.controller.writes)
+        self.assertIn((ParameterKey.DROP_FRAME.value, 1), self.controller.writes)
+        self.assertTrue(timers.call_later.called)
+
+    def test_frame_intervals_tracked_per_camera(self):
+        frame_ns = 41_666_667
+        for i in range(5):
+            self.listener.handle_stats_payload(payload(sensorTimestamp=i * frame_ns), self.now)
+            self.listener.handle_stats_payload(
+                payload(sensorTimestamp=7 + i * 2 * frame_ns, cameraPort="cam1"), self.now
+            )
+        self.assertAlmostEqual(self.listener.camera_stats.cameras["cam0"].fps, 24.0, places=3)
+        self.assertAlmostEqual(self.listener.camera_stats.cameras["cam1"].fps, 12.0, places=3)
+        self.assertEqual(self.controller.cache[ParameterKey.FPS_ACTUAL.value], "24.0")
+        summary = json.loads(json.dumps(self.listener.publish_frame_stats()))
+        self.assertEqual(summary["cam0"]["frames"], 4)
+        self.assertIn(ParameterKey.FRAME_STATS.value, self.controller.cache)
+
+    def test_dual_camera_messages_do_not_overwrite_each_other(self):
+        listener = self.listener
+        listener.handle_stats_payload(payload(frameCount=120, bufferSize=1, framesInFlight=0), self.now)
+        listener.handle_stats_payload(
+            payload(frameCount=118, bufferSize=4, framesInFlight=2, cameraPort="cam1"), self.now
+        )
+        self.assertEqual(listener.frame_count, 120)
+        self.assertEqual(listener.bufferSize, 4)
+        self.assertEqual(listener.framesInFlight, 2)
+        self.assertEqual(self.controller.cache[ParameterKey.BUFFER.value], "4")
+        self.assertEqual(self.controller.cache["is_buffering"], "1")
+
+        listener.handle_stats_payload(payload(frameCount=119, framesInFlight=0, cameraPort="cam1"), self.now)
+        self.assertEqual(self.controller.cache["is_buffering"], "0")
+
+    def test_framecount_ignores_cameras_idle_in_the_take(self):
+        listener = self.listener
+        listener.handle_stats_payload(payload(frameCount=900, cameraPort="cam1"), self.now)
+        listener.camera_stats.clear_take()
+        listener.handle_stats_payload(payload(frameCount=12), self.now)
+        self.assertEqual(listener.camera_stats.frame_count, 12)
+
+    def test_stale_camera_drops_out_of_combined_framecount(self):
+        stats = CameraStatsAggregator()
+        stats.camera("cam0").set_frame_count(40, at=100.0)
+        stats.camera("cam1").set_frame_count(45, at=100.0)
+        self.assertEqual(stats.frame_count, 45)
+        stats.camera("cam0").set_frame_count(3, at=100.0 + FRAME_COUNT_STALE_S + 0.1)
+        self.assertEqual(stats.frame_count, 3)
+
+    def test_drop_tiers_run_per_camera(self):
+        listener = self.listener
+        listener.is_recording = True
+        listener.awaiting_fresh_framecount = False
+        listener.recording_was_preroll = False
+        with patch.object(listener, "timers"):
+            listener.handle_stats_payload(payload(frameCount=50, droppedFrames=2), self.now)
+            listener.handle_stats_payload(
+                payload(frameCount=50, droppedFrames=1, cameraPort="cam1"), self.now
+            )
+            listener.handle_stats_payload(
+                payload(frameCount=51, droppedFrames=3, cameraPort="cam1"), self.now
+            )
+        cameras = listener.camera_stats.cameras
+        self.assertEqual(cameras["cam0"].drop_count, 2)
+        self.assertEqual(cameras["cam1"].drop_count, 3)
+        self.assertEqual(listener.drop_frame_count_current_take, 3)
+        self.assertEqual(self.controller.cache[ParameterKey.DROP_FRAME_COUNT.value], "3")
+
+    def test_bad_payloads_are_logged_not_raised(self):
+        with self.assertLogs(level="WARNING"):
+            self.listener.handle_stats_payload(b"hello", self.now)
+        with self.assertLogs(level="ERROR"):
+            self.listener.handle_stats_payload(b"{nope}", self.now)
+        with self.assertLogs(level="ERROR"):
+            self.listener.handle_stats_payload(b"{\"a\": \"\xff\"}", self.now)
+
+
+class FinalAnalysisTests(unittest.TestCase):
+    def setUp(self):
+        self.listener, self.controller = make_listener(is_writing_buf=1, is_buffering=1)
+        self.listener.final_analysis_recheck_s = 30.0     # prove it is event-driven
+        self.analyzed = []
+        self.done = threading.Event()
+
+        def analyze():
+            self.analyzed.append(self.listener.take_sequence)
+            self.done.set()
+
+        self.listener.analyze_frames = analyze
+
+    def drain(self):
+        self.controller.set_value("is_writing_buf", 0)
+        self.controller.set_value("is_buffering", 0)
+
+    def test_runs_when_buffer_drains(self):
+        self.listener.take_sequence = 1
+        self.listener._schedule_final_analysis()
+        time.sleep(0.05)
+        self.assertEqual(self.analyzed, [])
+        started = time.monotonic()
+        self.drain()
+        self.assertTrue(self.done.wait(2.0))
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.analyzed, [1])
+        self.assertFalse(self.listener.final_analysis_pending)
+
+    def test_back_to_back_takes_share_one_worker(self):
+        self.listener.take_sequence = 1
+        self.listener._schedule_final_analysis()
+        worker = self.listener.final_analysis_thread
+        with self.listener.final_analysis_cond:               # next take starts
+            self.listener.take_sequence = 2
+            self.listener.final_analysis_sequence = None
+            self.listener.final_analysis_cond.notify_all()
+        self.listener._schedule_final_analysis()
+        self.listener._schedule_final_analysis()              # duplicate stop is ignored
+        self.drain()
+        self.assertTrue(self.done.wait(2.0))
+        time.sleep(0.05)
+        self.assertEqual(self.analyzed, [2])
+        self.assertIs(self.listener.final_analysis_thread, worker)
+        self.assertTrue(worker.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
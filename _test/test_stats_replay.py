@@ -0,0 +1,69 @@
+import json
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module.stats_replay import MemoryRedis, ReplayStack, read_capture, replay, write_capture
+
+
+def stats(frame, **extra):
+    fields = {"frameCount": frame, "framerate": 24, "bufferSize": 0, "framesInFlight": 0,
+              "sensorTimestamp": frame * 41_666_667, "cameraPort": "cam0"}
+    fields.update(extra)
+    return json.dumps(fields)
+
+
+class CaptureFileTests(unittest.TestCase):
+    def test_round_trip_gzip(self):
+        records = [(0, "c", "is_recording", "1"), (41_666, "s", stats(1))]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "take.cpcap.gz"
+            self.assertEqual(write_capture(path, records, start_ns=5), 2)
+            header, loaded = read_capture(path)
+            (Path(tmp) / "other.jsonl").write_text('{"frameCount": 1}\n')
+            with self.assertRaises(ValueError):
+                read_capture(Path(tmp) / "other.jsonl")
+        self.assertEqual(header["start_ns"], 5)
+        self.assertEqual(loaded, records)
+
+
+class MemoryRedisTests(unittest.TestCase):
+    def test_pubsub_and_pipeline(self):
+        server = MemoryRedis()
+        ps = server.pubsub()
+        ps.subscribe("cp_controls")
+        server.pipeline().set("iso", 800).publish("cp_controls", "iso").execute()
+        self.assertEqual(server.get("iso"), b"800")
+        msg = ps.get_message(timeout=0.1)
+        self.assertEqual((msg["channel"], msg["data"]), (b"cp_controls", b"iso"))
+        self.assertIsNone(ps.get_message(timeout=0))
+        self.assertEqual(server.scan_iter(match="is*"), [b"iso"])
+
+
+class ReplayTests(unittest.TestCase):
+    def test_replays_take_into_listener_stack(self):
+        records = [(0, "c", "is_recording", "1")]
+        records += [(i * 1000, "s", stats(i, droppedFrames=0)) for i in range(1, 60)]
+        records.append((60_000, "s", stats(60, droppedFrames=0)))
+        server = MemoryRedis()
+        stack = ReplayStack(server, timekeeper=False)
+        try:
+            result = replay(records, server, speed=None, barrier=stack.settle)
+            self.assertEqual(result["messages"], 61)
+            self.assertEqual(result["barrier_stalls"], 0)
+            self.assertTrue(stack.listener.is_recording)
+            self.assertEqual(stack.controller.get_int("framecount"), stack.listener.frame_count)
+            self.assertEqual(len(stack.listener.camera_stats.cameras["cam0"].intervals), 59)
+        finally:
+            stack.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module import storage_bench
+from module.dynamic_resolution import load_profile_rows, parse_performance_table
+from module.storage_bench import (
+    TrialResult,
+    build_row,
+    find_max_fps,
+    merge_rows,
+    mount_info,
+    parse_cpu_list,
+    run_trial,
+    sensor_modes,
+)
+
+
+class HelperTests(unittest.TestCase):
+    def test_parse_cpu_list(self):
+        self.assertEqual(parse_cpu_list("1-2"), {1, 2})
+        self.assertEqual(parse_cpu_list("0, 2-3"), {0, 2, 3})
+        self.assertIsNone(parse_cpu_list(""))
+        self.assertIsNone(parse_cpu_list("x"))
+
+    def test_mount_info_picks_longest_mount_point(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".mounts", delete=False) as fh:
+            fh.write("/dev/root / ext4 rw 0 0\n")
+            fh.write("/dev/sda1 /media/RAW exfat rw,noatime,uid=1000 0 0\n")
+            fh.write("tmpfs /media/RAW2 tmpfs rw 0 0\n")
+        info = mount_info("/media/RAW/clip", mounts_file=fh.name)
+        Path(fh.name).unlink()
+        self.assertEqual(info["device"], "/dev/sda1")
+        self.assertEqual(info["filesystem"], "exfat")
+        self.assertEqual(info["options"], "rw,noatime,uid=1000")
+
+    def test_sensor_modes_from_database(self):
+        database = json.loads((ROOT / "resources" / "sensors.json").read_text())
+        modes, aliases = sensor_modes(database, "imx585_mono")
+        self.assertTrue(modes)
+        self.assertTrue(all("file_size_mb" in m for m in modes))
+        self.assertEqual(sensor_modes(database, "nope"), ([], []))
+
+
+class TrialTests(unittest.TestCase):
+    def test_trial_writes_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_trial(tmp, file_bytes=4096, fps=50, duration_s=0.2, writers=2, sync=False)
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+        self.assertEqual((result.frames, result.written, result.dropped), (10, 10, 0))
+        self.assertTrue(result.passed)
+
+    def test_ramp_doubles_then_bisects(self):
+        calls = []
+
+        def fake_trial(_root, *, fps, **_kwargs):
+            calls.append(fps)
+            return TrialResult(fps=fps, frames=1, written=1, passed=fps <= 23)
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(storage_bench, "run_trial", fake_trial):
+            best, result, trials = find_max_fps(tmp, file_bytes=16, max_fps=50)
+            self.assertEqual(best, 23)
+            self.assertEqual(result.fps, 23)
+            self.assertEqual(calls[:6], [1, 2, 4, 8, 16, 32])
+            self.assertEqual(len(trials), len(calls))
+
+            calls.clear()
+            best, _result, _trials = find_max_fps(tmp, file_bytes=16, max_fps=20)
+            self.assertEqual(best, 20)
+            self.assertEqual(calls[-1], 20)
+
+
+class ProfileRowTests(unittest.TestCase):
+    def row(self, fps, media="Samsung T7"):
+        return build_row(
+            sensor="imx477", sensor_aliases=[], storage_type="ssd", filesystem="ext4",
+            media=media, mode={"width": 2028, "height": 1080, "bit_depth": 12},
+            max_fps=fps, result=TrialResult(fps=fps, buffer_peak=1), duration_s=5.0,
+            sensor_limited=False,
+        )
+
+    def test_measured_rows_replace_same_context_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "profiles.json")
+            path.write_text((ROOT / "resources" / "dynamic_resolution_profiles.json").read_text())
+            before = len(json.loads(path.read_text())["profiles"]["default"])
+
+            replaced = merge_rows(path, [self.row(37), self.row(45, media="Lab tmpfs")])
+            self.assertEqual(replaced, 1)
+            rows = json.loads(path.read_text())["profiles"]["default"]
+            self.assertEqual(len(rows), before + 1)
+            t7 = [r for r in rows if r["media_model"] == "Samsung T7" and r["height"] == 1080
+                  and r["sensor"] == "imx477" and r["storage_type"] == "ssd"]
+            self.assertEqual([r["max_fps_no_buffer"] for r in t7], [37])
+            self.assertEqual(t7[0]["confidence"], "measured")
+
+            loaded = load_profile_rows({"profiles_file": str(path)})
+            fps = {p.max_fps for p in parse_performance_table(loaded) if p.notes.startswith("Measured")}
+            self.assertEqual(fps, {37.0, 45.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+class _DummyBus:
+    def read_byte(self, *_args):
+        raise OSError
+
+    def close(self):
+        pass
+
+
+sys.modules.setdefault("smbus", types.SimpleNamespace(SMBus=lambda *_args: _DummyBus()))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+
+from module import ssd_monitor
+from module.storage_event_bench import LatencyTracker, summarize
+from module.storage_events import StorageEvent, StorageEventClient
+
+
+def event(name, device="/dev/sda1", path="/media/RAW", udev_ts=None, ts=None, **extra):
+    return StorageEvent(name, device=device, path=path, udev_ts=udev_ts, ts=ts, **extra)
+
+
+class StorageEventTests(unittest.TestCase):
+    def test_parse_event_line(self):
+        ev = StorageEvent.from_json(
+            b'{"event": "promote", "device": "/dev/sda1", "path": "/media/RAW",'
+            b' "fstype": "ext4", "kind": "usb_ssd", "udev_ts": 10.0, "ts": 10.02}\n'
+        )
+        self.assertEqual((ev.event, ev.device_name, ev.device_type, ev.fstype), ("promote", "sda1", "SSD", "ext4"))
+        self.assertAlmostEqual(ev.latency_ms(now=10.05), 50.0)
+        self.assertIsNone(StorageEvent.from_json(b"Mounted /dev/sda1 OK"))
+        self.assertIsNone(StorageEvent.from_json(b'{"device": "/dev/sda1"}'))
+        # NVMe HATs and CFE cards look alike to the service; SSDMonitor probes.
+        self.assertIsNone(event("mount", kind="nvme_hat").device_type)
+
+    def test_client_reads_events_from_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen(1)
+            received = []
+            done = threading.Event()
+
+            def on_event(ev):
+                received.append(ev)
+                if len(received) == 2:
+                    done.set()
+
+            client = StorageEventClient(on_event, path=path, reconnect_s=0.05)
+            client.start()
+            conn, _ = server.accept()
+            conn.sendall(b'{"event": "mount", "device": "/dev/sda1", "path": "/media/RAW"}\n'
+                         b'garbage\n{"event": "yank", "device": "/dev/sda1", "path": "/media/RAW"}\n')
+            self.assertTrue(done.wait(2.0))
+            self.assertTrue(client.connected)
+            conn.close()
+            client.stop()
+            server.close()
+        self.assertEqual([ev.event for ev in received], ["mount", "yank"])
+
+
+class SSDMonitorEventTests(unittest.TestCase):
+    def _monitor(self):
+        monitor = ssd_monitor.SSDMonitor.__new__(ssd_monitor.SSDMonitor)
+        monitor._mount_path = Path("/media/RAW")
+        monitor._is_mounted = False
+        monitor._device_name = None
+        monitor._state_lock = threading.RLock()
+        monitor._released_device = None
+        monitor.last_event_latency_ms = None
+        monitor.storage_events = types.SimpleNamespace(connected=True)
+        return monitor
+
+    def test_events_drive_mount_state_without_probing(self):
+        monitor = self._monitor()
+
+        def mounted(ev=None):
+            monitor._is_mounted = True
+            monitor._device_name = ev.device_name
+
+        with patch.object(monitor, "_handle_mount", side_effect=mounted) as hm, \
+                patch.object(monitor, "_handle_unmount") as hu:
+            monitor._on_storage_event(event("standby", path="/media/RAW1"))
+            monitor._on_storage_event(event("mount", udev_ts=time.monotonic()))
+            monitor._on_storage_event(event("mount"))      # snapshot after reconnect
+            self.assertEqual(hm.call_count, 1)
+            self.assertIsNotNone(monitor.last_event_latency_ms)
+
+            monitor._on_storage_event(event("yank"))
+            hu.assert_called_once_with()
+            self.assertEqual(monitor._released_device, "sda1")
+
+    def test_lazy_unmount_of_released_drive_is_not_readopted(self):
+        monitor = self._monitor()
+        monitor._released_device = "sda1"
+        with patch.object(ssd_monitor.os.path, "ismount", return_value=True), \
+                patch.object(monitor, "_get_device_name", return_value="sda1"), \
+                patch.object(monitor, "_handle_mount") as hm:
+            monitor._check_mount_status()
+        hm.assert_not_called()
+        with patch.object(ssd_monitor.os.path, "ismount", return_value=False):
+            monitor._check_mount_status()
+        self.assertIsNone(monitor._released_device)
+
+    def test_connected_channel_skips_device_probe(self):
+        monitor = self._monitor()
+        monitor._is_mounted = True
+        with patch.object(ssd_monitor.os.path, "ismount", return_value=True), \
+                patch.object(monitor, "_get_device_name") as probe, \
+                patch.object(monitor, "_update_space_left") as space:
+            monitor._check_mount_status()
+        probe.assert_not_called()
+        space.assert_called_once_with()
+
+
+class LatencyTrackerTests(unittest.TestCase):
+    def test_pairs_events_with_is_mounted_changes(self):
+        tracker = LatencyTracker(timeout_s=5.0)
+        tracker.on_event(event("yank", udev_ts=100.0, ts=100.01))
+        tracker.on_event(event("promote", device="/dev/sdb1", udev_ts=100.0, ts=100.2))
+        tracker.on_event(event("mount", udev_ts=None))           # snapshot: ignored
+        tracker.on_is_mounted("0", now=100.05)
+        tracker.on_is_mounted("1", now=100.3)
+        self.assertEqual([(s.event, round(s.event_ms), round(s.redis_ms)) for s in tracker.samples],
+                         [("yank", 10, 50), ("promote", 200, 300)])
+
+        tracker.on_event(event("unmount", udev_ts=200.0, ts=200.0))
+        tracker.expire(now=206.0)
+        self.assertIsNone(tracker.samples[-1].redis_ms)
+        self.assertEqual(summarize([50.0, 300.0, 10.0])["median"], 50.0)
+        self.assertIsNone(summarize([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import datetime
+import json
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.modules.setdefault("redis", types.SimpleNamespace(StrictRedis=object))
+sys.path.insert(0, str(ROOT / "_test"))
+
+from module.frame_presence import FramePresenceBitmap
+from module.redis_controller import ParameterKey
+from module.stats_replay import MemoryRedis
+from module.take_report import REPORT_NAME, read_cpu_temp_c
+from test_stats_pipeline import make_listener, payload
+
+
+class TakeReportTests(unittest.TestCase):
+    def test_report_written_next_to_clip_and_indexed(self):
+        listener, controller = make_listener()
+        listener.redis_client = MemoryRedis()
+        start = datetime.datetime(2026, 1, 1, 12, 0, 0)
+        listener.recording_start_time = start
+        listener.recording_end_time = start + datetime.timedelta(seconds=2)
+        frame_ns = 41_666_667
+        for i, (buf, peak, in_flight) in enumerate([(1, 3, 2), (4, 9, 6), (0, 0, 0)]):
+            listener.handle_stats_payload(payload(
+                frameCount=i, bufferSize=buf, bufferSizeMax=peak, framesInFlight=in_flight,
+                sensorTimestamp=(i * frame_ns) + (20_000_000 if i == 2 else 0),
+                droppedFrames=0, writeFailures=0,
+            ), start)
+        t0 = start.timestamp()
+        listener.ssd_monitor = types.SimpleNamespace(
+            filesystem_type="ext4", recorder_profile="default", device_type="SSD", space_left_gb=100.0,
+            telemetry=[(t0 - 5, 10.0, 30.0, 50.0), (t0 + 1, 120.5, 41.0, 61.2), (t0 + 2, 80.0, 42.0, None)],
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            listener.take_frame_presence = {tmp: FramePresenceBitmap([0, 1, 3])}
+            listener._write_take_report()
+            report = json.loads((Path(tmp) / REPORT_NAME).read_text())
+
+        cam = report["cameras"]["cam0"]
+        self.assertEqual(cam["buffer_size_max_peak"], 9)
+        self.assertEqual(cam["frames_in_flight_peak"], 6)
+        self.assertEqual(cam["intervals"]["count"], 2)
+        self.assertEqual(len(cam["intervals"]["buckets"]), 2)
+        self.assertEqual(report["holes"][Path(tmp).name]["holes"], [[2, 2]])
+        self.assertEqual(report["storage"]["write_speed_mb_s"], [[1.0, 120.5], [2.0, 80.0]])
+        self.assertEqual(report["system"]["cpu_temp_c_peak"], 61.2)
+        self.assertEqual(report["duration_s"], 2.0)
+
+        entry = json.loads(controller.cache[ParameterKey.TAKE_REPORT.value])
+        self.assertEqual(entry["missing_frames"], 1)
+        self.assertEqual(entry["buffer_size_max_peak"], 9)
+        self.assertEqual(json.loads(listener.redis_client.lrange("take_reports", 0, -1)[0]), entry)
+
+    def test_take_peaks_reset_between_takes(self):
+        listener, _ = make_listener()
+        listener.handle_stats_payload(payload(bufferSize=5, framesInFlight=7), datetime.datetime.now())
+        camera = listener.camera_stats.cameras["cam0"]
+        self.assertEqual((camera.take_buffer_peak, camera.take_in_flight_peak), (5, 7))
+        listener.camera_stats.clear_take()
+        self.assertEqual((camera.take_buffer_peak, camera.take_in_flight_peak), (None, None))
+        self.assertEqual(camera.take_intervals.count, 0)
+
+    def test_cpu_temp_reader(self):
+        with tempfile.NamedTemporaryFile("w", suffix="temp") as fh:
+            fh.write("48312\n")
+            fh.flush()
+            self.assertEqual(read_cpu_temp_c(fh.name), 48.3)
+        self.assertIsNone(read_cpu_temp_c("/nonexistent/temp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
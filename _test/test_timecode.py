@@ -0,0 +1,106 @@
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module import timecode
+from module.timecode import TimeOfDayClock, TimecodeFormatter, formatter_for
+
+
+def legacy_format(seconds_total, rate):
+    rate = int(round(rate))
+    total_frames = int(round(seconds_total * rate))
+    frames = total_frames % rate
+    whole_seconds = total_frames // rate
+    return (
+        f"{whole_seconds // 3600:02d}:{(whole_seconds // 60) % 60:02d}:"
+        f"{whole_seconds % 60:02d}:{frames:02d}"
+    )
+
+
+class NonDropFrameTests(unittest.TestCase):
+    def test_matches_previous_formatter_for_integer_rates(self):
+        rng = random.Random(7)
+        for rate in (24, 25, 30, 48, 50, 60, 23.976):
+            fmt = formatter_for(rate)
+            self.assertFalse(fmt.drop_frame)
+            for _ in range(500):
+                seconds = rng.uniform(0, 30_000)
+                # stay clear of the exact half-frame where float rounding differs
+                frac = (seconds * fmt.nominal) % 1.0
+                if abs(frac - 0.5) < 1e-6:
+                    continue
+                self.assertEqual(
+                    fmt.seconds_to_timecode(seconds), legacy_format(seconds, rate), (rate, seconds)
+                )
+
+    def test_frame_labels(self):
+        fmt = TimecodeFormatter(24)
+        self.assertEqual(fmt.frames_to_timecode(0), "00:00:00:00")
+        self.assertEqual(fmt.frames_to_timecode(23), "00:00:00:23")
+        self.assertEqual(fmt.frames_to_timecode(24 * 3661 + 5), "01:01:01:05")
+        self.assertEqual(fmt.frames_to_timecode(24 * 3600 * 120), "120:00:00:00")
+
+
+class DropFrameTests(unittest.TestCase):
+    def test_rate_detection(self):
+        self.assertTrue(timecode.is_drop_frame_rate(29.97))
+        self.assertTrue(timecode.is_drop_frame_rate(30000 / 1001))
+        self.assertTrue(timecode.is_drop_frame_rate(59.94))
+        self.assertFalse(timecode.is_drop_frame_rate(30))
+        self.assertFalse(timecode.is_drop_frame_rate(23.976))
+
+    def test_2997_skips_two_labels_per_minute_except_tenth(self):
+        fmt = formatter_for(29.97)
+        self.assertEqual(fmt.frames_to_timecode(1799), "00:00:59;29")
+        self.assertEqual(fmt.frames_to_timecode(1800), "00:01:00;02")
+        self.assertEqual(fmt.frames_to_timecode(17981), "00:09:59;29")
+        self.assertEqual(fmt.frames_to_timecode(17982), "00:10:00;00")
+        self.assertEqual(fmt.frames_to_timecode(17982 * 6), "01:00:00;00")
+
+    def test_5994_skips_four_labels(self):
+        fmt = formatter_for(59.94)
+        self.assertEqual(fmt.frames_to_timecode(3599), "00:00:59;59")
+        self.assertEqual(fmt.frames_to_timecode(3600), "00:01:00;04")
+        self.assertEqual(fmt.frames_to_timecode(35964), "00:10:00;00")
+
+    def test_drop_frame_tracks_wall_clock(self):
+        fmt = formatter_for(29.97)
+        self.assertEqual(fmt.seconds_to_timecode(3600.0), "01:00:00;00")
+        self.assertEqual(fmt.frames_to_timecode(fmt.frames_per_day - 1), "23:59:59;29")
+
+    def test_drop_frame_rejected_for_other_rates(self):
+        with self.assertRaises(ValueError):
+            TimecodeFormatter(24, drop_frame=True)
+
+
+class TimeOfDayClockTests(unittest.TestCase):
+    def test_matches_localtime_and_caches_midnight(self):
+        clock = TimeOfDayClock()
+        now_ns = time.time_ns()
+        for offset_ms in range(0, 5000, 40):
+            ns = now_ns + offset_ms * 1_000_000
+            lt = time.localtime(ns // timecode.NS_PER_SECOND)
+            expected = (lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec) * timecode.NS_PER_SECOND
+            expected += ns % timecode.NS_PER_SECOND
+            self.assertEqual(clock.since_midnight_ns(ns), expected)
+        self.assertLessEqual(clock.recomputes, 2)
+
+    def test_revalidates_after_interval(self):
+        clock = TimeOfDayClock(revalidate_s=1.0)
+        now_ns = time.time_ns() // timecode.NS_PER_SECOND * timecode.NS_PER_SECOND
+        with patch.object(timecode.time, "localtime", wraps=time.localtime) as localtime:
+            clock.since_midnight_ns(now_ns)
+            clock.since_midnight_ns(now_ns + 500_000_000)
+            clock.since_midnight_ns(now_ns + 3 * timecode.NS_PER_SECOND)
+        self.assertEqual(localtime.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,13 +17,16 @@ Features:
 - RAW drive arbitration
 - Watchdogs for device health
 - CFE HAT I2C button/LED control
+- JSON mount events for cinemate on a Unix socket
 """
 
 import errno
+import json
 import logging
 import os
 import re
 import signal
+import socket
 import subprocess
 import sys
 import threading
@@ -50,6 +53,7 @@ PI_GID = int(os.getenv("PI_GID", "1000"))
 MOUNT_BASE = Path("/media")
 RAW_LABEL = "RAW"
 RAW_ACTIVE_PATH = MOUNT_BASE / RAW_LABEL  # primary recorder target (/media/RAW)
+EVENTS_SOCKET = Path(os.getenv("STORAGE_AUTOMOUNT_EVENTS", "/run/storage-automount/events.sock"))
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Logging
@@ -81,6 +85,104 @@ YANK_ERRNOS = {
     getattr(errno, "ESTALE", errno.EIO),
 }
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Event Channel
+# ─────────────────────────────────────────────────────────────────────────────
+# cinemate's SSDMonitor connects to EVENTS_SOCKET and gets one JSON object per
+# line for every mount change we make (mount, standby, promote, unmount, yank)
+# instead of tailing this service's log and re-probing with findmnt/blkid.
+# `udev_ts` is the CLOCK_MONOTONIC time the udev / watchdog / button event that
+# caused it was seen, so the consumer can measure end-to-end latency.
+_event_clients: list[socket.socket] = []
+_event_lock = threading.Lock()
+_event_origin = threading.local()  # per-thread time of the triggering event
+
+def _mark_event_origin():
+    _event_origin.ts = time.monotonic()
+
+def _mount_fstype(path: "Path") -> str | None:
+    """Filesystem type mounted at `path`, from /proc (no fork)."""
+    target = str(path)
+    fstype = None
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[1] == target:
+                    fstype = fields[2]
+    except OSError:
+        pass
+    return fstype
+
+def _event_line(event: str, dev: str, path: "Path | None", *, fstype: str | None = None,
+                kind: str | None = None, udev_ts: float | None = None) -> bytes:
+    payload = {
+        "event": event,
+        "device": dev,
+        "path": str(path) if path is not None else None,
+        "fstype": fstype,
+        "kind": kind,
+        "udev_ts": udev_ts,
+        "ts": time.monotonic(),
+    }
+    return (json.dumps(payload) + "\n").encode()
+
+def _emit_event(event: str, dev: str, path: "Path | None", *, fstype: str | None = None,
+                kind: str | None = None):
+    """Send an event to every connected client; slow or gone clients are dropped."""
+    line = _event_line(event, dev, path, fstype=fstype, kind=kind,
+                       udev_ts=getattr(_event_origin, "ts", None))
+    log.debug("event: %s %s → %s", event, dev, path)
+    with _event_lock:
+        for client in list(_event_clients):
+            try:
+                sent = client.send(line, socket.MSG_DONTWAIT)
+            except OSError:
+                sent = -1
+            if sent != len(line):
+                _event_clients.remove(client)
+                client.close()
+
+def _event_server():
+    """Accept event subscribers; each gets a snapshot of the current mounts."""
+    try:
+        EVENTS_SOCKET.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            EVENTS_SOCKET.unlink()
+        except FileNotFoundError:
+            pass
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(EVENTS_SOCKET))
+        os.chmod(EVENTS_SOCKET, 0o666)
+        server.listen(8)
+    except OSError as e:
+        log.warning("Event channel disabled, cannot listen on %s: %s", EVENTS_SOCKET, e)
+        return
+    log.info("Event channel listening on %s", EVENTS_SOCKET)
+
+    while True:
+        try:
+            client, _ = server.accept()
+        except OSError as e:
+            log.debug("Event channel accept failed: %s", e)
+            time.sleep(0.5)
+            continue
+        snapshot = b""
+        for dev, path in list(_mounts.items()):
+            standby = dev in _raw_pool and path != RAW_ACTIVE_PATH
+            snapshot += _event_line("standby" if standby else "mount", dev, path,
+                                    fstype=_mount_fstype(path),
+                                    kind=_active_mount_kinds.get(dev))
+        with _event_lock:
+            try:
+                if snapshot:
+                    client.sendall(snapshot)
+            except OSError:
+                client.close()
+                continue
+            _event_clients.append(client)
+        log.debug("Event subscriber connected (%d total)", len(_event_clients))
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Media Profiles (tuning per connection type)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -390,12 +492,14 @@ def _purge_stale_mountpoints():
             except OSError:
                 pass
 
-def _mount(dev: str, target: "Path | None" = None, *, force: bool = False) -> bool:
+def _mount(dev: str, target: "Path | None" = None, *, force: bool = False,
+           event: str = "mount") -> bool:
     """Mount `dev` at `target` (or a label-derived path) with media tuning.
 
     Returns True on success (or when already mounted by us). When `force` is
     True the failed-device cooldown is ignored — used by RAW promotion so a
     drive that briefly failed can be retried the instant it is needed.
+    `event` is what a successful mount is announced as on the event channel.
     """
     global _failed_devices
 
@@ -445,6 +549,7 @@ def _mount(dev: str, target: "Path | None" = None, *, force: bool = False) -> bo
         _mounts[dev] = mount_path
         _active_mount_kinds[dev] = kind
         _apply_media_tuning(dev, kind, mount_path)
+        _emit_event(event, dev, mount_path, fstype=fstype, kind=kind)
         return True
 
     # Attempt mount
@@ -462,6 +567,7 @@ def _mount(dev: str, target: "Path | None" = None, *, force: bool = False) -> bo
         _apply_media_tuning(dev, kind, mount_path)
 
         log.info("✓ Mounted %s successfully at %s", dev, mount_path)
+        _emit_event(event, dev, mount_path, fstype=fstype, kind=kind)
         return True
 
     # Mount failed - try repair
@@ -477,6 +583,7 @@ def _mount(dev: str, target: "Path | None" = None, *, force: bool = False) -> bo
                 pass
             _apply_media_tuning(dev, kind, mount_path)
             log.info("✓ Mounted %s after repair at %s", dev, mount_path)
+            _emit_event(event, dev, mount_path, fstype=fstype, kind=kind)
             return True
 
     # Failed - cleanup and cooldown (never remove the primary /media/RAW dir)
@@ -489,13 +596,13 @@ def _mount(dev: str, target: "Path | None" = None, *, force: bool = False) -> bo
     log.error("✗ Failed to mount %s", dev)
     return False
 
-def _unmount(dev: str):
-    """Unmount device and clean up."""
+def _unmount(dev: str, *, event: str = "unmount"):
+    """Unmount device and clean up. `event` is "yank" when the device vanished."""
     if dev not in _mounts:
         return
 
     mount_path = _mounts.pop(dev, None)
-    _active_mount_kinds.pop(dev, None)
+    kind = _active_mount_kinds.pop(dev, None)
 
     if not mount_path:
         return
@@ -505,6 +612,7 @@ def _unmount(dev: str):
 
     # Use Popen for non-blocking unmount (umount can block for 30+ seconds)
     subprocess.Popen(["umount", "-l", str(mount_path)], stderr=subprocess.DEVNULL)
+    _emit_event(event, dev, mount_path, kind=kind)
 
     # Leave mount point cleanup to startup purge. Directory scans can block on
     # yanked or erroring media, exactly when we need unmount handling to stay fast.
@@ -567,7 +675,7 @@ def _mount_standby(dev: str):
     if dev in _mounts:
         return
     target = _next_standby_path()
-    if _mount(dev, target):
+    if _mount(dev, target, event="standby"):
         log.info("RAW standby %s mounted at %s", dev, target)
 
 def _promote_to_active(dev: str) -> bool:
@@ -610,6 +718,9 @@ def _promote_to_active(dev: str) -> bool:
                 # (the standby mount only applied per-device block tuning).
                 _apply_media_tuning(dev, _active_mount_kinds.get(dev, "other"), RAW_ACTIVE_PATH)
                 log.info("✓ Promoted RAW %s: %s → %s", dev, src, RAW_ACTIVE_PATH)
+                _emit_event("promote", dev, RAW_ACTIVE_PATH,
+                            fstype=_mount_fstype(RAW_ACTIVE_PATH),
+                            kind=_active_mount_kinds.get(dev))
                 return True
             # `mount --move` is unsupported for FUSE mounts such as ntfs-3g:
             # drop the standby mount and fall back to a fresh mount at
@@ -619,7 +730,7 @@ def _promote_to_active(dev: str) -> bool:
             _unmount(dev)
 
         _failed_devices.pop(dev, None)
-        if _mount(dev, RAW_ACTIVE_PATH, force=True):
+        if _mount(dev, RAW_ACTIVE_PATH, force=True, event="promote"):
             _active_raw = dev
             log.info("✓ Promoted RAW %s to %s", dev, RAW_ACTIVE_PATH)
             return True
@@ -657,7 +768,7 @@ def _add_raw(dev: str):
                 return
         _mount_standby(dev)
 
-def _handle_raw_gone(dev: str):
+def _handle_raw_gone(dev: str, event: str = "unmount"):
     """Active/standby RAW device removed, ejected or yanked → unmount + promote."""
     global _active_raw
     with _raw_lock:
@@ -665,7 +776,7 @@ def _handle_raw_gone(dev: str):
         _register_raw_remove(dev)
         _failed_devices.pop(dev, None)   # let an immediate reconnect retry
         if dev in _mounts:
-            _unmount(dev)
+            _unmount(dev, event=event)
         if was_active:
             _active_raw = None
             _promote_next()
@@ -680,11 +791,12 @@ def _on_block_removed(devnode: str):
     if _active_raw and (_active_raw == devnode or _is_partition_of(_active_raw, devnode)):
         if _active_raw not in affected:
             affected.append(_active_raw)
+    # A device that disappears while still mounted was pulled, not ejected.
     for d in affected:
         if d in _raw_pool or d == _active_raw:
-            _handle_raw_gone(d)
+            _handle_raw_gone(d, "yank")
         else:
-            _unmount(d)
+            _unmount(d, event="yank")
 
 def _safety_net_promote():
     """Periodic reconcile (called from the sanity watchdog): cover out-of-band
@@ -702,8 +814,9 @@ def _safety_net_promote():
             log.info("Active RAW %s no longer mounted at %s; releasing (out-of-band unmount)",
                      _active_raw, RAW_ACTIVE_PATH)
             _mounts.pop(_active_raw, None)
-            _active_mount_kinds.pop(_active_raw, None)
+            kind = _active_mount_kinds.pop(_active_raw, None)
             _register_raw_remove(_active_raw)
+            _emit_event("unmount", _active_raw, RAW_ACTIVE_PATH, kind=kind)
             _active_raw = None
         if _active_raw is None and not _mountpoint_in_use(RAW_ACTIVE_PATH):
             _promote_next()
@@ -725,10 +838,11 @@ def _nvme_watchdog():
                     state = state_file.read_text().strip()
                     if state == "dead":
                         log.warning("NVMe controller dead for %s, lazy unmount", dev)
+                        _mark_event_origin()
                         if dev in _raw_pool or dev == _active_raw:
-                            _handle_raw_gone(dev)
+                            _handle_raw_gone(dev, "yank")
                         else:
-                            _unmount(dev)
+                            _unmount(dev, event="yank")
                 except OSError:
                     pass
         time.sleep(0.5)
@@ -748,18 +862,21 @@ def _sanity_watchdog():
                 if exc.errno in YANK_ERRNOS:
                     log.warning("I/O error on %s (%s) - device yanked, unmounting",
                               dev, os.strerror(exc.errno))
+                    _mark_event_origin()
                     if dev in _raw_pool or dev == _active_raw:
                         # Unmount + promote a standby so recording can continue.
-                        _handle_raw_gone(dev)
+                        _handle_raw_gone(dev, "yank")
                     else:
                         subprocess.Popen(["umount", "-l", str(mp)],
                                          stderr=subprocess.DEVNULL)
                         _mounts.pop(dev, None)
-                        _active_mount_kinds.pop(dev, None)
+                        kind = _active_mount_kinds.pop(dev, None)
+                        _emit_event("yank", dev, mp, kind=kind)
                         _restore_sysctls()
 
         # Reconcile RAW: promote a standby if /media/RAW went empty out-of-band
         # (e.g. a GUI eject) without a corresponding device-removal event.
+        _mark_event_origin()
         _safety_net_promote()
 
         time.sleep(3)
@@ -779,6 +896,7 @@ def _udev_worker():
 
         if not devnode:
             continue
+        _mark_event_origin()
 
         # Partition added/changed
         if action in ("add", "change") and devtype == "partition":
@@ -888,6 +1006,7 @@ def _cfe_hat_worker():
         # INSERT pressed (latch open) - pre-emptive unmount
         if ins_prev == 0 and ins_now == 1:
             log.info("CFexpress card status: REMOVED (latch opened)")
+            _mark_event_origin()
             nvme_devices = [dev for dev in list(_mounts) if dev.startswith("/dev/nvme")]
             for dev in nvme_devices:
                 log.info("Unmounting CFE device %s from %s", dev, _mounts[dev])
@@ -897,10 +1016,11 @@ def _cfe_hat_worker():
                 if dev in _raw_pool or dev == _active_raw:
                     _handle_raw_gone(dev)
                 else:
-                    subprocess.Popen(["umount", "-l", str(_mounts[dev])],
+                    mp = _mounts.pop(dev, None)
+                    subprocess.Popen(["umount", "-l", str(mp)],
                                    stderr=subprocess.DEVNULL)
-                    _mounts.pop(dev, None)
-                    _active_mount_kinds.pop(dev, None)
+                    kind = _active_mount_kinds.pop(dev, None)
+                    _emit_event("unmount", dev, mp, kind=kind)
             log.debug("Powering down PCIe...")
             _pcie(False)
             log.debug("Setting LED off...")
@@ -914,6 +1034,7 @@ def _cfe_hat_worker():
         # INSERT released - power up and mount
         if ins_prev == 1 and ins_now == 0:
             log.info("CFexpress card status: INSERTED (latch closed)")
+            _mark_event_origin()
             log.debug("Powering up PCIe...")
             _pcie(True)
             log.debug("Setting LED on...")
@@ -979,12 +1100,14 @@ def _cfe_hat_worker():
         # EJECT released - unmount all
         if ej_prev == 1 and ej_now == 0:
             log.info("CFexpress card: EJECTING")
+            _mark_event_origin()
             for dev in list(_mounts):
-                subprocess.Popen(["umount", "-l", str(_mounts[dev])],
+                mp = _mounts.pop(dev, None)
+                subprocess.Popen(["umount", "-l", str(mp)],
                               stderr=subprocess.DEVNULL)
-                _mounts.pop(dev, None)
-                _active_mount_kinds.pop(dev, None)
+                kind = _active_mount_kinds.pop(dev, None)
                 _register_raw_remove(dev)
+                _emit_event("unmount", dev, mp, kind=kind)
             with _raw_lock:
                 _active_raw = None
             _pcie(False)
@@ -1109,6 +1232,7 @@ def main():
     _initial_scan()
 
     # Start worker threads
+    threading.Thread(target=_event_server, daemon=True, name="events").start()
     threading.Thread(target=_udev_worker, daemon=True, name="udev").start()
     threading.Thread(target=_cfe_hat_worker, daemon=True, name="cfe-hat").start()
     threading.Thread(target=_nvme_watchdog, daemon=True, name="nvme-wd").start()
@@ -591,8 +591,13 @@ def start_hotspot(settings) -> None:
 
 def initialize_system(settings, pi_model="unknown"):
     """Initialize core system components."""
-    conf_rate = settings.get("settings", {}).get("conform_frame_rate", 24)
-    redis_controller = RedisController(conform_frame_rate=conf_rate)
+    settings_cfg = settings.get("settings", {})
+    conf_rate = settings_cfg.get("conform_frame_rate", 24)
+    redis_controller = RedisController(
+        conform_frame_rate=conf_rate,
+        coalesce_writes=settings_cfg.get("redis_write_coalescing", True),
+        recording_timer_mode=settings_cfg.get("recording_timer_mode", "ticker"),
+    )
     sensor_detect = SensorDetect(settings)
     ssd_monitor = SSDMonitor(redis_controller=redis_controller)
     usb_monitor = USBMonitor(ssd_monitor, settings=settings)
@@ -848,8 +853,10 @@ def run_application(args, log_queue):
         live_sync_startup_guard_frames=settings_cfg.get("live_sync_startup_guard_frames", 10),
         final_sync_analysis_tolerance_frames=settings_cfg.get("final_sync_analysis_tolerance_frames", 1),
         tc_drop_jitter_tolerance_frames=settings_cfg.get("tc_drop_jitter_tolerance_frames", 1),
+        buffer_guard_seconds=settings_cfg.get("buffer_guard_seconds", 5),
     )
     redis_listener.set_recording_stop_callback(cinepi_controller.stop_recording)
+    redis_listener.set_buffer_overflow_callback(cinepi_controller.handle_buffer_overflow_warning)
     cinepi_controller.attach_redis_listener(redis_listener)
     battery_monitor = BatteryMonitor()
     i2c_oled = None
@@ -927,6 +934,7 @@ def run_application(args, log_queue):
             ParameterKey.FPS_LAST.value,
             redis_controller.get_value(ParameterKey.FPS.value)
         )
+        redis_controller.flush()
 
         # Stop peripherals
 
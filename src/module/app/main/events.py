@@ -56,11 +56,10 @@ def register_events(socketio, redis_controller, cinepi_controller, simple_gui, s
     def redis_change_handler(data):
         key = data['key']
         value = data['value']
-        if key in [ParameterKey.ISO.value, ParameterKey.SHUTTER_A.value, ParameterKey.FPS_ACTUAL.value, ParameterKey.WB.value, ParameterKey.FRAMECOUNT.value, ParameterKey.BUFFER.value]:
-            socketio.emit('parameter_change', {key: value})
-
         if key == ParameterKey.WB_USER.value:
             socketio.emit('parameter_change', {'wb': value})
+        else:
+            socketio.emit('parameter_change', {key: value})
 
         if key == ParameterKey.FPS_ACTUAL.value:
             # Emit the updated shutter_a_steps array and the current shutter speed
@@ -70,17 +69,40 @@ def register_events(socketio, redis_controller, cinepi_controller, simple_gui, s
             current_shutter_a = redis_controller.get_value(ParameterKey.SHUTTER_A.value)
             socketio.emit('shutter_a_update', {'shutter_a_steps': shutter_a_steps, 'current_shutter_a': current_shutter_a})
 
-        if key == ParameterKey.RESOLUTION_TARGET_MODE.value:
-            emit_resolution_selection(value)
-
-        if key in (ParameterKey.SENSOR_MODE.value, ParameterKey.RESOLUTION_SWITCHING.value):
+    def resolution_change_handler(data):
+        if data['key'] == ParameterKey.RESOLUTION_TARGET_MODE.value:
+            emit_resolution_selection(data['value'])
+        else:
             emit_resolution_selection()
 
-        if key == ParameterKey.WB.value:
-            time.sleep(2)  # Add a 2-second pause
-            socketio.emit('reload_browser')  # Emit event to reload the browser
-
-    redis_controller.redis_parameter_changed.subscribe(redis_change_handler)
+    def wb_reload_handler(_data):
+        time.sleep(2)  # Add a 2-second pause
+        socketio.emit('reload_browser')  # Emit event to reload the browser
+
+    redis_controller.redis_parameter_changed.subscribe(
+        redis_change_handler,
+        keys=(
+            ParameterKey.ISO,
+            ParameterKey.SHUTTER_A,
+            ParameterKey.FPS_ACTUAL,
+            ParameterKey.WB,
+            ParameterKey.WB_USER,
+            ParameterKey.FRAMECOUNT,
+            ParameterKey.BUFFER,
+        ),
+    )
+    redis_controller.redis_parameter_changed.subscribe(
+        resolution_change_handler,
+        keys=(
+            ParameterKey.RESOLUTION_TARGET_MODE,
+            ParameterKey.SENSOR_MODE,
+            ParameterKey.RESOLUTION_SWITCHING,
+        ),
+    )
+    # separate worker: the reload delay must not hold up parameter updates
+    redis_controller.redis_parameter_changed.subscribe(
+        wb_reload_handler, keys=(ParameterKey.WB,)
+    )
 
     @socketio.on('update_background_color')
     def handle_update_background_color():
@@ -37,3 +37,14 @@ def index():
                            current_shutter_a=shutter_a_value,
                            current_fps=fps_value,
                            background_color=background_color_value)
+
+
+@main_routes.route('/fps_history')
+def fps_history():
+    cinepi_controller = current_app.config['CINEPI_CONTROLLER']
+    listener = getattr(cinepi_controller, 'redis_listener', None)
+    if listener is None:
+        return jsonify({"error": "redis listener not attached"}), 503
+    seconds = request.args.get('seconds', default=60, type=int)
+    camera = request.args.get('camera') or None
+    return jsonify({"seconds": seconds, "cameras": listener.fps_history(seconds, camera)})
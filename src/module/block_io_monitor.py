@@ -0,0 +1,188 @@
+"""Block-layer write throughput and latency for the RAW drive.
+
+``BlockIOMonitor`` samples the kernel's per-device I/O counters
+(``/sys/class/block/<dev>/stat``, falling back to ``/proc/diskstats``)
+and the page-cache backlog (``Dirty`` / ``Writeback`` in ``/proc/meminfo``)
+at a fixed cadence. From the counter deltas it derives what the device
+actually wrote — unlike the statvfs free-space delta, which only moves
+once dirty pages have been flushed — plus requests in flight, mean write
+latency and how busy the device was.
+
+Each sample is three small procfs/sysfs reads; values are published to
+Redis only when they change.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+from module.redis_controller import ParameterKey
+
+MIB = 1024 * 1024
+SECTOR_BYTES = 512          # the block layer always counts 512-byte sectors
+
+# Field positions in a block "stat" line (Documentation/block/stat.rst).
+_WRITE_IOS = 4
+_WRITE_SECTORS = 6
+_WRITE_TICKS = 7
+_IN_FLIGHT = 8
+_IO_TICKS = 9
+
+
+def read_block_stat(device: str, *, sys_root: str = "/sys", proc_root: str = "/proc") -> list[int] | None:
+    """Counters for *device* (e.g. ``sda1``), or None when it is unknown."""
+    try:
+        with open(os.path.join(sys_root, "class", "block", device, "stat"), "rb") as fh:
+            return [int(v) for v in fh.read().split()]
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(proc_root, "diskstats"), "rb") as fh:
+            target = device.encode()
+            for line in fh:
+                fields = line.split()
+                if len(fields) > 13 and fields[2] == target:
+                    return [int(v) for v in fields[3:]]
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_dirty_kib(*, proc_root: str = "/proc") -> tuple[int, int] | None:
+    """``(Dirty, Writeback)`` from /proc/meminfo in KiB."""
+    dirty = writeback = None
+    try:
+        with open(os.path.join(proc_root, "meminfo"), "rb") as fh:
+            for line in fh:
+                if line.startswith(b"Dirty:"):
+                    dirty = int(line.split()[1])
+                elif line.startswith(b"Writeback:"):
+                    writeback = int(line.split()[1])
+                if dirty is not None and writeback is not None:
+                    return dirty, writeback
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class BlockIOMonitor:
+    """Samples one block device on its own thread while it is mounted."""
+
+    KEYS = {
+        "write_mib_s": ParameterKey.WRITE_SPEED_TO_DRIVE.value,
+        "in_flight": ParameterKey.DRIVE_IN_FLIGHT.value,
+        "write_latency_ms": ParameterKey.DRIVE_WRITE_LATENCY_MS.value,
+        "busy_percent": ParameterKey.DRIVE_BUSY_PERCENT.value,
+        "dirty_mib": ParameterKey.DRIVE_DIRTY_MB.value,
+        "writeback_mib": ParameterKey.DRIVE_WRITEBACK_MB.value,
+    }
+
+    def __init__(
+        self,
+        redis_controller=None,
+        *,
+        interval_s: float = 0.5,
+        sys_root: str = "/sys",
+        proc_root: str = "/proc",
+    ):
+        self._redis = redis_controller
+        self.interval_s = interval_s
+        self.sys_root = sys_root
+        self.proc_root = proc_root
+        self.device: str | None = None
+        self._prev: tuple[float, list[int]] | None = None
+        self._published: dict[str, str] = {}
+        self._stop_evt = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.write_mib_s = 0.0
+        self.latest: dict = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, device: str | None) -> bool:
+        """Sample *device* (``sda1``, ``nvme0n1p1`` …) until :meth:`stop`."""
+        self.stop()
+        if not device or read_block_stat(device, sys_root=self.sys_root, proc_root=self.proc_root) is None:
+            logging.info("Block I/O stats unavailable for %s; using free-space write speed.", device)
+            return False
+        self.device = device
+        self._stop_evt.clear()
+        self._thread = threading.Thread(target=self._run, name="BlockIOMonitor", daemon=True)
+        self._thread.start()
+        logging.info("Block I/O monitor sampling %s every %.2f s", device, self.interval_s)
+        return True
+
+    def stop(self) -> None:
+        self._stop_evt.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval_s + 1.0)
+        self.device = None
+        self._prev = None
+        self.write_mib_s = 0.0
+        self.latest = {}
+        if self._published:
+            self._publish({name: 0 for name in self.KEYS})
+        self._published = {}
+
+    def _run(self) -> None:
+        while not self._stop_evt.is_set():
+            try:
+                sample = self.sample()
+                if sample is not None:
+                    self._publish(sample)
+            except Exception as exc:
+                logging.warning("Block I/O sample failed: %s", exc)
+            self._stop_evt.wait(self.interval_s)
+
+    def sample(self, now: float | None = None) -> dict | None:
+        """Take one sample; returns the derived values (None on the first)."""
+        device = self.device
+        if device is None:
+            return None
+        stats = read_block_stat(device, sys_root=self.sys_root, proc_root=self.proc_root)
+        if stats is None or len(stats) <= _IO_TICKS:
+            return None
+        now = time.monotonic() if now is None else now
+        prev, self._prev = self._prev, (now, stats)
+        if prev is None:
+            return None
+        dt = now - prev[0]
+        if dt <= 0:
+            return None
+        old = prev[1]
+        ios = stats[_WRITE_IOS] - old[_WRITE_IOS]
+        sectors = stats[_WRITE_SECTORS] - old[_WRITE_SECTORS]
+        ticks = stats[_WRITE_TICKS] - old[_WRITE_TICKS]
+        busy_ms = stats[_IO_TICKS] - old[_IO_TICKS]
+        if ios < 0 or sectors < 0:          # counters reset (device re-added)
+            return None
+        dirty = read_dirty_kib(proc_root=self.proc_root) or (0, 0)
+        result = {
+            "write_mib_s": round(sectors * SECTOR_BYTES / MIB / dt, 2),
+            "in_flight": stats[_IN_FLIGHT],
+            "write_latency_ms": round(ticks / ios, 2) if ios > 0 else 0.0,
+            "busy_percent": round(min(100.0, max(0.0, busy_ms / (dt * 10.0))), 1),
+            "dirty_mib": round(dirty[0] / 1024, 1),
+            "writeback_mib": round(dirty[1] / 1024, 1),
+        }
+        self.write_mib_s = result["write_mib_s"]
+        self.latest = result
+        return result
+
+    def _publish(self, sample: dict) -> None:
+        if self._redis is None:
+            return
+        changes = {}
+        for name, key in self.KEYS.items():
+            text = str(sample[name])
+            if self._published.get(key) != text:
+                changes[key] = text
+                self._published[key] = text
+        if changes:
+            self._redis.set_values(changes)
@@ -0,0 +1,70 @@
+"""Time-to-overflow estimate for the cinepi-raw RAM frame buffer.
+
+``BufferOverflowPredictor`` is fed the buffer level on every cp_stats
+message and keeps an exponentially smoothed fill rate (frames/s). When the
+buffer is already backing up, the rate is cross-checked against the drive:
+frames arriving per second minus frames the measured write speed can
+drain. The larger of the two wins, so a drive that slows down is caught
+before the trend alone shows it. Every update is O(1) with no allocation
+beyond the float results.
+"""
+
+from __future__ import annotations
+
+MIB = 1024 * 1024
+
+
+def frame_mib(width: int | None, height: int | None, bit_depth: int | None) -> float | None:
+    """Approximate raw frame size in MiB (uncompressed, packed)."""
+    if not width or not height or not bit_depth:
+        return None
+    return width * height * bit_depth / 8 / MIB
+
+
+class BufferOverflowPredictor:
+    __slots__ = ("smoothing_s", "min_rate", "rate", "eta_s", "_last_level", "_last_t")
+
+    def __init__(self, *, smoothing_s: float = 1.0, min_rate: float = 0.5):
+        self.smoothing_s = max(1e-3, float(smoothing_s))
+        self.min_rate = float(min_rate)     # frames/s below which nothing is predicted
+        self.reset()
+
+    def reset(self) -> None:
+        self.rate = 0.0
+        self.eta_s: float | None = None
+        self._last_level: int | None = None
+        self._last_t: float | None = None
+
+    def update(
+        self,
+        level: int,
+        capacity: int,
+        now_s: float,
+        *,
+        inflow_fps: float | None = None,
+        drain_fps: float | None = None,
+    ) -> float | None:
+        """Feed one sample; returns seconds until the buffer is full, or None."""
+        last_t = self._last_t
+        if last_t is not None:
+            dt = now_s - last_t
+            if dt <= 0:
+                return self.eta_s
+            slope = (level - self._last_level) / dt
+            alpha = dt / (self.smoothing_s + dt)
+            self.rate += alpha * (slope - self.rate)
+        self._last_level = level
+        self._last_t = now_s
+
+        rate = self.rate
+        if level > 0 and rate > 0 and inflow_fps is not None and drain_fps is not None:
+            rate = max(rate, inflow_fps - drain_fps)
+        if capacity <= 0:
+            self.eta_s = None
+        elif level >= capacity:
+            self.eta_s = 0.0
+        elif rate < self.min_rate:
+            self.eta_s = None
+        else:
+            self.eta_s = (capacity - level) / rate
+        return self.eta_s
@@ -0,0 +1,272 @@
+"""Per-camera cp_stats state for single- and dual-sensor rigs.
+
+Every cinepi-raw process publishes on the shared ``cp_stats`` channel and
+tags its messages with ``cameraPort``. ``CameraStatsState`` holds what one
+camera last reported (counters, buffer peak, frame-interval window, drop
+bookkeeping) so interleaved cam0/cam1 streams never overwrite each other.
+``CameraStatsAggregator`` owns one state per port and derives the
+combined values RedisListener publishes (framecount, buffer, is_buffering).
+"""
+
+from __future__ import annotations
+
+import time
+
+from module.frame_stats import NS_PER_SECOND, FpsHistory, FrameIntervalStats, IntervalHistogram
+from module.stats_pipeline import (
+    StatsRecord,
+    fps_deviates,
+    hw_drop_slots,
+    tc_diff_drop_slots,
+)
+
+# A camera whose frameCount lags the newest report by this long has stopped
+# publishing (stopped, crashed or idle in a single-camera take) and no longer
+# counts towards the combined framecount.
+FRAME_COUNT_STALE_S = 1.0
+
+
+class CameraStatsState:
+    """Latest counters and per-take drop bookkeeping for one camera port."""
+
+    __slots__ = (
+        "port",
+        "frame_count",
+        "frame_count_at",
+        "in_take",
+        "tc_frame_count",
+        "dropped_frames",
+        "write_failures",
+        "buffer_size",
+        "buffer_peak",
+        "frames_in_flight",
+        "last_timestamp",
+        "intervals",
+        "drop_count",
+        "write_failure_count",
+        "take_intervals",
+        "take_buffer_peak",
+        "take_in_flight_peak",
+        "fps_history",
+    )
+
+    def __init__(self, port: str):
+        self.port = port
+        self.intervals = FrameIntervalStats()
+        self.take_intervals = IntervalHistogram()
+        self.fps_history = FpsHistory()        # kept across takes and resets
+        self.last_timestamp: int | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything the camera reported (framecount reset)."""
+        self.frame_count: int | None = None
+        self.frame_count_at: float | None = None
+        self.buffer_size: int | None = None
+        self.buffer_peak: int | None = None
+        self.frames_in_flight: int | None = None
+        self.clear_take()
+
+    def clear_take(self) -> None:
+        """Reset the per-take bookkeeping (drops, write failures, peaks)."""
+        self.in_take = False
+        self.tc_frame_count: int | None = None
+        self.dropped_frames: int | None = None
+        self.write_failures: int | None = None
+        self.drop_count = 0
+        self.write_failure_count = 0
+        self.take_intervals.clear()
+        self.take_buffer_peak: int | None = None
+        self.take_in_flight_peak: int | None = None
+
+    def set_frame_count(self, count: int, at: float | None = None) -> None:
+        """Record a frameCount seen at *at* (monotonic seconds, default now)."""
+        self.frame_count = count
+        self.frame_count_at = time.monotonic() if at is None else at
+        self.in_take = True
+
+    # ------------------------------------------------------------------
+    def update(self, record: StatsRecord, accept_take_counters: bool) -> None:
+        """Fold one message into the state.
+
+        droppedFrames/writeFailures are only taken once *accept_take_counters*
+        is true: the first messages of a take can still carry the previous
+        clip's counters (see RedisListener.awaiting_fresh_framecount).
+        """
+        if record.frame_count is not None:
+            self.set_frame_count(record.frame_count)
+        if record.frames_in_flight is not None:
+            self.frames_in_flight = record.frames_in_flight
+            if self.take_in_flight_peak is None or record.frames_in_flight > self.take_in_flight_peak:
+                self.take_in_flight_peak = record.frames_in_flight
+        if record.tc_frame_count is not None:
+            self.tc_frame_count = record.tc_frame_count
+        if accept_take_counters:
+            if record.dropped_frames is not None:
+                self.dropped_frames = record.dropped_frames
+            if record.write_failures is not None:
+                self.write_failures = record.write_failures
+        if record.buffer_size is not None:
+            self.buffer_size = record.buffer_size
+            peak = record.buffer_size_max
+            self.buffer_peak = peak if peak is not None and peak > record.buffer_size else record.buffer_size
+            if self.take_buffer_peak is None or self.buffer_peak > self.take_buffer_peak:
+                self.take_buffer_peak = self.buffer_peak
+        if record.sensor_timestamp is not None:
+            previous = self.intervals.last_timestamp_ns
+            if self.intervals.add_timestamp(record.sensor_timestamp):
+                interval = record.sensor_timestamp - previous
+                self.take_intervals.add(interval)
+                self.fps_history.add(NS_PER_SECOND / interval, time.time())
+
+    @property
+    def fps(self) -> float | None:
+        return self.intervals.fps
+
+    @property
+    def backlog(self) -> bool:
+        # framesInFlight covers encode queue + disk buffer; older builds only
+        # publish bufferSize (disk backlog).
+        if self.frames_in_flight is not None:
+            return self.frames_in_flight > 0
+        return self.buffer_size is not None and self.buffer_size > 0
+
+    # ------------------------------------------------------------------
+    def detect_drops(
+        self,
+        raw_frame_count: int | None,
+        expected_fps: float | None,
+        tc_tolerance: float,
+    ) -> tuple[str, int] | None:
+        """Run the drop tiers; returns ``(tier, new_total)`` on a new drop.
+
+        Tier 1 uses the unbiased hw droppedFrames counter, tier 2 the
+        tcFrameCount − frameCount difference with a jitter deadband, and
+        tier 3 (oldest firmware) a >1 fps deviation of the measured rate.
+        """
+        counted = self.drop_count
+        if self.dropped_frames is not None:
+            if hw_drop_slots(self.dropped_frames, counted):
+                return "hw", self.dropped_frames
+        elif self.tc_frame_count is not None and raw_frame_count is not None:
+            total = tc_diff_drop_slots(self.tc_frame_count, raw_frame_count, counted, tc_tolerance)
+            if total:
+                return "tc-diff", total
+        else:
+            fps = self.fps
+            if fps is not None and expected_fps is not None and fps_deviates(fps, expected_fps):
+                return "fps-dev", counted + 1
+        return None
+
+    def new_write_failures(self) -> int:
+        """Write failures reported since the last call (0 if none)."""
+        if self.write_failures is None or self.write_failures <= self.write_failure_count:
+            return 0
+        new = self.write_failures - self.write_failure_count
+        self.write_failure_count = self.write_failures
+        return new
+
+
+class CameraStatsAggregator:
+    """Per-camera states keyed by cameraPort, plus their combined values."""
+
+    def __init__(self):
+        self.cameras: dict[str, CameraStatsState] = {}
+
+    def camera(self, port: str) -> CameraStatsState:
+        state = self.cameras.get(port)
+        if state is None:
+            state = self.cameras[port] = CameraStatsState(port)
+        return state
+
+    def reset(self) -> None:
+        for state in self.cameras.values():
+            state.reset()
+
+    def clear_take(self) -> None:
+        for state in self.cameras.values():
+            state.clear_take()
+
+    def clear_intervals(self) -> None:
+        for state in self.cameras.values():
+            state.intervals.clear()
+
+    # ── combined values ─────────────────────────────────────────────────
+    def _known(self, attr: str) -> list[int]:
+        values = []
+        for state in self.cameras.values():
+            value = getattr(state, attr)
+            if value is not None:
+                values.append(value)
+        return values
+
+    @property
+    def frame_count(self) -> int | None:
+        """Highest raw frameCount among the cameras recording this take.
+
+        Only ports that reported since clear_take() count (all reporting
+        ports before the first take), and a port whose last report is more
+        than FRAME_COUNT_STALE_S older than the newest one is dropped, so a
+        silent camera's old, higher count cannot hide the recording camera's
+        count or its reset.
+        """
+        reporting = [s for s in self.cameras.values() if s.frame_count is not None]
+        active = [s for s in reporting if s.in_take] or reporting
+        if not active:
+            return None
+        newest = max((s.frame_count_at for s in active if s.frame_count_at is not None), default=None)
+        if newest is not None:
+            active = [
+                s for s in active
+                if s.frame_count_at is not None and newest - s.frame_count_at <= FRAME_COUNT_STALE_S
+            ]
+        return max(s.frame_count for s in active)
+
+    @property
+    def buffer_size(self) -> int:
+        return max(self._known("buffer_size"), default=0)
+
+    @property
+    def buffer_peak(self) -> int | None:
+        values = self._known("buffer_peak")
+        return max(values) if values else None
+
+    @property
+    def frames_in_flight(self) -> int | None:
+        values = self._known("frames_in_flight")
+        return sum(values) if values else None
+
+    @property
+    def is_buffering(self) -> bool:
+        return any(state.backlog for state in self.cameras.values())
+
+    @property
+    def drop_count(self) -> int:
+        """Dropped slots per sensor: the worst camera."""
+        return max((state.drop_count for state in self.cameras.values()), default=0)
+
+    @property
+    def write_failures(self) -> int | None:
+        values = self._known("write_failures")
+        return sum(values) if values else None
+
+    @property
+    def write_failure_count(self) -> int:
+        return sum(state.write_failure_count for state in self.cameras.values())
+
+    def summary(self) -> dict:
+        return {port: state.intervals.summary() for port, state in sorted(self.cameras.items())}
+
+    def take_summary(self) -> dict:
+        """Per-camera figures of the current take for the take report."""
+        return {
+            port: {
+                "intervals": state.take_intervals.summary(),
+                "buffer_size_max_peak": state.take_buffer_peak,
+                "frames_in_flight_peak": state.take_in_flight_peak,
+                "dropped_frames": state.dropped_frames,
+                "write_failures": state.write_failures,
+                "drop_count": state.drop_count,
+            }
+            for port, state in sorted(self.cameras.items())
+        }
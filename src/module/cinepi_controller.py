@@ -7,12 +7,13 @@ import json
 from fractions import Fraction
 import math
 import subprocess
-from threading import Thread, Timer
+from threading import Thread
 import psutil
 import math
 import sys
 
 from module.redis_controller import ParameterKey
+from module.scheduler import get_timer_service
 from module.ir_filter import IRFilter
 from module.config_loader import load_settings as _load_settings
 from module.storage_profiles import recorder_profile_name_for_filesystem
@@ -156,7 +157,11 @@ class CinePiController:
         try:
             self.ssd_monitor.mount_event.subscribe(self._handle_storage_mount_event)
             self.redis_controller.redis_parameter_changed.subscribe(
-                self._handle_storage_restart_redis_event
+                self._handle_storage_restart_redis_event,
+                keys=(
+                    ParameterKey.IS_RECORDING,
+                    ParameterKey.STORAGE_PREROLL_ACTIVE,
+                ),
             )
         except Exception as exc:
             logging.warning("Unable to subscribe to storage profile changes: %s", exc)
@@ -251,12 +256,19 @@ class CinePiController:
         # (used slots / total slots). This is the direct "about to drop
         # frames" signal; the system-RAM limit above is a coarser backstop.
         self.BUFFER_LIMIT_PERCENT = 90
+        # What to do when RedisListener predicts the buffer will be full
+        # within buffer_guard_seconds: "none", "resolution" (next smaller
+        # same-aspect mode; cinepi-raw splits the take around the switch)
+        # or "fps" (next lower fps step).
+        self.buffer_guard_action = str(
+            self.settings.get("settings", {}).get("buffer_guard_action", "none")
+        ).strip().lower()
 
         self.update_steps()
         self.initialize_wb_cg_rb_array()  # Initialize after free-mode expands WB steps.
 
         # Set a timer to clear the startup flag after a short period
-        threading.Timer(5.0, self.clear_startup_flag).start()
+        self.timers.call_later(5.0, self.clear_startup_flag)
 
         # Communicate the initial fps without changing resolution. Storage
         # pre-roll should stress the selected mode before dynamic resolution
@@ -665,7 +677,7 @@ class CinePiController:
             self.is_shutter_angle_transient = True
             self.redis_controller.set_value(ParameterKey.SHUTTER_A_TRANSIENT.value, 1)
 
-            threading.Timer(0.5, self.end_shutter_angle_transient).start()
+            self.timers.call_later(0.5, self.end_shutter_angle_transient)
         else:
             self.shutter_angle_actual = min(self.shutter_angle_steps, key=lambda x: abs(x - new_angle))
         
@@ -795,6 +807,11 @@ class CinePiController:
             self.fps_lock = not self.fps_lock
         logging.info(f"FPS lock {self.fps_lock}")
 
+    @property
+    def timers(self):
+        """Shared timer service for hold, transient and timed-stop timeouts."""
+        return get_timer_service()
+
     def _cancel_timed_recording_stop(self):
         if self._timed_rec_timer:
             self._timed_rec_timer.cancel()
@@ -809,13 +826,14 @@ class CinePiController:
         self._timed_rec_description = None
         logging.info(f"Timed recording limit reached ({description}); stopping.")
         if self.redis_controller.get_value(ParameterKey.IS_RECORDING.value) == "1":
-            self.stop_recording()
+            # stop_recording joins the recording thread; keep it off the
+            # shared timer thread.
+            Thread(target=self.stop_recording, name="TimedRecordingStop", daemon=True).start()
 
     def _schedule_timed_recording_stop(self, seconds: float, description: str) -> None:
         self._cancel_timed_recording_stop()
         self._timed_rec_description = description
-        self._timed_rec_timer = Timer(seconds, self._timed_recording_timeout)
-        self._timed_rec_timer.start()
+        self._timed_rec_timer = self.timers.call_later(seconds, self._timed_recording_timeout)
         logging.info(f"Recording will stop in {seconds:.3f}s ({description}).")
 
     def attach_redis_listener(self, redis_listener) -> None:
@@ -1383,10 +1401,9 @@ class CinePiController:
             except Exception:
                 logging.exception("Failed to clear resolution switching state.")
 
-        timer = threading.Timer(GUI_RESOLUTION_SWITCHING_HOLD_SECONDS, complete)
-        timer.daemon = True
-        self._resolution_switching_timer = timer
-        timer.start()
+        self._resolution_switching_timer = self.timers.call_later(
+            GUI_RESOLUTION_SWITCHING_HOLD_SECONDS, complete, name="resolution_switch_complete"
+        )
 
     def handle_cinepi_raw_message(self, message):
         if not isinstance(message, str):
@@ -1739,7 +1756,12 @@ class CinePiController:
         self.ssd_monitor.toggle_mount_drive()
 
     def erase_drive(self):
-        self.ssd_monitor.erase_drive()
+        # Own thread so `cancel erase` can reach it while it runs.
+        Thread(target=self.ssd_monitor.erase_drive, name="EraseDrive", daemon=True).start()
+
+    def cancel_erase(self):
+        if not self.ssd_monitor.cancel_erase():
+            logging.info("No erase in progress.")
 
     def format_drive(self, filesystem=None):
         self.ssd_monitor.format_drive(filesystem or "exfat")
@@ -2198,7 +2220,7 @@ class CinePiController:
 
         # Persist & notify
         self.redis_controller.set_value(ParameterKey.ZOOM.value, value)
-        self.redis_controller.r.publish("cp_controls", ParameterKey.ZOOM.value)
+        self.redis_controller.republish(ParameterKey.ZOOM.value)
 
         logging.info("Zoom factor set to %.2f×", value)
 
@@ -2240,7 +2262,7 @@ class CinePiController:
             target = aliases[key]
 
         self.redis_controller.set_value(ParameterKey.HDMI_PREVIEW_SOURCE.value, target)
-        self.redis_controller.r.publish("cp_controls", ParameterKey.HDMI_PREVIEW_SOURCE.value)
+        self.redis_controller.republish(ParameterKey.HDMI_PREVIEW_SOURCE.value)
         logging.info("HDMI preview source set to %s", target)
 
         # Policy B (join-only): if a take is already rolling, a preview switch may
@@ -2266,6 +2288,66 @@ class CinePiController:
             return None
         return max(0.0, (used / total) * 100.0)
 
+    def handle_buffer_overflow_warning(self, eta_s):
+        """RedisListener callback: degrade before the buffer overflows."""
+        action = self.buffer_guard_action
+        if action not in ("resolution", "fps"):
+            return
+        Thread(
+            target=self._buffer_guard_step_down,
+            args=(action, eta_s),
+            name="BufferGuardStepDown",
+            daemon=True,
+        ).start()
+
+    def _buffer_guard_step_down(self, action, eta_s):
+        """Lower the data rate before the RAM buffer fills.
+
+        The resolution step goes straight to _apply_resolution_mode rather
+        than set_resolution: it is a temporary fallback, so it must not
+        replace dynamic_resolution_desired_mode or be swapped for another
+        mode by the dynamic-resolution fps rules. cinepi-raw reconfigures
+        the camera for the new mode, which splits the take into two clips.
+        """
+        if action == "resolution":
+            mode = self._buffer_guard_lower_mode()
+            if mode is None:
+                logging.warning("Buffer guard: no smaller same-aspect mode; keeping resolution.")
+                return
+            logging.warning(
+                f"Buffer guard: full in {eta_s:.1f}s – stepping down to sensor mode {mode} "
+                "(the take is split at the switch)."
+            )
+            self._apply_resolution_mode(mode, restore_user_fps=self._current_user_fps_value())
+        else:
+            lower = [fps for fps in self.fps_steps_dynamic if fps < float(self.current_fps)]
+            if not lower:
+                logging.warning("Buffer guard: already at the lowest fps step.")
+                return
+            logging.warning(f"Buffer guard: full in {eta_s:.1f}s – stepping fps down to {max(lower)}.")
+            self.set_fps(max(lower), update_user_target=False)
+
+    def _buffer_guard_lower_mode(self):
+        """Largest sensor mode smaller than the current one with the same aspect."""
+        cur_w = self.redis_controller.get_int(ParameterKey.WIDTH.value)
+        cur_h = self.redis_controller.get_int(ParameterKey.HEIGHT.value)
+        cur_ar = self._aspect_ratio(cur_w, cur_h)
+        if cur_ar is None:
+            return None
+        best = None
+        cur_area = cur_w * cur_h
+        for mode, info in self.sensor_detect.res_modes.items():
+            try:
+                area = int(info.get("width") or 0) * int(info.get("height") or 0)
+            except (TypeError, ValueError):
+                continue
+            ar = self._aspect_ratio(info.get("width"), info.get("height"))
+            if ar is None or abs(ar - cur_ar) > 0.01 or area >= cur_area:
+                continue
+            if best is None or area > best[0]:
+                best = (area, mode)
+        return None if best is None else best[1]
+
     def _recording_worker(self):
         logging.info("CinePiController worker thread started")
         try:
@@ -75,7 +75,7 @@ def _seed_default_zoom(redis_ctl):
     if redis_ctl.get_value(ParameterKey.ZOOM.value) is None:
         redis_ctl.set_value(ParameterKey.ZOOM.value, default_zoom)
         # wake cinepi-raw controller
-        redis_ctl.r.publish("cp_controls", ParameterKey.ZOOM.value)
+        redis_ctl.republish(ParameterKey.ZOOM.value)
         logging.info("[init] preview zoom defaulted to %.1f×", default_zoom)
 
 
@@ -251,6 +251,9 @@ class CinePiProcess(Thread):
             prefix += ["taskset", "-c", "1-3"]
 
         cmd = (prefix + cine_cmd) if prefix else cine_cmd
+        # cinepi-raw reads its controls straight from Redis at startup; make
+        # sure every queued write has landed before it launches.
+        self.redis_controller.flush()
         logging.info('[%s] Launch: %s', self.cam, cmd)
         self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         Thread(target=self._pump, args=(self.proc.stdout, self.out_q)).start()
@@ -739,7 +742,7 @@ class CinePiManager:
 
         while time.monotonic() < deadline:
             # raw Redis handle (adjust if your wrapper exposes it differently)
-            have = {k.decode() for k in self.redis_controller.r.keys("cinepi_ready_*")}
+            have = {k.decode() for k in self.redis_controller.r.scan_iter(match="cinepi_ready_*")}
             if want.issubset(have):
                 logging.info("All cinepi-raw encoders ready — starting supervisor.")
                 break
@@ -757,7 +760,7 @@ class CinePiManager:
 
         while time.monotonic() < deadline:
             have = {k.decode() for k in
-                    self.redis_controller.r.keys("cinepi_ready_*")}
+                    self.redis_controller.r.scan_iter(match="cinepi_ready_*")}
             if want.issubset(have):
                 logging.info("All cinepi-raw encoders ready — starting supervisor.")
                 break
@@ -778,7 +781,7 @@ class CinePiManager:
             logging.info("Applying startup preview zoom %.1f×", z)
             # write the value again (no change) **and** publish the key so the
             # C++ controller’s handler runs and pushes the ScalerCrop.
-            self.redis_controller.r.publish("cp_controls", ParameterKey.ZOOM.value)
+            self.redis_controller.republish(ParameterKey.ZOOM.value)
 
         # record-path housekeeping that was already there
         self.redis_controller.set_value(ParameterKey.LAST_DNG_CAM0.value, "None")
@@ -795,7 +798,7 @@ class CinePiManager:
         self.processes.clear()
         
         # ── tidy up “ready” flags ──────────────────────────────────
-        raw_keys = self.redis_controller.r.keys("cinepi_ready_*")   # list[bytes]
+        raw_keys = list(self.redis_controller.r.scan_iter(match="cinepi_ready_*"))
         if raw_keys:                                               # only if any
             self.redis_controller.r.delete(*raw_keys)
 
@@ -7,6 +7,11 @@ import logging
 import select
 import sys
 
+from module.scheduler import get_timer_service
+from module.storage_bench import bench_modes, merge_rows
+from module.dynamic_resolution import DEFAULT_PROFILES_FILE, load_profile_rows, resolve_profiles_path
+from module.cinepi_controller import SETTINGS_FILE
+
 class CommandExecutor(threading.Thread):
     def __init__(self, cinepi_controller, cinepi_app, storage_preroll=None):
         threading.Thread.__init__(self, daemon=True)  # Initialize thread
@@ -14,6 +19,7 @@ class CommandExecutor(threading.Thread):
         self.cinepi_app = cinepi_app
         self.storage_preroll = storage_preroll
         self.running = True  # Flag to control the thread's execution
+        self._storage_bench = None  # 'bench storage' worker thread
 
         # ---------------------------------------------------------------------------
         # CLI COMMAND TABLE
@@ -67,12 +73,16 @@ class CommandExecutor(threading.Thread):
             'unmount'                : (cinepi_controller.unmount,        None),
             'toggle mount'           : (cinepi_controller.toggle_mount,   None),
             'erase'                  : (cinepi_controller.erase_drive,    None),
+            'cancel erase'           : (cinepi_controller.cancel_erase,   None),
             'format'                 : (cinepi_controller.format_drive,   [str, None]),
             'storage preroll'        : (storage_preroll.trigger_manual,   None) if storage_preroll else None,
 
             # ── Info / diagnostics ────────────────────────────────────────────────
             'time'                   : (self.display_time,                None),
             'set rtc time'           : (self.set_rtc_time,                None),
+            'timers'                 : (self.display_timers,              None),
+            'fps history'            : (self.display_fps_history,         [int, None]),  # seconds, default 60
+            'bench storage'          : (self.run_storage_bench,           [int, None]),  # sensor mode, default all
             'space'                  : (cinepi_controller.ssd_monitor.space_left, None),
             'get'                    : (cinepi_controller.print_settings, None),
 
@@ -125,6 +135,81 @@ class CommandExecutor(threading.Thread):
         except:
             logging.info("Unable to read RTC time.")  # If unable to read RTC time, log error
 
+    def display_timers(self):
+        """Lists the callbacks pending on the shared timer service."""
+        pending = get_timer_service().pending()
+        if not pending:
+            logging.info("No pending timers.")
+        for entry in pending:
+            logging.info(f"{entry['name']:<32} in {entry['due_in_s']:.3f}s")
+
+    def display_fps_history(self, seconds=60):
+        """Logs per-second min/mean/max measured fps for the last *seconds*."""
+        listener = getattr(self.cinepi_controller, "redis_listener", None)
+        if listener is None:
+            logging.info("fps history unavailable (no Redis listener attached).")
+            return
+        history = listener.fps_history(seconds)
+        if not any(history.values()):
+            logging.info("No fps samples in the last %d s.", seconds)
+        for port, rows in history.items():
+            for second, low, mean, high in rows:
+                stamp = datetime.datetime.fromtimestamp(second).strftime("%H:%M:%S")
+                logging.info(f"{port} {stamp}  min {low:8.3f}  mean {mean:8.3f}  max {high:8.3f}")
+
+    def run_storage_bench(self, mode=None):
+        """Measure sustainable fps per sensor mode on the RAW drive and
+        write the rows into the dynamic-resolution profile file."""
+        controller = self.cinepi_controller
+        ssd = controller.ssd_monitor
+        if not ssd.is_mounted:
+            logging.info("bench storage: RAW drive is not mounted.")
+            return
+        if controller._is_recording():
+            logging.info("bench storage: not while recording.")
+            return
+        if self._storage_bench is not None and self._storage_bench.is_alive():
+            logging.info("bench storage: already running.")
+            return
+        detect = controller.sensor_detect
+        sensor = detect.camera_model
+        modes = [
+            {**info, "mode": m, "max_fps": info.get("fps_max")}
+            for m, info in sorted(detect.res_modes.items())
+            if mode is None or m == mode
+        ]
+        if not modes:
+            logging.info(f"bench storage: no sensor mode {mode} for {sensor}.")
+            return
+        aliases = detect.sensor_database.get("sensors", {}).get(sensor, {}).get("aliases", [])
+        cfg = controller.dynamic_resolution_cfg
+        path = resolve_profiles_path(cfg.get("profiles_file") or DEFAULT_PROFILES_FILE,
+                                     settings_file=SETTINGS_FILE)
+
+        def _run():
+            rows = bench_modes(
+                ssd.mount_path,
+                sensor=sensor,
+                modes=modes,
+                sensor_aliases=aliases,
+                storage_type=(ssd.device_type or "ssd").lower(),
+                filesystem=ssd.filesystem_type,
+            )
+            if not rows:
+                logging.info("bench storage: nothing measured.")
+                return
+            merge_rows(path, rows, cfg.get("profile") or "default")
+            controller.dynamic_resolution_table = load_profile_rows(cfg, settings_file=SETTINGS_FILE)
+            for row in rows:
+                logging.info(
+                    f"bench storage: {row['width']}x{row['height']} → {row['max_fps_no_buffer']} fps ({row['notes']})"
+                )
+            logging.info(f"bench storage: {len(rows)} measured rows written to {path}")
+
+        logging.info(f"bench storage: benchmarking {len(modes)} mode(s) of {sensor} on {ssd.mount_path} …")
+        self._storage_bench = threading.Thread(target=_run, name="StorageBench", daemon=True)
+        self._storage_bench.start()
+
     def set_rtc_time(self):
         """Sets the RTC time using the system time."""
         try:
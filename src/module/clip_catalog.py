@@ -0,0 +1,264 @@
+"""Persistent per-drive catalog of clip folders.
+
+``ClipCatalog`` remembers, for every clip folder on the RAW drive, the DNG
+and WAV counts, the highest frame index and the byte total, together with
+the mtime of each directory in the clip. A directory's mtime changes
+whenever a file is created, renamed or deleted in it, so as long as every
+recorded mtime still matches, the cached counts are current and a query
+costs one ``stat`` per directory instead of a walk over every DNG.
+
+Catalogs are stored per filesystem (``statvfs().f_fsid``) under
+``CATALOG_DIR`` on the system disk, so they survive reboots and swapping
+between drives without writing anything to the recording drive. Folders
+that were still changing when scanned (newest mtime within ``settle_s``)
+are kept but rescanned on the next query, since a file being written does
+not touch its directory's mtime.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+CATALOG_DIR = "/home/pi/.cache/cinemate/clip_catalog"
+CATALOG_VERSION = 1
+SETTLE_S = 2.0
+SAVE_INTERVAL_S = 30.0
+
+_IDX_RE = re.compile(r"_(\d+)$")
+
+
+def mount_key(path: str | os.PathLike) -> str | None:
+    """Filesystem id of the drive mounted at *path*, as hex."""
+    try:
+        return f"{os.statvfs(path).f_fsid & 0xFFFFFFFFFFFFFFFF:016x}"
+    except (OSError, AttributeError):
+        return None
+
+
+class ClipEntry:
+    """Totals for one clip folder (sub-folders included)."""
+
+    __slots__ = ("dng", "wav", "max_idx", "bytes", "dirs", "settled")
+
+    def __init__(self, dng=0, wav=0, max_idx=-1, total_bytes=0, dirs=None, settled=False):
+        self.dng = dng
+        self.wav = wav
+        self.max_idx = max_idx
+        self.bytes = total_bytes
+        self.dirs: dict[str, int] = dirs if dirs is not None else {}   # rel dir → st_mtime_ns
+        self.settled = settled
+
+    def to_dict(self) -> dict:
+        return {
+            "dng": self.dng,
+            "wav": self.wav,
+            "max_idx": self.max_idx,
+            "bytes": self.bytes,
+            "dirs": self.dirs,
+            "settled": self.settled,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClipEntry":
+        return cls(
+            int(data["dng"]),
+            int(data["wav"]),
+            int(data["max_idx"]),
+            int(data["bytes"]),
+            {str(k): int(v) for k, v in data["dirs"].items()},
+            bool(data.get("settled")),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ClipEntry(dng={self.dng}, wav={self.wav}, max_idx={self.max_idx}, "
+            f"bytes={self.bytes}, dirs={len(self.dirs)})"
+        )
+
+
+def scan_clip(path: str, *, settle_s: float = SETTLE_S) -> ClipEntry:
+    """Walk one clip folder. OSError propagates to the caller."""
+    entry = ClipEntry()
+    newest = 0
+    stack = [("", path)]
+    while stack:
+        rel, folder = stack.pop()
+        mtime_ns = os.stat(folder).st_mtime_ns
+        entry.dirs[rel] = mtime_ns
+        newest = max(newest, mtime_ns)
+        with os.scandir(folder) as it:
+            for item in it:
+                if item.is_dir(follow_symlinks=False):
+                    stack.append((os.path.join(rel, item.name), item.path))
+                    continue
+                stem, dot, suffix = item.name.rpartition(".")
+                if not dot:
+                    continue
+                suffix = suffix.lower()
+                if suffix == "dng":
+                    entry.dng += 1
+                    try:
+                        entry.bytes += item.stat(follow_symlinks=False).st_size
+                    except FileNotFoundError:
+                        entry.dng -= 1
+                        continue
+                    match = _IDX_RE.search(stem)
+                    if match:
+                        entry.max_idx = max(entry.max_idx, int(match.group(1)))
+                elif suffix == "wav":
+                    entry.wav += 1
+    entry.settled = time.time_ns() - newest > settle_s * 1e9
+    return entry
+
+
+class ClipCatalog:
+    def __init__(self, state_dir: str | os.PathLike = CATALOG_DIR, *, settle_s: float = SETTLE_S):
+        self.state_dir = os.fspath(state_dir)
+        self.settle_s = settle_s
+        self._lock = threading.Lock()
+        self._root: str | None = None
+        self._key: str | None = None
+        self._clips: dict[str, ClipEntry] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self.hits = 0
+        self.scans = 0
+
+    @property
+    def path(self) -> str | None:
+        if self._key is None:
+            return None
+        return os.path.join(self.state_dir, f"{self._key}.json")
+
+    # ── lifecycle ──────────────────────────────────────────────────────
+    def open(self, root: str | os.PathLike) -> bool:
+        """Load the catalog of the filesystem mounted at *root*."""
+        root = os.path.abspath(os.fspath(root))
+        key = mount_key(root)
+        with self._lock:
+            if self._root == root and self._key == key and key is not None:
+                return True
+        self.close()
+        if key is None:
+            return False
+        clips = {}
+        path = os.path.join(self.state_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") == CATALOG_VERSION:
+                clips = {name: ClipEntry.from_dict(e) for name, e in data["clips"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logging.warning("Ignoring unreadable clip catalog %s: %s", path, exc)
+        with self._lock:
+            self._root, self._key, self._clips = root, key, clips
+            self._dirty = False
+        logging.info("Clip catalog %s: %d clips known", key, len(clips))
+        return True
+
+    def close(self) -> None:
+        self.save(force=True)
+        with self._lock:
+            self._root = self._key = None
+            self._clips = {}
+            self._dirty = False
+
+    def save(self, *, force: bool = False) -> bool:
+        """Write the catalog if it changed (at most every SAVE_INTERVAL_S)."""
+        now = time.monotonic()
+        with self._lock:
+            path = self.path
+            if path is None or not self._dirty:
+                return False
+            if not force and now - self._last_save < SAVE_INTERVAL_S:
+                return False
+            data = {
+                "version": CATALOG_VERSION,
+                "root": self._root,
+                "clips": {name: e.to_dict() for name, e in self._clips.items()},
+            }
+            self._dirty = False
+            self._last_save = now
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logging.warning("Could not save clip catalog %s: %s", path, exc)
+            with self._lock:
+                self._dirty = True
+            return False
+        return True
+
+    # ── queries ────────────────────────────────────────────────────────
+    def get(self, folder: str | os.PathLike, mtime_ns: int | None = None) -> ClipEntry | None:
+        """Totals for the clip *folder*; rescans only when it changed.
+
+        *mtime_ns* is the folder's own mtime if the caller already has it.
+        Returns None for folders outside the open root.
+        """
+        path = os.path.abspath(os.fspath(folder))
+        with self._lock:
+            root = self._root
+            if root is None or os.path.dirname(path) != root:
+                return None
+            name = os.path.basename(path)
+            cached = self._clips.get(name)
+        if cached is not None and cached.settled and self._unchanged(path, cached, mtime_ns):
+            self.hits += 1
+            return cached
+        entry = scan_clip(path, settle_s=self.settle_s)
+        self.scans += 1
+        with self._lock:
+            if self._root == root:
+                self._clips[name] = entry
+                self._dirty = True
+        return entry
+
+    @staticmethod
+    def _unchanged(path: str, entry: ClipEntry, mtime_ns: int | None) -> bool:
+        for rel, recorded in entry.dirs.items():
+            if rel == "" and mtime_ns is not None:
+                current = mtime_ns
+            else:
+                try:
+                    current = os.stat(os.path.join(path, rel)).st_mtime_ns
+                except OSError:
+                    return False
+            if current != recorded:
+                return False
+        return True
+
+    def retain(self, names) -> None:
+        """Forget clips that are no longer on the drive."""
+        keep = set(names)
+        with self._lock:
+            stale = [name for name in self._clips if name not in keep]
+            for name in stale:
+                del self._clips[name]
+            if stale:
+                self._dirty = True
+
+    def clear(self) -> None:
+        """Forget every clip (after an erase or format)."""
+        with self._lock:
+            if self._clips:
+                self._clips = {}
+                self._dirty = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clips)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._clips
@@ -179,6 +179,10 @@ def _apply_settings_defaults(settings: dict) -> dict:
         "live_sync_startup_guard_frames": 10,
         "final_sync_analysis_tolerance_frames": 1,
         "tc_drop_jitter_tolerance_frames": 1,
+        "redis_write_coalescing": True,
+        "recording_timer_mode": "ticker",
+        "buffer_guard_seconds": 5,
+        "buffer_guard_action": "none",
     }
     for k, v in settings_defaults.items():
         settings_cfg.setdefault(k, v)
@@ -0,0 +1,391 @@
+"""Live index of the DNG frames written during a take.
+
+``DngIndex`` watches the recording drive with Linux inotify (through
+ctypes, no extra dependency) and records every frame file as it is closed
+after writing (``IN_CLOSE_WRITE`` / ``IN_MOVED_TO``). At the end of a take
+the per-clip frame count, highest frame index and byte total are already
+known, so the frame-sync analysis does not have to rescan directories with
+tens of thousands of files.
+
+A clip is only reported while its index is trustworthy: folders the watcher
+never saw, or any folder after an inotify queue overflow, return ``None``
+and callers fall back to a directory scan.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import re
+import select
+import struct
+import threading
+import time
+
+from module.frame_presence import FramePresenceBitmap
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_CLIP_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_CREATE | IN_DELETE_SELF
+_ROOT_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+_IDX_RE = re.compile(r"_(\d+)\.dng$", re.IGNORECASE)
+
+
+def _load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        init1, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    init1.argtypes = [ctypes.c_int]
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return init1, add_watch
+
+
+_INOTIFY = _load_inotify()
+
+
+class ClipSnapshot:
+    """Counts for one clip folder at the time of the query."""
+
+    __slots__ = ("path", "count", "last_idx", "last_name", "bytes", "wav_count", "quiet_s")
+
+    def __init__(self, path, count, last_idx, last_name, total_bytes, wav_count, quiet_s):
+        self.path = path
+        self.count = count
+        self.last_idx = last_idx
+        self.last_name = last_name
+        self.bytes = total_bytes
+        self.wav_count = wav_count
+        self.quiet_s = quiet_s
+
+    def __repr__(self) -> str:
+        return (
+            f"ClipSnapshot({self.path!r}, count={self.count}, last_idx={self.last_idx}, "
+            f"bytes={self.bytes}, wav={self.wav_count})"
+        )
+
+
+class ClipIndex:
+    """Frames written into one folder: name → size plus a presence bitmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sizes: dict[str, int] = {}
+        self.frames = FramePresenceBitmap()
+        self.wav: set[str] = set()
+        self.bytes = 0
+        self.last_idx: int | None = None
+        self.last_name: str | None = None
+        self.last_event = time.monotonic()
+
+    def add(self, name: str, size: int) -> None:
+        self.last_event = time.monotonic()
+        lower = name.lower()
+        if lower.endswith(".wav"):
+            self.wav.add(name)
+            return
+        if not lower.endswith(".dng") or size <= 0:
+            return
+        self.bytes += size - self.sizes.get(name, 0)
+        self.sizes[name] = size
+        match = _IDX_RE.search(name)
+        if match:
+            idx = int(match.group(1))
+            self.frames.add(idx)
+            if self.last_idx is None or idx > self.last_idx:
+                self.last_idx = idx
+                self.last_name = name
+
+    def remove(self, name: str) -> None:
+        self.last_event = time.monotonic()
+        self.wav.discard(name)
+        size = self.sizes.pop(name, None)
+        if size is None:
+            return
+        self.bytes -= size
+        match = _IDX_RE.search(name)
+        if match:
+            self.frames.discard(int(match.group(1)))
+            if name == self.last_name:
+                self.last_idx = self.frames.last
+                self.last_name = None
+                if self.last_idx is not None:
+                    for other in self.sizes:
+                        m = _IDX_RE.search(other)
+                        if m and int(m.group(1)) == self.last_idx:
+                            self.last_name = other
+                            break
+
+    def snapshot(self) -> ClipSnapshot:
+        return ClipSnapshot(
+            self.path,
+            len(self.sizes),
+            self.last_idx,
+            self.last_name,
+            self.bytes,
+            len(self.wav),
+            time.monotonic() - self.last_event,
+        )
+
+
+class DngIndex:
+    """inotify watcher keeping a ClipIndex per recording folder."""
+
+    def __init__(self, *, poll_s: float = 0.5):
+        self.poll_s = poll_s
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._wake: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wd_paths: dict[int, str] = {}
+        self._path_wds: dict[str, int] = {}
+        self._roots: set[str] = set()
+        self._clips: dict[str, ClipIndex] = {}
+        self.overflowed = False
+
+    @property
+    def available(self) -> bool:
+        return _INOTIFY is not None
+
+    @property
+    def running(self) -> bool:
+        return self._fd is not None
+
+    # ── lifecycle ──────────────────────────────────────────────────────
+    def start(self, root: str | os.PathLike | None = None) -> bool:
+        """Begin a fresh take: forget earlier clips and watch *root* for new
+        clip folders. Returns False when inotify is not usable."""
+        self.stop()
+        if _INOTIFY is None:
+            return False
+        fd = _INOTIFY[0](IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logging.warning("inotify unavailable (%s); DNG index disabled.", os.strerror(ctypes.get_errno()))
+            return False
+        with self._lock:
+            self._fd = fd
+            self._wake = os.pipe()
+            self.overflowed = False
+        self._stop.clear()
+        if root is not None and os.path.isdir(root):
+            self._add_watch(os.path.abspath(root), _ROOT_MASK, root=True)
+        self._thread = threading.Thread(target=self._run, name="DngIndex", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        thread = self._thread
+        self._stop.set()
+        if self._wake is not None:
+            os.write(self._wake[1], b"\0")
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2 * self.poll_s + 1)
+        self._thread = None
+        with self._lock:
+            fd, self._fd = self._fd, None
+            wake, self._wake = self._wake, None
+            self._wd_paths.clear()
+            self._path_wds.clear()
+            self._roots.clear()
+            self._clips.clear()
+        for handle in (fd, *(wake or ())):
+            if handle is None:
+                continue
+            try:
+                os.close(handle)
+            except OSError:
+                pass
+
+    # ── watches ────────────────────────────────────────────────────────
+    def watch(self, folder: str | os.PathLike) -> bool:
+        """Index *folder* (a clip directory) if it is not indexed yet."""
+        path = os.path.abspath(os.fspath(folder))
+        with self._lock:
+            if self._fd is None:
+                return False
+            if path in self._path_wds and path not in self._roots:
+                return True
+        if not os.path.isdir(path):
+            return False
+        return self._add_watch(path, _CLIP_MASK)
+
+    def _add_watch(self, path: str, mask: int, *, root: bool = False) -> bool:
+        with self._lock:
+            fd = self._fd
+            if fd is None:
+                return False
+            if root:
+                self._roots.add(path)
+            else:
+                self._clips.setdefault(path, ClipIndex(path))
+            wd = _INOTIFY[1](fd, os.fsencode(path), mask)
+            if wd < 0:
+                err = ctypes.get_errno()
+                self._clips.pop(path, None)
+                self._roots.discard(path)
+                logging.warning("inotify watch on %s failed: %s", path, os.strerror(err))
+                return False
+            self._wd_paths[wd] = path
+            self._path_wds[path] = wd
+        if not root:
+            # Files closed before the watch existed are picked up by one scan
+            # of the (still small) folder; the dict makes duplicates harmless.
+            self._seed(path)
+        return True
+
+    def _seed(self, path: str) -> None:
+        try:
+            with os.scandir(path) as it:
+                entries = []
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        self._add_watch(entry.path, _CLIP_MASK)
+                        continue
+                    try:
+                        entries.append((entry.name, entry.stat().st_size))
+                    except FileNotFoundError:
+                        continue
+        except OSError:
+            return
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is not None:
+                for name, size in entries:
+                    clip.add(name, size)
+
+    # ── event loop ─────────────────────────────────────────────────────
+    def _run(self) -> None:
+        fd, wake = self._fd, self._wake
+        if fd is None or wake is None:
+            return
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([fd, wake[0]], [], [], self.poll_s)
+                if fd not in ready:
+                    continue
+                data = os.read(fd, _READ_SIZE)
+            except (OSError, ValueError) as exc:
+                if getattr(exc, "errno", None) in (errno.EAGAIN, errno.EINTR):
+                    continue
+                if not self._stop.is_set():
+                    logging.warning("DNG index stopped reading inotify events: %s", exc)
+                return
+            self._handle(data)
+
+    def _handle(self, data: bytes) -> None:
+        offset = 0
+        new_dirs = []
+        closed = []
+        with self._lock:
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                start = offset + _EVENT.size
+                name = data[start:start + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset = start + length
+
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    logging.warning("inotify queue overflowed; post-take DNG counts will rescan.")
+                    continue
+                parent = self._wd_paths.get(wd)
+                if parent is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._wd_paths.pop(wd, None)
+                    self._path_wds.pop(parent, None)
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        new_dirs.append(os.path.join(parent, name))
+                    continue
+                clip = self._clips.get(parent)
+                if clip is None:
+                    continue
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    closed.append((clip, name))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    clip.remove(name)
+
+        for clip, name in closed:
+            try:
+                size = os.stat(os.path.join(clip.path, name)).st_size
+            except OSError:
+                continue
+            with self._lock:
+                clip.add(name, size)
+        for path in new_dirs:
+            self._add_watch(path, _CLIP_MASK)
+
+    # ── queries ────────────────────────────────────────────────────────
+    def snapshot(
+        self,
+        folder: str | os.PathLike,
+        settle_s: float = 0.0,
+        *,
+        recursive: bool = False,
+    ) -> ClipSnapshot | None:
+        """Counts for *folder*, or None when the index cannot vouch for it.
+
+        With *settle_s*, waits (once) until no event has arrived for that
+        long, mirroring the settle window of the directory scan. With
+        *recursive*, sub-folders of the clip are added in.
+        """
+        path = os.path.abspath(os.fspath(folder))
+        snap = self._snapshot(path, recursive)
+        if snap is not None and settle_s > 0 and snap.quiet_s < settle_s:
+            time.sleep(settle_s - snap.quiet_s)
+            snap = self._snapshot(path, recursive)
+        return snap
+
+    def _snapshot(self, path: str, recursive: bool) -> ClipSnapshot | None:
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is None or self.overflowed or self._fd is None:
+                return None
+            snap = clip.snapshot()
+            if not recursive:
+                return snap
+            prefix = path + os.sep
+            for other_path, other in self._clips.items():
+                if not other_path.startswith(prefix):
+                    continue
+                sub = other.snapshot()
+                snap.count += sub.count
+                snap.bytes += sub.bytes
+                snap.wav_count += sub.wav_count
+                snap.quiet_s = min(snap.quiet_s, sub.quiet_s)
+                if sub.last_idx is not None and (snap.last_idx is None or sub.last_idx > snap.last_idx):
+                    snap.last_idx, snap.last_name = sub.last_idx, sub.last_name
+            return snap
+
+    def frames(self, folder: str | os.PathLike) -> FramePresenceBitmap | None:
+        """Presence bitmap of the frames written into *folder* (a copy)."""
+        path = os.path.abspath(os.fspath(folder))
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is None or self.overflowed:
+                return None
+            return FramePresenceBitmap.from_bytes(clip.frames.to_bytes())
+
+    def clips(self) -> list[str]:
+        with self._lock:
+            return sorted(self._clips)
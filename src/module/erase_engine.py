@@ -0,0 +1,237 @@
+"""In-process erase of the RAW drive.
+
+``EraseEngine`` deletes everything below a mount point with a small,
+bounded worker pool. Each worker takes one top-level item at a time and
+removes it bottom-up with ``os.scandir`` / ``unlink`` / ``rmdir``, so a card
+with hundreds of clips costs a handful of threads instead of hundreds of
+``rm`` processes contending for the same device.
+
+Paths the process may not delete are collected and handed to a single
+``sudo rm -rf`` at the end. Progress (files, files/s, bytes reclaimed) is
+reported through a callback at a fixed interval, and :meth:`cancel` stops
+the workers between files.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+
+ERASE_WORKERS = 4
+PROGRESS_INTERVAL_S = 0.5
+BUSY_RETRY_S = 0.5    # one retry when a file or directory is still busy
+
+
+@dataclass
+class EraseResult:
+    files: int = 0
+    dirs: int = 0
+    bytes: int = 0
+    elapsed_s: float = 0.0
+    cancelled: bool = False
+    helper_paths: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.cancelled and not self.errors
+
+    def progress(self, state: str) -> dict:
+        rate = self.files / self.elapsed_s if self.elapsed_s > 0 else 0.0
+        return {
+            "state": state,
+            "files": self.files,
+            "dirs": self.dirs,
+            "bytes": self.bytes,
+            "files_per_s": round(rate, 1),
+            "elapsed_s": round(self.elapsed_s, 1),
+        }
+
+
+class EraseEngine:
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        *,
+        workers: int = ERASE_WORKERS,
+        progress=None,
+        progress_interval_s: float = PROGRESS_INTERVAL_S,
+        helper_cmd: tuple[str, ...] = ("sudo", "rm", "-rf", "--"),
+    ):
+        self.root = os.fspath(root)
+        self.workers = max(1, int(workers))
+        self.progress_cb = progress
+        self.progress_interval_s = progress_interval_s
+        self.helper_cmd = tuple(helper_cmd)
+        self.result = EraseResult()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Stop after the files currently being unlinked."""
+        self._cancel.set()
+
+    # ── run ────────────────────────────────────────────────────────────
+    def run(self) -> EraseResult:
+        """Erase the contents of the root (the root itself is kept)."""
+        result = self.result
+        start = time.monotonic()
+        with os.scandir(self.root) as it:
+            items = [entry.path for entry in it]
+        work: queue.SimpleQueue = queue.SimpleQueue()
+        for path in items:
+            work.put(path)
+        threads = [
+            threading.Thread(target=self._worker, args=(work,), name=f"Erase{i}", daemon=True)
+            for i in range(min(self.workers, len(items)))
+        ]
+        for t in threads:
+            t.start()
+        next_report = start
+        while any(t.is_alive() for t in threads):
+            time.sleep(0.05)
+            now = time.monotonic()
+            if now >= next_report:
+                result.elapsed_s = now - start
+                self._report("erasing")
+                next_report = now + self.progress_interval_s
+        for t in threads:
+            t.join()
+
+        if result.helper_paths and not self.cancelled:
+            self._run_helper(result.helper_paths)
+        result.cancelled = self.cancelled
+        result.elapsed_s = time.monotonic() - start
+        self._report("cancelled" if result.cancelled else ("done" if result.ok else "failed"))
+        return result
+
+    def _report(self, state: str) -> None:
+        if self.progress_cb is None:
+            return
+        with self._lock:
+            snapshot = self.result.progress(state)
+        try:
+            self.progress_cb(snapshot)
+        except Exception as exc:
+            logging.debug("Erase progress callback failed: %s", exc)
+
+    # ── workers ────────────────────────────────────────────────────────
+    def _worker(self, work: queue.SimpleQueue) -> None:
+        while not self.cancelled:
+            try:
+                path = work.get_nowait()
+            except queue.Empty:
+                return
+            self._remove_tree(path)
+
+    def _remove_tree(self, top: str) -> None:
+        """Delete *top* bottom-up; defer what needs privileges to the helper."""
+        try:
+            st = os.lstat(top)
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            self._error(top, exc)
+            return
+        if not os.path.isdir(top) or os.path.islink(top):
+            self._unlink(top, st.st_size)
+            return
+        # Depth-first: a directory is removed once its children are gone.
+        stack = [(top, False)]
+        while stack and not self.cancelled:
+            path, expanded = stack.pop()
+            if expanded:
+                try:
+                    self._retry_busy(os.rmdir, path)
+                    with self._lock:
+                        self.result.dirs += 1
+                except FileNotFoundError:
+                    pass
+                except PermissionError:
+                    self._defer(path)
+                except OSError as exc:
+                    # Not empty: something below was deferred or already
+                    # reported; the helper / error list covers it.
+                    if exc.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                        self._error(path, exc)
+                continue
+            subdirs = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if self.cancelled:
+                            return
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        try:
+                            size = entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            size = 0
+                        self._unlink(entry.path, size)
+            except PermissionError:
+                self._defer(path)
+                continue
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                self._error(path, exc)
+                continue
+            stack.append((path, True))
+            stack.extend((sub, False) for sub in subdirs)
+
+    def _unlink(self, path: str, size: int) -> None:
+        try:
+            self._retry_busy(os.unlink, path)
+        except FileNotFoundError:
+            return
+        except PermissionError:
+            self._defer(path)
+            return
+        except OSError as exc:
+            self._error(path, exc)
+            return
+        with self._lock:
+            self.result.files += 1
+            self.result.bytes += size
+
+    def _retry_busy(self, op, path: str) -> None:
+        """Run *op(path)*; on EBUSY wait BUSY_RETRY_S and try once more."""
+        try:
+            op(path)
+        except OSError as exc:
+            if exc.errno != errno.EBUSY or self.cancelled:
+                raise
+            time.sleep(BUSY_RETRY_S)
+            op(path)
+
+    def _defer(self, path: str) -> None:
+        with self._lock:
+            self.result.helper_paths.append(path)
+
+    def _error(self, path: str, exc: OSError) -> None:
+        with self._lock:
+            self.result.errors.append(f"{path}: {exc.strerror or exc}")
+
+    # ── privileged fallback ────────────────────────────────────────────
+    def _run_helper(self, paths: list[str]) -> None:
+        # Remove whatever is left of each affected top-level item in one call.
+        root = self.root.rstrip(os.sep) + os.sep
+        targets = sorted({
+            root + os.path.relpath(p, self.root).split(os.sep, 1)[0] for p in paths
+        })
+        logging.info("erase: %d item(s) need elevated permissions; using one helper", len(targets))
+        proc = subprocess.run([*self.helper_cmd, *targets], capture_output=True, text=True)
+        if proc.returncode != 0:
+            with self._lock:
+                self.result.errors.append(proc.stderr.strip() or "privileged erase failed")
@@ -0,0 +1,175 @@
+"""Per-clip frame-presence bitmap.
+
+One bit per frame number (``bytearray``, n/8 bytes), filled as DNGs are
+seen. Gives the exact missing-frame ranges of a take instead of inferring
+them from "highest index + 1 − file count".
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+
+_NOT_FULL = re.compile(rb"[^\xff]")
+_BIT_COUNT = bytes(bin(i).count("1") for i in range(256))
+
+SIDECAR_NAME = "frame_presence.json"
+
+
+class FramePresenceBitmap:
+    """Set of non-negative frame numbers stored as a bitmap."""
+
+    __slots__ = ("_bits", "count", "first", "last")
+
+    def __init__(self, frames=()):
+        self._bits = bytearray()
+        self.count = 0
+        self.first: int | None = None
+        self.last: int | None = None
+        for idx in frames:
+            self.add(idx)
+
+    def add(self, idx: int) -> bool:
+        """Mark *idx* present; returns False if it already was."""
+        if idx < 0:
+            raise ValueError(f"frame index must be >= 0, got {idx!r}")
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        bits = self._bits
+        if byte >= len(bits):
+            # grow geometrically so a long take costs O(log n) resizes
+            bits.extend(bytes(max(byte + 1 - len(bits), len(bits) // 2, 64)))
+        if bits[byte] & bit:
+            return False
+        bits[byte] |= bit
+        self.count += 1
+        if self.first is None or idx < self.first:
+            self.first = idx
+        if self.last is None or idx > self.last:
+            self.last = idx
+        return True
+
+    def discard(self, idx: int) -> None:
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        if idx < 0 or byte >= len(self._bits) or not self._bits[byte] & bit:
+            return
+        self._bits[byte] &= ~bit & 0xFF
+        self.count -= 1
+        if self.count == 0:
+            self.first = self.last = None
+        elif idx == self.first or idx == self.last:
+            present = self.runs()
+            self.first, self.last = present[0][0], present[-1][1]
+
+    def __contains__(self, idx: int) -> bool:
+        byte = idx >> 3
+        return 0 <= idx and byte < len(self._bits) and bool(self._bits[byte] & (1 << (idx & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self._bits = bytearray()
+        self.count = 0
+        self.first = self.last = None
+
+    # ------------------------------------------------------------------
+    def runs(self) -> list[tuple[int, int]]:
+        """Inclusive ranges of present frames, in order."""
+        if not self.count:
+            return []
+        ranges: list[tuple[int, int]] = []
+        start = None
+        bits = self._bits
+        end = self.last + 1
+        pos = self.first
+        while pos < end:
+            byte = pos >> 3
+            value = bits[byte]
+            if pos & 7 == 0 and value in (0, 0xFF) and pos + 8 <= end:
+                # whole byte in one state; skip ahead to the next byte that
+                # differs (full bytes found at C speed)
+                if value == 0xFF:
+                    if start is None:
+                        start = pos
+                    match = _NOT_FULL.search(bits, byte + 1, (end >> 3))
+                    next_byte = match.start() if match else end >> 3
+                else:
+                    if start is not None:
+                        ranges.append((start, pos - 1))
+                        start = None
+                    next_byte = byte + 1
+                pos = max(next_byte << 3, pos + 8)
+                continue
+            if value & (1 << (pos & 7)):
+                if start is None:
+                    start = pos
+            elif start is not None:
+                ranges.append((start, pos - 1))
+                start = None
+            pos += 1
+        if start is not None:
+            ranges.append((start, end - 1))
+        return ranges
+
+    def holes(self, start: int = 0) -> list[tuple[int, int]]:
+        """Inclusive ranges of missing frames from *start* to the last frame."""
+        gaps: list[tuple[int, int]] = []
+        expected = start
+        for first, last in self.runs():
+            if last < start:
+                continue
+            if first > expected:
+                gaps.append((expected, first - 1))
+            expected = max(expected, last + 1)
+        return gaps
+
+    def missing(self, start: int = 0) -> int:
+        return sum(b - a + 1 for a, b in self.holes(start))
+
+    def summary(self, *, max_ranges: int | None = None, start: int = 0) -> dict:
+        holes = self.holes(start)
+        shown = holes if max_ranges is None else holes[:max_ranges]
+        return {
+            "first": self.first,
+            "last": self.last,
+            "frames": self.count,
+            "missing": sum(b - a + 1 for a, b in holes),
+            "hole_ranges": len(holes),
+            "holes": [list(r) for r in shown],
+            "truncated": len(shown) < len(holes),
+        }
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits[: (self.last >> 3) + 1]) if self.count else b""
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FramePresenceBitmap":
+        bitmap = cls()
+        bitmap._bits = bytearray(data)
+        bitmap.count = sum(_BIT_COUNT[b] for b in data)
+        if bitmap.count:
+            present = bitmap._scan_bounds()
+            bitmap.first, bitmap.last = present
+        return bitmap
+
+    def _scan_bounds(self) -> tuple[int, int]:
+        bits = self._bits
+        lo = next(i for i, b in enumerate(bits) if b)
+        hi = next(i for i in range(len(bits) - 1, -1, -1) if bits[i])
+        first = lo * 8 + ((bits[lo] & -bits[lo]).bit_length() - 1)
+        last = hi * 8 + bits[hi].bit_length() - 1
+        return first, last
+
+
+def write_sidecar(folder: str | os.PathLike, bitmap: FramePresenceBitmap, **extra) -> str:
+    """Write the full presence summary next to the clip's DNGs."""
+    path = os.path.join(os.fspath(folder), SIDECAR_NAME)
+    data = bitmap.summary()
+    data["runs"] = [list(r) for r in bitmap.runs()]
+    data.update(extra)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
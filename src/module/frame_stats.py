@@ -0,0 +1,261 @@
+"""Rolling inter-frame interval statistics.
+
+``FrameIntervalStats`` keeps the last *capacity* sensor-timestamp intervals
+in a fixed ``array`` ring together with running sums, monotonic min/max
+queues and a bucket histogram, so adding a frame is O(1) and the summary
+(mean fps, jitter, percentiles) is only computed when somebody asks for it.
+``IntervalHistogram`` is the unbounded counterpart used for whole takes and
+``FpsHistory`` keeps per-second min/mean/max frame rates for the last hour.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class FrameIntervalStats:
+    """Fixed-capacity window of inter-frame intervals in nanoseconds.
+
+    Sums are kept as Python ints, so mean and standard deviation are exact
+    and never drift however long the session runs. Percentiles come from a
+    histogram with *bucket_ns* resolution; intervals longer than
+    *max_interval_ns* land in the last bucket.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 99,
+        *,
+        bucket_ns: int = 50_000,
+        max_interval_ns: int = 500_000_000,
+    ):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity!r}")
+        self.capacity = int(capacity)
+        self.bucket_ns = int(bucket_ns)
+        self._buckets = max_interval_ns // self.bucket_ns + 1
+        self._ring = array("q", bytes(8 * self.capacity))
+        self._min: deque[tuple[int, int]] = deque()
+        self._max: deque[tuple[int, int]] = deque()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every interval and the last timestamp (e.g. after a restart)."""
+        self._count = 0
+        self._head = 0
+        self._seq = 0
+        self._sum = 0
+        self._sumsq = 0
+        self._last_ts: int | None = None
+        self.last_interval_ns: int | None = None
+        self._min.clear()
+        self._max.clear()
+        self._hist = array("I", bytes(4 * self._buckets))
+
+    # ------------------------------------------------------------------
+    def add_timestamp(self, timestamp_ns: int) -> bool:
+        """Feed a sensor timestamp; returns True when an interval was added.
+
+        A repeated timestamp is ignored and one that goes backwards (sensor
+        restart) starts a new window.
+        """
+        last = self._last_ts
+        if last is not None and timestamp_ns == last:
+            return False
+        if last is not None and timestamp_ns < last:
+            self.clear()
+        self._last_ts = timestamp_ns
+        if last is None or timestamp_ns < last:
+            return False
+        self.add_interval(timestamp_ns - last)
+        return True
+
+    def add_interval(self, interval_ns: int) -> None:
+        self.last_interval_ns = interval_ns
+        ring = self._ring
+        head = self._head
+        if self._count == self.capacity:
+            old = ring[head]
+            self._sum -= old
+            self._sumsq -= old * old
+            self._hist[self._bucket(old)] -= 1
+        else:
+            self._count += 1
+        ring[head] = interval_ns
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        self._sum += interval_ns
+        self._sumsq += interval_ns * interval_ns
+        self._hist[self._bucket(interval_ns)] += 1
+
+        self._seq += 1
+        seq = self._seq
+        oldest = seq - self._count
+        lows, highs = self._min, self._max
+        while lows and lows[-1][1] >= interval_ns:
+            lows.pop()
+        lows.append((seq, interval_ns))
+        while lows[0][0] <= oldest:
+            lows.popleft()
+        while highs and highs[-1][1] <= interval_ns:
+            highs.pop()
+        highs.append((seq, interval_ns))
+        while highs[0][0] <= oldest:
+            highs.popleft()
+
+    def _bucket(self, interval_ns: int) -> int:
+        index = interval_ns // self.bucket_ns
+        return index if index < self._buckets else self._buckets - 1
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp_ns(self) -> int | None:
+        return self._last_ts
+
+    @property
+    def mean_ns(self) -> float | None:
+        return self._sum / self._count if self._count else None
+
+    @property
+    def fps(self) -> float | None:
+        """Mean frame rate over the window (None until two frames were seen)."""
+        return NS_PER_SECOND * self._count / self._sum if self._count and self._sum else None
+
+    @property
+    def min_ns(self) -> int | None:
+        return self._min[0][1] if self._count else None
+
+    @property
+    def max_ns(self) -> int | None:
+        return self._max[0][1] if self._count else None
+
+    @property
+    def stddev_ns(self) -> float | None:
+        """Population standard deviation of the intervals (frame jitter)."""
+        n = self._count
+        if not n:
+            return None
+        return math.sqrt(max(0, n * self._sumsq - self._sum * self._sum)) / n
+
+    def percentile_ns(self, fraction: float) -> float | None:
+        """Interval at *fraction* (0–1), to histogram-bucket resolution."""
+        if not self._count:
+            return None
+        rank = max(1, math.ceil(fraction * self._count))
+        seen = 0
+        for index, hits in enumerate(self._hist):
+            seen += hits
+            if seen >= rank:
+                return (index + 0.5) * self.bucket_ns
+        return (self._buckets - 0.5) * self.bucket_ns
+
+    def summary(self) -> dict:
+        """Snapshot for logging or publishing; interval figures in ms."""
+        if not self._count:
+            return {"frames": 0}
+
+        def ms(value):
+            return round(value / 1_000_000, 3)
+
+        return {
+            "frames": self._count,
+            "fps": round(self.fps, 4),
+            "mean_ms": ms(self.mean_ns),
+            "min_ms": ms(self.min_ns),
+            "max_ms": ms(self.max_ns),
+            "jitter_ms": ms(self.stddev_ns),
+            "p50_ms": ms(self.percentile_ns(0.50)),
+            "p95_ms": ms(self.percentile_ns(0.95)),
+            "p99_ms": ms(self.percentile_ns(0.99)),
+        }
+
+
+class IntervalHistogram:
+    """Bucket counts of every interval added (no window), e.g. for one take."""
+
+    def __init__(self, *, bucket_ns: int = 250_000, max_interval_ns: int = 500_000_000):
+        self.bucket_ns = int(bucket_ns)
+        self._buckets = max_interval_ns // self.bucket_ns + 1
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns: int | None = None
+        self._hist = array("I", bytes(4 * self._buckets))
+
+    def add(self, interval_ns: int) -> None:
+        index = interval_ns // self.bucket_ns
+        self._hist[index if index < self._buckets else self._buckets - 1] += 1
+        self.count += 1
+        self.total_ns += interval_ns
+        if self.max_ns is None or interval_ns > self.max_ns:
+            self.max_ns = interval_ns
+
+    def summary(self) -> dict:
+        """Non-empty buckets as ``[start_ms, count]``; figures in ms."""
+        if not self.count:
+            return {"count": 0}
+        bucket_ms = self.bucket_ns / 1_000_000
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1_000_000, 3),
+            "max_ms": round(self.max_ns / 1_000_000, 3),
+            "bucket_ms": bucket_ms,
+            "buckets": [[round(i * bucket_ms, 3), n] for i, n in enumerate(self._hist) if n],
+        }
+
+
+class FpsHistory:
+    """Per-second min/mean/max frame rate over the last *seconds* seconds.
+
+    One slot per wall-clock second in preallocated ``array`` columns, reused
+    round-robin, so memory is fixed however long the camera stays up.
+    """
+
+    def __init__(self, seconds: int = 3600):
+        if seconds < 1:
+            raise ValueError(f"seconds must be at least 1, got {seconds!r}")
+        self.seconds = int(seconds)
+        self._second = array("q", [-1]) * self.seconds
+        self._count = array("I", bytes(4 * self.seconds))
+        self._sum = array("d", bytes(8 * self.seconds))
+        self._min = array("d", bytes(8 * self.seconds))
+        self._max = array("d", bytes(8 * self.seconds))
+
+    def add(self, fps: float, now: float) -> None:
+        second = int(now)
+        slot = second % self.seconds
+        if self._second[slot] != second:
+            self._second[slot] = second
+            self._count[slot] = 1
+            self._sum[slot] = self._min[slot] = self._max[slot] = fps
+            return
+        self._count[slot] += 1
+        self._sum[slot] += fps
+        if fps < self._min[slot]:
+            self._min[slot] = fps
+        elif fps > self._max[slot]:
+            self._max[slot] = fps
+
+    def clear(self) -> None:
+        for slot in range(self.seconds):
+            self._second[slot] = -1
+
+    def query(self, seconds: int | None = None, *, now: float) -> list[tuple[int, float, float, float]]:
+        """``(second, min, mean, max)`` rows of the last *seconds*, oldest first."""
+        span = self.seconds if seconds is None else max(0, min(int(seconds), self.seconds))
+        newest = int(now)
+        rows = []
+        for second in range(newest - span + 1, newest + 1):
+            slot = second % self.seconds
+            if self._second[slot] == second:
+                count = self._count[slot]
+                rows.append((second, self._min[slot], self._sum[slot] / count, self._max[slot]))
+        return rows
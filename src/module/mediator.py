@@ -1,8 +1,8 @@
 import logging
-import threading
 import json
 import time
 from module.redis_controller import ParameterKey
+from module.scheduler import get_timer_service
 
 class Mediator:
     def __init__(self, cinepi_app, cinepi_controller, redis_listener, redis_controller, ssd_monitor, gpio_output, stream, usb_monitor):
@@ -17,10 +17,26 @@ class Mediator:
 
         # Other event subscriptions
         self.cinepi_app.message.subscribe(self.handle_cinepi_message)
-        self.redis_controller.redis_parameter_changed.subscribe(self.handle_redis_event)
-        self.redis_controller.redis_parameter_changed.subscribe(self.handle_fps_change)
-        self.redis_controller.redis_parameter_changed.subscribe(self.handle_shutter_a_change)
-
+        self.redis_controller.redis_parameter_changed.subscribe(
+            self.handle_redis_event,
+            keys=(
+                ParameterKey.STORAGE_PREROLL_ACTIVE,
+                ParameterKey.REC,
+                ParameterKey.IS_RECORDING,
+                ParameterKey.LAST_DNG_CAM0,
+                ParameterKey.LAST_DNG_CAM1,
+                ParameterKey.DROP_FRAME_RELAY,
+                ParameterKey.IS_WRITING,
+            ),
+        )
+        self.redis_controller.redis_parameter_changed.subscribe(
+            self.handle_fps_change, keys=(ParameterKey.FPS,)
+        )
+        self.redis_controller.redis_parameter_changed.subscribe(
+            self.handle_shutter_a_change, keys=(ParameterKey.SHUTTER_A,)
+        )
+
+        self.timers = get_timer_service()
         self.stop_recording_timer = None
         self.stop_recording_timeout = 2
 
@@ -69,8 +85,9 @@ class Mediator:
         # Start or reset the timer when recording stops (status = 0)        
         if status == 0:
             if self.stop_recording_timer is None or not self.stop_recording_timer.is_alive():
-                self.stop_recording_timer = threading.Timer(self.stop_recording_timeout, self.handle_stop_recording_timeout)
-                self.stop_recording_timer.start()
+                self.stop_recording_timer = self.timers.call_later(
+                    self.stop_recording_timeout, self.handle_stop_recording_timeout
+                )
         # Reset the timer when recording starts (status = 1)
         elif status == 1:
             if self.stop_recording_timer and self.stop_recording_timer.is_alive():
@@ -11,9 +11,12 @@ What’s new in this revision
 
 from __future__ import annotations
 import logging, threading, redis, psutil, time
+from collections import deque
 from enum import Enum
 import time, math
 
+from module.timecode import TimeOfDayClock, formatter_for
+
 # ───────────────────────── parameter keys ────────────────────────────
 class ParameterKey(Enum):
     AUDIO_CAPTURE_GAIN_DB = "audio_capture_gain_db"
@@ -92,90 +95,549 @@ class ParameterKey(Enum):
     HDMI_PREVIEW_SOURCE = "hdmi_preview_source"  # dual-sensor HDMI: both / cam0 / cam1 / pip_cam0 / pip_cam1
     RECORD_CAMS         = "record_cams"          # which sensors record this take: cam0+cam1 / cam0 / cam1
     WRITE_SPEED_TO_DRIVE = "write_speed_to_drive"
+    DRIVE_IN_FLIGHT     = "drive_in_flight"       # block-layer requests in flight
+    DRIVE_WRITE_LATENCY_MS = "drive_write_latency_ms"  # mean write completion time
+    DRIVE_BUSY_PERCENT  = "drive_busy_percent"    # share of time the device had I/O queued
+    DRIVE_DIRTY_MB      = "drive_dirty_mb"        # page cache waiting to be written (MiB)
+    DRIVE_WRITEBACK_MB  = "drive_writeback_mb"    # page cache being written right now (MiB)
     RECORDING_TIME         = "recording_time"      # elapsed-time in seconds   
     RECORDING_TC_REC     = "recording_tc_rec"    # elapsed-time time-code
     RECORDING_TC_TOD   = "recording_time_tod"    # time-of-day time-code
+    RECORDING_START_NS = "recording_start_ns"    # epoch ns of take start, 0 when idle
     FRAMES_IN_SYNC      = "frames_in_sync"
+    FRAME_STATS         = "frame_stats"           # JSON interval summary per camera
+    FRAME_HOLES         = "frame_holes"           # JSON missing-frame ranges per clip
+    TAKE_REPORT         = "take_report"           # JSON summary of the last take report
+    BUFFER_OVERFLOW_ETA = "buffer_overflow_eta"   # predicted s until the RAM buffer is full, -1 = none
+    ERASE_PROGRESS      = "erase_progress"        # JSON progress of the running / last drive erase
+
+    @property
+    def value_type(self) -> type:
+        """Declared value type (int, float, bool or str) of this key."""
+        return _KEY_TYPES.get(self.value, str)
+
+
+# ───────────────────────── typed decoding ────────────────────────────
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "no", "off"})
+
+
+def _decode_float(text) -> float | None:
+    try:
+        number = float(text)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _decode_int(text) -> int | None:
+    number = _decode_float(text)
+    return int(number) if number is not None else None
+
+
+def _decode_bool(text) -> bool | None:
+    if text is None:
+        return None
+    text = str(text).strip().lower()
+    if text in _TRUE_STRINGS:
+        return True
+    if text in _FALSE_STRINGS:
+        return False
+    number = _decode_float(text)
+    # empty / non-numeric → None, so get_bool() falls back to its default
+    return bool(number) if number is not None else None
+
+
+_DECODERS = {int: _decode_int, float: _decode_float, bool: _decode_bool}
+
+_KEY_TYPES: dict[str, type] = {
+    **dict.fromkeys((
+        "bit_depth", "buffer", "buffer_size", "framecount", "height", "width",
+        "iso", "lores_height", "lores_width", "sensor_mode", "wb", "wb_user",
+        "drop_frame_count", "tc_hole_count", "missing_frame_count",
+        "resolution_target_width", "resolution_target_height",
+        "resolution_target_bit_depth", "recording_start_ns",
+        "buffer_overflow_eta", "drive_in_flight",
+    ), int),
+    **dict.fromkeys((
+        "fps", "fps_actual", "fps_last", "fps_max", "fps_user", "shutter_a",
+        "shutter_angle_nom", "shutter_angle_actual", "shutter_angle_transient",
+        "exposure_time", "zoom", "anamorphic_factor", "audio_capture_gain_db",
+        "recording_time", "space_left", "write_speed_to_drive",
+        "drive_write_latency_ms", "drive_busy_percent", "drive_dirty_mb",
+        "drive_writeback_mb",
+    ), float),
+    **dict.fromkeys((
+        "rec", "is_recording", "is_writing", "is_writing_buf", "is_buffering",
+        "is_mounted", "storage_preroll_active", "drop_frame",
+        "drop_frame_during_last_take", "drop_frame_relay", "frames_in_sync",
+        "dynamic_resolution_enabled", "dynamic_resolution_active",
+        "resolution_switching", "memory_alert",
+    ), bool),
+}
+_KEY_DECODERS = {key: _DECODERS[kind] for key, kind in _KEY_TYPES.items()}
+_MISSING = object()
+
+
+VALUE_CHANNEL_SUFFIX = "_values"   # cp_controls → cp_controls_values
+NOTIFY_BATCH_MAX = 256             # pub/sub messages drained per refresh
+
+# Keys outside ParameterKey that are read through the cache at runtime.
+DYNAMIC_KEYS = ("FSCK_STATUS", "user_changing_fps", "vu_meter", "audio_vu")
+DYNAMIC_KEY_PATTERNS = ("cinepi_ready_*",)
+PRIME_BATCH = 128                  # keys per MGET / SCAN COUNT hint
+
+
+SUBSCRIBER_QUEUE_SIZE = 256        # pending notifications per subscriber
+RECORDING_TIMER_MODES = ("ticker", "timestamp")
 
 
 # ────────────────────────── tiny pub‑sub helper ──────────────────────
+class _Subscriber:
+    """One handler plus its bounded queue and worker thread.
+
+    When the queue is full the oldest pending notification for the same key
+    is superseded (only the newest value matters); if there is none the
+    oldest notification overall is dropped.
+    """
+
+    def __init__(self, fn, keys=None, prefixes=None,
+                 queue_size=SUBSCRIBER_QUEUE_SIZE, synchronous=False):
+        self.fn = fn
+        self.name = getattr(fn, "__qualname__", repr(fn))
+        self.keys = frozenset(keys) if keys is not None else None
+        self.prefixes = tuple(prefixes) if prefixes else None
+        self.synchronous = synchronous
+        self.queue_size = max(1, int(queue_size))
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {
+            "delivered": 0, "dropped": 0, "superseded": 0, "errors": 0,
+            "max_depth": 0, "latency_ms_avg": 0.0, "latency_ms_max": 0.0,
+            "handler_ms_max": 0.0,
+        }
+        self._thread = None
+        if not synchronous:
+            self._thread = threading.Thread(
+                target=self._run, name=f"RedisEvent[{self.name}]", daemon=True
+            )
+            self._thread.start()
+
+    def wants(self, key) -> bool:
+        if self.keys is None and self.prefixes is None:
+            return True
+        if self.keys is not None and key in self.keys:
+            return True
+        return (
+            self.prefixes is not None
+            and isinstance(key, str)
+            and key.startswith(self.prefixes)
+        )
+
+    def put(self, key, data) -> None:
+        if self.synchronous:
+            self._call(data, time.perf_counter())
+            return
+        with self._cond:
+            if len(self._queue) >= self.queue_size:
+                for i, (queued_key, _data, _t) in enumerate(self._queue):
+                    if queued_key == key:
+                        del self._queue[i]
+                        self.stats["superseded"] += 1
+                        break
+                else:
+                    self._queue.popleft()
+                    self.stats["dropped"] += 1
+            self._queue.append((key, data, time.perf_counter()))
+            if len(self._queue) > self.stats["max_depth"]:
+                self.stats["max_depth"] = len(self._queue)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                _key, data, queued_at = self._queue.popleft()
+            self._call(data, queued_at)
+
+    def _call(self, data, queued_at: float) -> None:
+        started = time.perf_counter()
+        try:
+            self.fn(data)
+        except Exception:
+            self.stats["errors"] += 1
+            logging.exception("Redis change subscriber %s failed", self.name)
+        finished = time.perf_counter()
+        stats = self.stats
+        latency_ms = (started - queued_at) * 1000.0
+        stats["delivered"] += 1
+        stats["latency_ms_avg"] += (latency_ms - stats["latency_ms_avg"]) * 0.05
+        if latency_ms > stats["latency_ms_max"]:
+            stats["latency_ms_max"] = latency_ms
+        handler_ms = (finished - started) * 1000.0
+        if handler_ms > stats["handler_ms_max"]:
+            stats["handler_ms_max"] = handler_ms
+
+    def close(self, timeout: float = 1.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+
 class Event:
+    """Fan-out of change notifications to subscribers.
+
+    Each subscriber runs on its own worker thread with a bounded queue, so a
+    slow handler (e.g. a socketio emit to a stalled client) only delays
+    itself. Pass ``synchronous=True`` to run a handler inline on the
+    emitting thread instead.
+
+    ``keys`` (ParameterKeys or names) and/or ``prefix`` restrict a handler
+    to the changes it cares about. emit() looks the key up in a dispatch
+    table, so uninterested handlers cost nothing per change.
+    """
+
     def __init__(self):
-        self._handlers = []
-    def subscribe(self, fn):
-        self._handlers.append(fn)
+        self._subscribers: list[_Subscriber] = []
+        self._routes: dict = {}          # key → subscribers wanting it
+
+    def subscribe(self, fn, *, keys=None, prefix=None,
+                  queue_size=SUBSCRIBER_QUEUE_SIZE, synchronous=False):
+        if isinstance(keys, (str, ParameterKey)):
+            keys = (keys,)
+        keys = None if keys is None else {
+            k.value if isinstance(k, ParameterKey) else str(k) for k in keys
+        }
+        prefixes = (prefix,) if isinstance(prefix, str) else prefix
+        sub = _Subscriber(fn, keys, prefixes, queue_size, synchronous)
+        self._subscribers = self._subscribers + [sub]     # copy-on-write
+        self._routes = {}                                  # rebuilt lazily
+        return sub
+
+    def _route(self, key) -> tuple:
+        routes = self._routes
+        subs = routes.get(key)
+        if subs is None:
+            subs = tuple(sub for sub in self._subscribers if sub.wants(key))
+            routes[key] = subs
+        return subs
+
     def emit(self, data=None):
-        for fn in self._handlers:
-            fn(data)
+        key = data.get("key") if isinstance(data, dict) else None
+        for sub in self._route(key):
+            sub.put(key, data)
+
+    def get_stats(self) -> list[dict]:
+        """Per-subscriber delivery counters and latencies (milliseconds)."""
+        result = []
+        for sub in self._subscribers:
+            with sub._cond:
+                entry = dict(sub.stats, depth=len(sub._queue))
+            entry["subscriber"] = sub.name
+            entry["synchronous"] = sub.synchronous
+            result.append(entry)
+        return result
+
+    def close(self, timeout: float = 1.0) -> None:
+        for sub in self._subscribers:
+            sub.close(timeout)
 
 # ────────────────────────── main controller class ────────────────────
 class RedisController:
 
-    def __init__(self, host="localhost", port=6379, db=0, channel="cp_controls", conform_frame_rate: int = 24):
-        self.r      = redis.StrictRedis(host=host, port=port, db=db)
-        self.ps     = self.r.pubsub(); self.ps.subscribe(channel)
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        channel="cp_controls",
+        conform_frame_rate: int = 24,
+        *,
+        coalesce_writes: bool = True,
+        flush_interval_s: float = 0.002,
+        recording_timer_mode: str = "ticker",
+        redis_client=None,
+    ):
+        self.r      = redis_client if redis_client is not None else redis.StrictRedis(host=host, port=port, db=db)
+        self.channel = channel
+        # Value-carrying twin of *channel*: "<key>=<value>" per message, so
+        # subscribers can refresh without a GET. cinepi-raw and other legacy
+        # listeners keep receiving the bare key on *channel*.
+        self.value_channel = f"{channel}{VALUE_CHANNEL_SUFFIX}"
+        self.ps     = self.r.pubsub(); self.ps.subscribe(channel, self.value_channel)
+        # self.lock guards cache *mutations* only and is never held across
+        # network I/O. Readers use get_value()/snapshot() without it.
         self.lock   = threading.Lock()
         self.cache  = {}
-        self.local_updates: set[str] = set()
+        self._typed: dict[str, object] = {}    # decoded values of typed keys
+        self.cache_version = 0          # bumped on every cache mutation
+        self.cache_prime_ms = 0.0
+        # Sync-mode writes reach Redis in cache order: each takes a ticket
+        # under self.lock and waits for its turn outside it.
+        self._sync_cond = threading.Condition()
+        self._sync_next_ticket = 0      # guarded by self.lock
+        self._sync_serving = 0          # guarded by _sync_cond
+        # key → number of our own publishes whose echo is still in flight
+        self._echo_pending: dict[str, int] = {}
+        self._listener_stop = threading.Event()
+        self.notify_stats = {
+            "messages": 0,        # pub/sub messages received
+            "own_echoes": 0,      # echoes of our own writes (no refresh needed)
+            "inline_values": 0,   # refreshed from the message payload
+            "fetched": 0,         # legacy key-only notifications → MGET
+            "collapsed": 0,       # duplicate keys merged within one burst
+            "fetch_round_trips": 0,
+        }
 
         self.redis_parameter_changed = Event()
 
         self.conform_frame_rate = conform_frame_rate
+        self._tod_clock = TimeOfDayClock()
+        # "ticker": publish recording_time/tc_rec/tod on every frame edge.
+        # "timestamp": publish recording_start_ns once; consumers derive
+        # elapsed time themselves (final values are written at stop).
+        if recording_timer_mode not in RECORDING_TIMER_MODES:
+            logging.warning("Unknown recording_timer_mode %r – using 'ticker'", recording_timer_mode)
+            recording_timer_mode = "ticker"
+        self.recording_timer_mode = recording_timer_mode
+        self._rec_start_mono_ns = 0
+        self.rec_timer_stats = {"ticks": 0, "skipped_edges": 0, "max_late_ms": 0.0}
         self.recording_start_time: float | None = None
         self._rec_timer_stop = threading.Event()
         self._rec_timer_thread: threading.Thread | None = None
 
+        # ── write coalescing ────────────────────────────────────────────
+        # set_value() only touches the cache and queues the key; a single
+        # flusher thread writes every pending key in one MULTI pipeline per
+        # tick and publishes each changed key once. A key written several
+        # times inside one tick costs one SET + one PUBLISH.
+        self.coalesce_writes = bool(coalesce_writes)
+        self.flush_interval_s = max(0.0, float(flush_interval_s))
+        self._pending: dict[str, str | None] = {}   # None → publish only
+        self._pending_round_trips = 0               # cost without coalescing
+        self._pending_cond = threading.Condition()
+        self._enqueued_gen = 0
+        self._flushed_gen = 0
+        self._flusher_stop = threading.Event()
+        self.write_stats = {
+            "writes": 0,              # set_value/republish calls queued
+            "coalesced": 0,           # writes superseded before their flush
+            "flushes": 0,             # pipelines sent
+            "keys_flushed": 0,        # SET/PUBLISH pairs actually sent
+            "round_trips_saved": 0,   # vs one SET + one PUBLISH per write
+            "flush_errors": 0,
+        }
+        self._flusher: threading.Thread | None = None
+        if self.coalesce_writes:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="RedisWriteFlusher", daemon=True
+            )
+            self._flusher.start()
+
         self._prime_cache()
         self._thread = threading.Thread(target=self._listen, daemon=True)
         self._thread.start()
 
     # ─────────────────────── initial cache fill ─────────────────────
     def _prime_cache(self):
-        for key in self.r.keys("*"):
-            val = self.r.get(key) or b""
-            self.cache[key.decode()] = val.decode(errors="replace")
-        logging.info("RedisController cache primed with %d keys", len(self.cache))
+        """Bulk-load the known key namespace with MGET batches.
+
+        SCAN is only used for the dynamic key patterns, so a busy Redis is
+        never blocked by KEYS and the round trips stay at ~N/PRIME_BATCH.
+        """
+        t0 = time.perf_counter()
+        names = dict.fromkeys([pk.value for pk in ParameterKey] + list(DYNAMIC_KEYS))
+        for pattern in DYNAMIC_KEY_PATTERNS:
+            for key in self.r.scan_iter(match=pattern, count=PRIME_BATCH):
+                names[key.decode() if isinstance(key, bytes) else key] = None
+        names = list(names)
+
+        loaded = {}
+        for i in range(0, len(names), PRIME_BATCH):
+            chunk = names[i:i + PRIME_BATCH]
+            for key, val in zip(chunk, self.r.mget(chunk)):
+                if val is not None:
+                    loaded[key] = val.decode(errors="replace")
+        with self.lock:
+            for key, value in loaded.items():
+                self._store(key, value)
+            self.cache_version += 1
+
+        self.cache_prime_ms = (time.perf_counter() - t0) * 1000.0
+        logging.info("RedisController cache primed with %d keys in %.1f ms",
+                     len(loaded), self.cache_prime_ms)
 
     # ─────────────────────── background listener ────────────────────
     def _listen(self):
-        for msg in self.ps.listen():
-            if msg["type"] != "message":
+        while not self._listener_stop.is_set():
+            try:
+                msg = self.ps.get_message(timeout=1.0)
+                if msg is None:
+                    continue
+                # Drain the burst that is already queued so repeated
+                # notifications for one key collapse into a single refresh.
+                batch = [msg]
+                while len(batch) < NOTIFY_BATCH_MAX:
+                    more = self.ps.get_message(timeout=0.0)
+                    if more is None:
+                        break
+                    batch.append(more)
+                self._process_notifications(batch)
+            except Exception as exc:
+                if self._listener_stop.is_set():
+                    break
+                logging.error("RedisController listener error: %s", exc)
+                with self.lock:
+                    self._echo_pending.clear()
+                time.sleep(0.5)
+
+    def _process_notifications(self, batch) -> None:
+        stats = self.notify_stats
+        updates: dict[str, str | None] = {}   # None → value must be fetched
+        own_fetch: set[str] = set()           # fetched while our echo was in flight
+        for msg in batch:
+            if msg.get("type") != "message":
+                continue
+            stats["messages"] += 1
+            channel = msg.get("channel")
+            if isinstance(channel, bytes):
+                channel = channel.decode(errors="replace")
+            data = msg["data"]
+            if isinstance(data, bytes):
+                data = data.decode(errors="replace")
+
+            if channel == self.value_channel:
+                key, sep, value = data.partition("=")
+                if not sep:
+                    continue
+                with self.lock:
+                    pending = self._echo_pending.get(key, 0)
+                    if pending:
+                        # Our own write: the cache is already authoritative
+                        # and set_value() has notified subscribers.
+                        if pending == 1:
+                            del self._echo_pending[key]
+                        else:
+                            self._echo_pending[key] = pending - 1
+                        stats["own_echoes"] += 1
+                        continue
+                if key in updates:
+                    stats["collapsed"] += 1
+                    del updates[key]
+                updates[key] = value
                 continue
-            key = msg["data"].decode()
+
+            # Bare key: always fetch. It may be a legacy publisher writing a
+            # key whose own echo is still in flight; only the value-channel
+            # echo consumes _echo_pending.
+            key = data
             with self.lock:
-                # suppress echo of own writes
-                if key in self.local_updates:
-                    self.local_updates.remove(key)
-                value = (self.r.get(key) or b"").decode()
-                self.cache[key] = value
-
-            if key == ParameterKey.IS_RECORDING.value:
-                if value == "0":
-                    self._stop_recording_timer()
-            elif key == ParameterKey.REC.value:
-                if value == "1":
-                    # Start timer on first frame of take; don't restart if already running
-                    # (rec can bounce 0→1 during pipeline stalls without ending the take)
-                    if not (self._rec_timer_thread and self._rec_timer_thread.is_alive()):
-                        self._start_recording_timer()
+                if self._echo_pending.get(key):
+                    own_fetch.add(key)
+            if key in updates:
+                stats["collapsed"] += 1
+                del updates[key]
+            updates[key] = None           # legacy publisher – fetch it
+
+        if not updates:
+            return
+
+        fetch = [key for key, value in updates.items() if value is None]
+        if fetch:
+            stats["fetched"] += len(fetch)
+            stats["fetch_round_trips"] += 1
+            for key, raw in zip(fetch, self.r.mget(fetch)):
+                updates[key] = (raw or b"").decode(errors="replace")
+        else:
+            stats["inline_values"] += len(updates)
+
+        with self.lock:
+            with self._pending_cond:
+                unflushed = {key for key in fetch if self._pending.get(key) is not None}
+            for key in fetch:
+                # A local write that is queued or still in flight will
+                # overwrite Redis anyway, and our own echo brings nothing
+                # new – keep the cache and skip the emit.
+                if (key in unflushed or self._echo_pending.get(key)
+                        or (key in own_fetch and updates[key] == self.cache.get(key))):
+                    del updates[key]
+            for key, value in updates.items():
+                self._store(key, value)
+            if updates:
+                self.cache_version += 1
+
+        for key, value in updates.items():
+            self._on_key_changed(key, value)
             # notify subscribers – no log spam here
             if key != ParameterKey.FPS_ACTUAL.value:
                 self.redis_parameter_changed.emit({"key": key, "value": value})
 
+    def _on_key_changed(self, key: str, value: str) -> None:
+        """Side effects shared by local writes and remote notifications."""
+        if key == ParameterKey.IS_RECORDING.value:
+            if value == "0":
+                self._stop_recording_timer()
+        elif key == ParameterKey.REC.value:
+            if value == "1":
+                # Start timer on first frame of take; don't restart if already running
+                # (rec can bounce 0→1 during pipeline stalls without ending the take)
+                if self.recording_start_time is None:
+                    self._start_recording_timer()
+
     # ───────────────────────── public helpers ───────────────────────
     def get_value(self, key, default=None):
+        # Lock-free: a single dict lookup is atomic under the GIL and the
+        # cache only ever holds str values, so readers (GUI redraws, stats
+        # thread, web handlers) never queue behind a writer.
+        return self.cache.get(key, default)
+
+    def _store(self, key_name: str, text: str) -> None:
+        # caller holds self.lock; typed keys are decoded once, here
+        decoder = _KEY_DECODERS.get(key_name)
+        if decoder is not None:
+            self._typed[key_name] = decoder(text)
+        self.cache[key_name] = text
+
+    def _get_typed(self, key, decoder):
+        key_name = key.value if isinstance(key, ParameterKey) else str(key)
+        value = self._typed.get(key_name, _MISSING)
+        if value is _MISSING:
+            raw = self.cache.get(key_name)
+            value = None if raw is None else decoder(raw)
+        return value
+
+    def get_int(self, key, default: int | None = None) -> int | None:
+        """Return *key* as int (pre-decoded for typed keys), else *default*."""
+        value = self._get_typed(key, _decode_int)
+        return default if value is None else int(value)
+
+    def get_float(self, key, default: float | None = None) -> float | None:
+        """Return *key* as float (pre-decoded for typed keys), else *default*."""
+        value = self._get_typed(key, _decode_float)
+        return default if value is None else float(value)
+
+    def get_bool(self, key, default: bool = False) -> bool:
+        """Return *key* as bool ("1", "true", "yes", "on" or non-zero)."""
+        value = self._get_typed(key, _decode_bool)
+        return default if value is None else bool(value)
+
+    def snapshot(self) -> tuple[int, dict[str, str]]:
+        """Return ``(version, values)`` – a consistent copy of the cache.
+
+        Use it when several keys must be read together (e.g. one GUI
+        frame); *version* lets callers skip work when nothing changed.
+        """
         with self.lock:
-            return self.cache.get(key, default)
+            return self.cache_version, dict(self.cache)
 
     def _storage_preroll_active(self) -> bool:
-        value = self.cache.get(ParameterKey.STORAGE_PREROLL_ACTIVE.value, "0")
-        text = str(value).strip().lower()
-        if text in ("1", "true", "yes", "on"):
-            return True
-        try:
-            return bool(int(text))
-        except (TypeError, ValueError):
-            return False
+        return self.get_bool(ParameterKey.STORAGE_PREROLL_ACTIVE)
 
         # ────────────────────────── public helpers ───────────────────────
     def set_value(self, key, value):
@@ -190,14 +652,101 @@ class RedisController:
         with self.lock:
             if str(self.cache.get(key_name)) == str(value):
                 return                             # unchanged – nothing to do
-            self.r.set(key_name, value)
-            self.r.publish("cp_controls", key_name)
-            self.cache[key_name] = str(value)
-            self.local_updates.add(key_name)
+            self._store(key_name, str(value))
+            self.cache_version += 1
+            if self.coalesce_writes:
+                # Queue under the cache lock so the flusher sees writes to
+                # one key in the same order as the cache did.
+                self._enqueue(key_name, str(value))
+            else:
+                self._expect_echo(key_name)
+                ticket = self._take_sync_ticket()
+
+        if not self.coalesce_writes:
+            self._send_sync(ticket, {key_name: str(value)})
+
+        self._log_change(key_name, value, self._storage_preroll_active())
+
+        # ─── immediate local notification to subscribers ─────────────
+        self._on_key_changed(key_name, str(value))
+        self.redis_parameter_changed.emit({"key": key_name, "value": str(value)})
+
+    def set_values(self, mapping) -> None:
+        """Write several keys as one atomic batch.
+
+        All changed keys reach Redis in a single MULTI pipeline (the same
+        flush when coalescing), so readers never see a half-updated set.
+        """
+        changed: dict[str, str] = {}
+        with self.lock:
+            for key, value in mapping.items():
+                key_name = key.value if isinstance(key, ParameterKey) else str(key)
+                if value is None:
+                    logging.warning(f"Attempted to set Redis key '{key_name}' to None. Ignoring.")
+                    continue
+                text = str(value)
+                if str(self.cache.get(key_name)) == text:
+                    continue
+                self._store(key_name, text)
+                changed[key_name] = text
+            if not changed:
+                return
+            self.cache_version += 1
+            if self.coalesce_writes:
+                self._enqueue_many(changed)
+            else:
+                for key_name in changed:
+                    self._expect_echo(key_name)
+                ticket = self._take_sync_ticket()
+
+        if not self.coalesce_writes:
+            self._send_sync(ticket, changed)
 
-        # ─── enhanced logging rules ─────────────────────────────────
         preroll_active = self._storage_preroll_active()
+        for key_name, text in changed.items():
+            self._log_change(key_name, text, preroll_active)
+            self._on_key_changed(key_name, text)
+            self.redis_parameter_changed.emit({"key": key_name, "value": text})
+
+    def _take_sync_ticket(self) -> int:
+        # caller holds self.lock, so tickets follow cache order
+        ticket = self._sync_next_ticket
+        self._sync_next_ticket += 1
+        return ticket
+
+    def _send_sync(self, ticket: int, changed: dict[str, str]) -> None:
+        # Runs without self.lock: readers and the listener never wait on
+        # this round trip. The caller registered the echoes; a failed write
+        # will never echo, so drop them again or the listener would keep
+        # ignoring legacy notifications for these keys.
+        with self._sync_cond:
+            while self._sync_serving != ticket:
+                self._sync_cond.wait()
+        try:
+            self._write_sync(changed)
+        except Exception:
+            with self.lock:
+                for key_name in changed:
+                    self._forget_echo(key_name)
+            raise
+        finally:
+            with self._sync_cond:
+                self._sync_serving += 1
+                self._sync_cond.notify_all()
 
+    def _write_sync(self, changed: dict[str, str]) -> None:
+        # caller holds the current sync ticket; one MULTI so each key's SET and its two
+        # publishes are never interleaved with another client's
+        pipe = self.r.pipeline(transaction=True)
+        for key_name, text in changed.items():
+            pipe.set(key_name, text)
+        for key_name, text in changed.items():
+            pipe.publish(self.channel, key_name)
+            pipe.publish(self.value_channel, f"{key_name}={text}")
+        pipe.execute()
+
+    def _log_change(self, key_name: str, value, preroll_active: bool) -> None:
+        # ─── enhanced logging rules ─────────────────────────────────
         if key_name == ParameterKey.FRAMECOUNT.value:
             if preroll_active:
                 pass
@@ -235,6 +784,7 @@ class RedisController:
             ParameterKey.RECORDING_TIME.value,
             ParameterKey.RECORDING_TC_REC.value,
             ParameterKey.RECORDING_TC_TOD.value,
+            ParameterKey.RECORDING_START_NS.value,
             ParameterKey.TC_CAM0.value,
             ParameterKey.TC_CAM1.value,
             ParameterKey.FPS_ACTUAL.value,
@@ -246,34 +796,147 @@ class RedisController:
         else:
             logging.info(f"Changed value: {key_name} = {value}")
 
-        # ─── immediate local notification to subscribers ─────────────
-        self.redis_parameter_changed.emit({"key": key_name, "value": str(value)})
 
+    def republish(self, key) -> None:
+        """Publish *key* on the control channel without changing its value.
+
+        Used to wake cinepi-raw for a key whose value is already current.
+        Goes through the flusher so it can never overtake a pending SET of
+        the same key.
+        """
+        key_name = key.value if isinstance(key, ParameterKey) else str(key)
+        if not self.coalesce_writes:
+            self.r.publish(self.channel, key_name)
+            return
+        self._enqueue(key_name, None)
+
+    # ─────────────────────── write coalescing ─────────────────────────
+    def _enqueue(self, key_name: str, value: str | None) -> None:
+        self._enqueue_many({key_name: value})
+
+    def _enqueue_many(self, items: dict[str, str | None]) -> None:
+        # one lock hold → the flusher sends all of *items* in the same batch.
+        # Lock order is self.lock → _pending_cond; never the other way round.
+        with self._pending_cond:
+            stats = self.write_stats
+            for key_name, value in items.items():
+                stats["writes"] += 1
+                if key_name in self._pending:
+                    stats["coalesced"] += 1
+                    if value is None:
+                        value = self._pending[key_name]   # keep the pending SET
+                self._pending[key_name] = value
+                self._pending_round_trips += 1 if value is None else 2
+            self._enqueued_gen += 1
+            self._pending_cond.notify()
+
+    def _flush_loop(self) -> None:
+        while not self._flusher_stop.is_set():
+            with self._pending_cond:
+                while not self._pending and not self._flusher_stop.is_set():
+                    self._pending_cond.wait()
+            # Let writers issued in the same frame join this batch.
+            if self.flush_interval_s and not self._flusher_stop.is_set():
+                self._flusher_stop.wait(self.flush_interval_s)
+            if not self._flush_pending():
+                self._flusher_stop.wait(0.5)          # Redis down – back off
+
+    def _flush_pending(self) -> bool:
+        # Swap the batch out and register its echoes in one self.lock hold:
+        # a key must never be in neither _pending nor _echo_pending, or the
+        # listener could store a stale MGET result over the newer cache value.
+        with self.lock:
+            with self._pending_cond:
+                if not self._pending:
+                    return True
+                batch = self._pending
+                round_trips = self._pending_round_trips
+                gen = self._enqueued_gen
+                self._pending = {}
+                self._pending_round_trips = 0
+            own = [key_name for key_name, value in batch.items() if value is not None]
+            for key_name in own:
+                self._expect_echo(key_name)
+        try:
+            pipe = self.r.pipeline(transaction=True)
+            for key_name, value in batch.items():
+                if value is not None:
+                    pipe.set(key_name, value)
+            for key_name, value in batch.items():
+                pipe.publish(self.channel, key_name)
+                if value is not None:
+                    pipe.publish(self.value_channel, f"{key_name}={value}")
+            pipe.execute()
+        except redis.RedisError as exc:
+            logging.error("Redis write flush failed (%d keys): %s", len(batch), exc)
+            with self.lock:
+                for key_name in own:
+                    self._forget_echo(key_name)
+            with self._pending_cond:
+                self.write_stats["flush_errors"] += 1
+                # Re-queue anything that was not superseded meanwhile.
+                for key_name, value in batch.items():
+                    self._pending.setdefault(key_name, value)
+                self._pending_round_trips += round_trips
+            return False
+
+        with self._pending_cond:
+            stats = self.write_stats
+            stats["flushes"] += 1
+            stats["keys_flushed"] += len(batch)
+            stats["round_trips_saved"] += max(0, round_trips - 1)
+            self._flushed_gen = max(self._flushed_gen, gen)
+            self._pending_cond.notify_all()
+        return True
+
+    def _expect_echo(self, key_name: str) -> None:
+        # caller holds self.lock
+        self._echo_pending[key_name] = self._echo_pending.get(key_name, 0) + 1
+
+    def _forget_echo(self, key_name: str) -> None:
+        # caller holds self.lock
+        pending = self._echo_pending.get(key_name, 0)
+        if pending <= 1:
+            self._echo_pending.pop(key_name, None)
+        else:
+            self._echo_pending[key_name] = pending - 1
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Block until every write queued so far has reached Redis."""
+        if not self.coalesce_writes:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._pending_cond:
+            target = self._enqueued_gen
+            self._pending_cond.notify()
+            while self._flushed_gen < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (self._flusher is None or not self._flusher.is_alive()):
+                    break
+                self._pending_cond.wait(remaining)
+            return self._flushed_gen >= target
+
+    def get_dispatch_stats(self) -> list[dict]:
+        """Per-subscriber latency and drop counters of redis_parameter_changed."""
+        return self.redis_parameter_changed.get_stats()
 
+    def get_write_stats(self) -> dict:
+        """Snapshot of the write-coalescing counters."""
+        with self._pending_cond:
+            stats = dict(self.write_stats)
+            stats["pending"] = len(self._pending)
+        return stats
 
         # ─────────────────────── time-code helpers ────────────────────────
     def nanoseconds_to_timecode(self, ns: int, frame_rate: float | None = None) -> str:
         """
         Convert an **epoch** nanosecond timestamp to an SMPTE hh:mm:ss:ff TOD code.
         """
-        # 1.  Epoch seconds (float)
-        epoch_sec  = ns / 1_000_000_000
-
-        # 2.  Local time-of-day → seconds since midnight (fractional!)
-        lt         = time.localtime(epoch_sec)
-        tod_sec    = (
-            lt.tm_hour * 3600 +
-            lt.tm_min  * 60   +
-            lt.tm_sec        +
-            (epoch_sec - math.floor(epoch_sec))    # sub-second fraction → frames
+        rate = frame_rate if frame_rate is not None else self.conform_frame_rate
+        return formatter_for(rate).time_of_day_timecode(
+            self._tod_clock.since_midnight_ns(int(ns))
         )
 
-        # 3.  Wrap exactly every 24 h so hh runs 00…23
-        tod_sec %= 86_400
-
-        # 4.  Format with existing helper
-        return self._format_timecode(tod_sec, frame_rate)    
-        
     def _format_timecode(
         self,
         seconds_total: float,
@@ -283,70 +946,68 @@ class RedisController:
         Return SMPTE time-code hh:mm:ss:ff for any positive offset in seconds.
         """
         rate = frame_rate if frame_rate is not None else self.conform_frame_rate
-        rate = int(round(rate))               # ensure integer fps
-
-        total_frames  = int(round(seconds_total * rate))
-        frames        = total_frames % rate               # 0 … rate-1  (int)
-        whole_seconds = total_frames // rate
-
-        secs   =  whole_seconds         % 60
-        mins   = (whole_seconds // 60)  % 60
-        hours  =  whole_seconds // 3600
-
-        # now every field is guaranteed to be an int → safe with :02d
-        return f"{hours:02d}:{mins:02d}:{secs:02d}:{frames:02d}"
+        return formatter_for(rate).seconds_to_timecode(seconds_total)
 
     def _current_tod_timecode(self) -> str:
         """Time-of-day time-code (localtime) at *conform_frame_rate*."""
-        now                  = time.time()
-        lt                   = time.localtime(now)
-        since_midnight_float = (
-            lt.tm_hour * 3600
-            + lt.tm_min  * 60
-            + lt.tm_sec
-            + (now - int(now))                 # fractional part for frames
-        )
-        return self._format_timecode(since_midnight_float)
+        return self.nanoseconds_to_timecode(time.time_ns())
 
 
     # ─────────────────────── recording timer loop ─────────────────────
+    def _recording_values(self, frames: int) -> dict:
+        """recording_time / tc_rec / tod for *frames* elapsed frame edges."""
+        fmt = formatter_for(self.conform_frame_rate)
+        return {
+            ParameterKey.RECORDING_TIME: frames / self.conform_frame_rate,
+            ParameterKey.RECORDING_TC_REC: fmt.frames_to_timecode(frames),
+            ParameterKey.RECORDING_TC_TOD: self._current_tod_timecode(),
+        }
+
     def _run_recording_timer(self) -> None:
+        # Deadlines are absolute multiples of the frame period from the take
+        # start on the monotonic clock, so wake-up jitter never accumulates.
+        period_ns = max(1, round(1_000_000_000 / self.conform_frame_rate))
+        start_ns = self._rec_start_mono_ns
+        stats = self.rec_timer_stats
+        edge = 1
         while not self._rec_timer_stop.is_set():
             if self.recording_start_time is None:
                 break
+            deadline = start_ns + edge * period_ns
+            delay_ns = deadline - time.monotonic_ns()
+            if delay_ns > 0 and self._rec_timer_stop.wait(delay_ns / 1_000_000_000):
+                break
 
-            # elapsed time, in seconds (float)
-            elapsed = time.time() - self.recording_start_time
-            self.set_value(ParameterKey.RECORDING_TIME, elapsed)
-
-            # elapsed time-code
-            self.set_value(
-                ParameterKey.RECORDING_TC_REC,
-                self._format_timecode(elapsed)
-            )
-
-            # time-of-day time-code
-            self.set_value(
-                ParameterKey.RECORDING_TC_TOD,
-                self._current_tod_timecode()
-            )
+            late_ns = time.monotonic_ns() - deadline
+            if late_ns >= period_ns:
+                # overslept: report the latest edge instead of bursting
+                missed = late_ns // period_ns
+                stats["skipped_edges"] += missed
+                edge += missed
+            if late_ns / 1e6 > stats["max_late_ms"]:
+                stats["max_late_ms"] = late_ns / 1e6
+            stats["ticks"] += 1
 
-            # wait just long enough to hit every frame edge
-            self._rec_timer_stop.wait(1 / self.conform_frame_rate)
+            self.set_values(self._recording_values(edge))
+            edge += 1
 
     # ─────────────────────── recording timer control ──────────────────
     def _start_recording_timer(self) -> None:
         self._stop_recording_timer()                 # safety first
         self.recording_start_time = time.time()
+        self._rec_start_mono_ns = time.monotonic_ns()
 
-        # prime the three keys with deterministic values
-        self.set_value(ParameterKey.RECORDING_TIME,      0.0)
-        self.set_value(ParameterKey.RECORDING_TC_REC,    "00:00:00:00")
-        self.set_value(ParameterKey.RECORDING_TC_TOD,    self._current_tod_timecode())
+        # prime the keys with deterministic values
+        values = self._recording_values(0)
+        values[ParameterKey.RECORDING_START_NS] = int(self.recording_start_time * 1e9)
+        self.set_values(values)
 
+        if self.recording_timer_mode != "ticker":
+            return
         self._rec_timer_stop.clear()
         self._rec_timer_thread = threading.Thread(
             target=self._run_recording_timer,
+            name="RecordingTimer",
             daemon=True
         )
         self._rec_timer_thread.start()
@@ -357,7 +1018,24 @@ class RedisController:
             self._rec_timer_thread.join(timeout=0.5)
         self._rec_timer_thread = None
 
+        if self.recording_start_time is None:
+            return
+        values = {ParameterKey.RECORDING_START_NS: 0}
+        if self.recording_timer_mode == "timestamp":
+            # nothing ticked during the take – leave the final duration behind
+            elapsed_ns = time.monotonic_ns() - self._rec_start_mono_ns
+            frames = elapsed_ns * self.conform_frame_rate // 1_000_000_000
+            values.update(self._recording_values(int(frames)))
+        self.recording_start_time = None
+        self.set_values(values)
+
 
     # optional helper -------------------------------------------------
     def stop_listener(self):
+        self.flush()
+        self._flusher_stop.set()
+        self._listener_stop.set()
+        with self._pending_cond:
+            self._pending_cond.notify_all()
         self.ps.unsubscribe(); self.ps.close(); self._thread.join(timeout=1)
+        self.redis_parameter_changed.close()
@@ -3,16 +3,30 @@ import logging
 import threading
 import datetime
 import json
-from collections import deque
+from module.buffer_predictor import BufferOverflowPredictor, frame_mib
+from module.camera_stats import CameraStatsAggregator, CameraStatsState
+from module.dng_index import DngIndex
+from module.frame_presence import FramePresenceBitmap, write_sidecar
 from module.redis_controller import ParameterKey
+from module.scheduler import get_timer_service
+from module.stats_pipeline import StatsRecord, parse_stats
+from module.take_report import build_take_report, index_entry, write_take_report
 
 import os
 import re
 import time
 import math
 import statistics
+from collections import deque
 
 class RedisListener:
+    # Flags whose transitions tell the final-analysis worker the buffers drained.
+    FLUSH_STATE_KEYS = (
+        ParameterKey.IS_WRITING_BUF.value,
+        ParameterKey.IS_BUFFERING.value,
+        ParameterKey.IS_WRITING.value,
+    )
+
     def __init__(
         self,
         redis_controller,
@@ -26,8 +40,13 @@ class RedisListener:
         live_sync_startup_guard_frames: int | float = 10,
         final_sync_analysis_tolerance_frames: int | float = 1,
         tc_drop_jitter_tolerance_frames: int | float = 1,
+        timer_service=None,
+        redis_client=None,
+        buffer_guard_seconds: float = 5.0,
     ):
-        self.redis_client = redis.StrictRedis(host=host, port=port, db=db)
+        # *redis_client* lets tools (stats replay, benchmarks) run the
+        # listener against another client, e.g. an in-process fake.
+        self.redis_client = redis_client if redis_client is not None else redis.StrictRedis(host=host, port=port, db=db)
         
         self.pubsub_stats = self.redis_client.pubsub()
         self.pubsub_controls = self.redis_client.pubsub()
@@ -37,8 +56,9 @@ class RedisListener:
         self.stdev_threshold = 2.0
         self.lock = threading.Lock()
         self.is_recording = False
-        self.framerate_values = []
-        self.sensor_timestamps = deque(maxlen=100)
+        # Per-camera cp_stats state (counters, buffer, frame intervals);
+        # bufferSize / framesInFlight / hw_write_failures derive from it.
+        self.camera_stats = CameraStatsAggregator()
         
         self.recording_start_time = None
         self.recording_end_time = None
@@ -47,7 +67,7 @@ class RedisListener:
         self.ssd_monitor = ssd_monitor
         self.framerate_callback = framerate_callback
 
-        self.framerate = float(self.redis_controller.get_value('fps_actual', 0))
+        self.framerate = self.redis_controller.get_float('fps_actual', 0.0)
         self.framecount_last_update_time = datetime.datetime.now()
         self.framecount = 0
         self.frame_count = 0
@@ -56,8 +76,6 @@ class RedisListener:
 
         self.set_frame_count_increase_tolerance()
         
-        self.bufferSize = 0
-        self.framesInFlight: int | None = None  # None until first stats from a build that publishes it
         self.colorTemp = 0
         self.focus = 0
         self.framecount = 0
@@ -77,14 +95,11 @@ class RedisListener:
         self.rec_hold_seconds = 0.3         # how long frameCount must stay flat before rec=0
 
 
+        self.timers = timer_service or get_timer_service()   # drop / relay / fps debounce timers
         self.drop_frame = False
         self.drop_frame_timer = None
         self.drop_frame_count_current_take = 0
         self.drop_frame_relay_timer = None
-        self.tc_frame_count: int | None = None
-        self.hw_dropped_frames: int | None = None  # unbiased count from cinepi-raw droppedFrames
-        self.hw_write_failures: int | None = None  # disk-write failures from cinepi-raw writeFailures
-        self.write_failure_count_current_take = 0
         self.frames_off_sync_latched_current_take = False
         self.live_sync_suppressed_current_take = False
         self.live_sync_warning_tolerance_frames = self._coerce_frame_tolerance(
@@ -133,25 +148,35 @@ class RedisListener:
         
         # ──  USER FPS TWEAK  ────────────────────────────────────────────────
         self.user_changing_fps = False          # True while the UI slider is moving
-        self.last_fps_value     = float(self.redis_controller.get_value("fps") or 0)
+        self.last_fps_value     = self.redis_controller.get_float("fps", 0.0)
         self.fps_change_timer   = None          # debounce timer
 
 
         self.current_framerate = None
 
-        self.last_timestamp_single = None
-        self.last_timestamp_cam0 = None
-        self.last_timestamp_cam1 = None
-
         self.fps_at_rec_start = None
         self.fps_timeline: list[tuple[datetime.datetime, float]] = []
+        # One long-lived worker drains a queue of finished takes; it is woken
+        # by is_writing_buf / is_buffering / is_writing transitions instead of
+        # polling, so analysis starts the moment the buffer is empty.
         self.final_analysis_thread = None
         self.final_analysis_lock = threading.Lock()
+        self.final_analysis_cond = threading.Condition(self.final_analysis_lock)
+        self.final_analysis_queue: deque[int] = deque()
         self.final_analysis_pending = False
         self.final_analysis_timeout_s = 30.0
-        self.final_analysis_poll_s = 0.2
+        # Safety re-check in case a flag transition is never published.
+        self.final_analysis_recheck_s = 1.0
         self.take_sequence = 0
         self.final_analysis_sequence: int | None = None
+        try:
+            self.redis_controller.redis_parameter_changed.subscribe(
+                self._on_flush_state_changed,
+                keys=self.FLUSH_STATE_KEYS,
+                synchronous=True,
+            )
+        except AttributeError:
+            pass
 
         self.recording_was_preroll = False
         self.frame_limit_target_slots: int | None = None
@@ -171,6 +196,17 @@ class RedisListener:
         self.last_stats_message_time: datetime.datetime | None = None
         self.recording_folder_hints: list[str] = []
         self.recording_folder_hint_set: set[str] = set()
+        # inotify index of the frames written this take; the final analysis
+        # falls back to scanning folders it cannot vouch for.
+        self.dng_index = DngIndex()
+        # Frame-presence bitmap per analysed clip folder (filled by _dng_count).
+        self.take_frame_presence: dict[str, FramePresenceBitmap] = {}
+        # Time-to-overflow of the RAM buffer; below buffer_guard_seconds the
+        # overflow callback (dynamic-resolution / fps step-down) fires once per take.
+        self.buffer_predictor = BufferOverflowPredictor()
+        self.buffer_guard_seconds = max(0.0, float(buffer_guard_seconds or 0))
+        self.buffer_overflow_callback = None
+        self.buffer_guard_fired = False
 
 
         self.start_listeners()
@@ -178,6 +214,10 @@ class RedisListener:
     def set_recording_stop_callback(self, callback) -> None:
         self.recording_stop_callback = callback
 
+    def set_buffer_overflow_callback(self, callback) -> None:
+        """*callback(eta_s)* runs on the stats thread; keep it short."""
+        self.buffer_overflow_callback = callback
+
     def _filter_initial_recording_framecount(self, new_count: int | None) -> int | None:
         if new_count is None:
             return None
@@ -380,7 +420,7 @@ class RedisListener:
             logging.info("Recording resolution reconfigure started; suspending frame sync/drop warnings.")
         self.recording_reconfigure_pending = True
         self.recording_reconfigure_grace_until = now + datetime.timedelta(seconds=5)
-        self.sensor_timestamps.clear()
+        self.camera_stats.clear_intervals()
         self.current_framerate = None
 
     def _finish_recording_reconfigure_split(self, raw_count: int, now: datetime.datetime) -> None:
@@ -404,7 +444,7 @@ class RedisListener:
         self.recording_reconfigure_pending = False
         self.recording_reconfigure_requested_at = None
         self.recording_reconfigure_grace_until = now + datetime.timedelta(seconds=1)
-        self.sensor_timestamps.clear()
+        self.camera_stats.clear_intervals()
         self.current_framerate = None
         self.last_framecount = self.framecount_segment_base + raw_count
         logging.info(
@@ -466,6 +506,9 @@ class RedisListener:
         self.recording_folder_hint_set.add(key)
         self.recording_folder_hints.append(folder)
         logging.debug("Tracking recording segment folder for final analysis: %s", folder)
+        resolved = self._resolve_folder_path(folder)
+        if resolved:
+            self.dng_index.watch(resolved)
 
     def set_frame_count_increase_tolerance(self):
         if self.framerate > 0:
@@ -556,41 +599,19 @@ class RedisListener:
 
     def _storage_preroll_active(self) -> bool:
         try:
-            value = self.redis_controller.get_value(
-                ParameterKey.STORAGE_PREROLL_ACTIVE.value
-            )
+            return self.redis_controller.get_bool(ParameterKey.STORAGE_PREROLL_ACTIVE.value)
         except Exception:
             return False
 
-        if value is None:
-            return False
-
-        text = str(value).strip().lower()
-        if text in ("1", "true", "yes", "on"):
-            return True
-
-        try:
-            return bool(int(text))
-        except (TypeError, ValueError):
-            return False
-
     def _determine_expected_fps(self) -> float | None:
         if self.fps_at_rec_start is not None and self.fps_at_rec_start > 0:
             return self.fps_at_rec_start
 
-        try:
-            value = self.redis_controller.get_value('fps')
-            return float(value) if value is not None else None
-        except (TypeError, ValueError):
-            return None
+        return self.redis_controller.get_float('fps')
 
     def _current_user_fps(self) -> float | None:
         for key in (ParameterKey.FPS_USER.value, ParameterKey.FPS.value):
-            try:
-                value = self.redis_controller.get_value(key)
-                fps = float(value) if value is not None else None
-            except (TypeError, ValueError):
-                fps = None
+            fps = self.redis_controller.get_float(key)
             if fps is not None and fps > 0:
                 return fps
         return None
@@ -846,284 +867,322 @@ class RedisListener:
     def listen_stats(self):
         for message in self.pubsub_stats.listen():
             if message['type'] == 'message':
-                message_data = message['data'].decode('utf-8').strip()
-                if message_data.startswith("{") and message_data.endswith("}"):
-                    try:
-                        now = datetime.datetime.now()
-                        stats_data = json.loads(message_data)
-                        buffer_size = self._coerce_int(stats_data.get('bufferSize', None))
-                        buffer_size_max = self._coerce_int(stats_data.get('bufferSizeMax', None))
-                        frames_in_flight = self._coerce_int(stats_data.get('framesInFlight', None))
-                        if frames_in_flight is not None:
-                            self.framesInFlight = frames_in_flight
-                        raw_frame_count = self._coerce_int(stats_data.get('frameCount', None))
-                        self.frame_count = self._logical_framecount_from_raw(raw_frame_count, now)
-                        raw_tc_frame_count = self._coerce_int(stats_data.get('tcFrameCount', None))
-                        if raw_tc_frame_count is not None:
-                            self.tc_frame_count = raw_tc_frame_count
-                        # droppedFrames: unbiased hole count from cinepi-raw.
-                        # Guard against the startup race: cinepi-raw's
-                        # resetFrameCount() is called during encoder setup, but
-                        # the first process() call can fire before the reset
-                        # completes and publish the *previous* clip's counter.
-                        # Only accept the value once awaiting_fresh_framecount
-                        # is cleared (i.e. the first valid frame count has
-                        # been seen), by which point the reset has taken effect.
-                        raw_dropped_frames = self._coerce_int(stats_data.get('droppedFrames', None))
-                        if raw_dropped_frames is not None and not self.awaiting_fresh_framecount:
-                            self.hw_dropped_frames = raw_dropped_frames
-                        # writeFailures: frames that reached the disk writer but
-                        # failed to write (open/write/close error or short write).
-                        # Unlike droppedFrames (sensor-timing holes) a write
-                        # failure has no inter-frame gap, so the timing-based drop
-                        # tiers never see it — this is the only live signal that a
-                        # storage device silently cannot keep up (e.g. NTFS under
-                        # sustained 4K). Same startup-race guard as droppedFrames.
-                        raw_write_failures = self._coerce_int(stats_data.get('writeFailures', None))
-                        if raw_write_failures is not None and not self.awaiting_fresh_framecount:
-                            self.hw_write_failures = raw_write_failures
-                        color_temp = stats_data.get('colorTemp', None)
-                        sensor_timestamp = stats_data.get('sensorTimestamp', None)
-                        timestamp = stats_data.get('timestamp')
-                        # The cp_stats channel is shared by every cinepi-raw
-                        # process (cam0 and cam1), and the payload's `timestamp`
-                        # carries no camera identity. `cameraPort` tells us which
-                        # camera published this message so its timestamp is
-                        # routed to the matching tc_cam* key. Older cinepi-raw
-                        # builds omit it; default to cam0 to preserve the
-                        # single-camera behaviour.
-                        camera_port = stats_data.get('cameraPort', 'cam0')
-                        self.current_framerate = self._coerce_float(stats_data.get('framerate', None))
-
-                        if color_temp:
-                            self.colorTemp = color_temp
-
-                        fps_user = float(
-                            self.redis_controller.get_value(ParameterKey.FPS_USER.value) or 24
-                        )
+                self.handle_stats_payload(message['data'])
 
-                        if timestamp is not None:
-                            if camera_port == 'cam1':
-                                if timestamp != self.last_timestamp_cam1:
-                                    tc1 = self.redis_controller.nanoseconds_to_timecode(int(timestamp), fps_user)
-                                    self.redis_controller.set_value(ParameterKey.TC_CAM1.value, tc1)
-                                    self.last_timestamp_cam1 = timestamp
-                            else:
-                                if timestamp != self.last_timestamp_cam0:
-                                    tc0 = self.redis_controller.nanoseconds_to_timecode(int(timestamp), fps_user)
-                                    self.redis_controller.set_value(ParameterKey.TC_CAM0.value, tc0)
-                                    self.last_timestamp_cam0 = timestamp
-
-                        # Update Redis key for current buffer size if changed.
-                        # Drive the GUI buffer VU from the peak backlog
-                        # (bufferSizeMax) cinepi-raw saw since the last stats
-                        # message, so a transient disk-write spike between two
-                        # delivered frames is visible instead of being missed by
-                        # instantaneous sampling. Falls back to bufferSize when
-                        # the running cinepi-raw build does not publish the peak.
-                        if buffer_size is not None:
-                            self.bufferSize = buffer_size
-                            display_buffer = buffer_size
-                            if buffer_size_max is not None and buffer_size_max > display_buffer:
-                                display_buffer = buffer_size_max
-                            current_buffer = self.redis_controller.get_value(ParameterKey.BUFFER.value)
-                            # Redis returns bytes or None → normalise to int or None
-                            current_buffer = self._coerce_int(current_buffer)
-
-                            if current_buffer != display_buffer:
-                                self.redis_controller.set_value(ParameterKey.BUFFER.value, display_buffer)
-                                #logging.info(f"Buffer size changed to {display_buffer}")
-
-                        # Update sensor timestamps
-                        if sensor_timestamp is not None:
-                            self.sensor_timestamps.append(int(sensor_timestamp))
-                            self.calculate_average_framerate_last_100_frames()
-                        
-                        if len(self.sensor_timestamps) > 1:
-                            self.calculate_current_framerate()
-
-                        # Update framecount in Redis (only if it has changed, and doesnt report a lower number than before, except 0
-                        self._maybe_publish_framecount(self.frame_count)
-                        self._maybe_stop_for_frame_limit()
-
-                        # Check and set buffering status if changed.
-                        # Prefer framesInFlight (covers encode_queue_ + disk_buffer_) when
-                        # the running cinepi-raw publishes it; fall back to bufferSize (disk
-                        # backlog only) for older builds.
-                        if frames_in_flight is not None:
-                            is_buffering = frames_in_flight > 0
-                        else:
-                            is_buffering = buffer_size > 0 if buffer_size is not None else False
-                        current_buffering_status = self.redis_controller.get_value('is_buffering')
-                        new_buffering_status = 1 if is_buffering else 0
-                        if current_buffering_status is None or int(current_buffering_status) != new_buffering_status:
-                            logging.debug(f"Updating is_buffering to {new_buffering_status}")
-                            self.redis_controller.set_value('is_buffering', new_buffering_status)
-
-                        if frames_in_flight is not None:
-                            buffered_write_active = frames_in_flight > 0 and not self.is_recording
-                        else:
-                            buffered_write_active = (
-                                buffer_size is not None
-                                and buffer_size > 0
-                                and not self.is_recording
-                            )
-                        current_buf_write_status = self.redis_controller.get_value(
-                            ParameterKey.IS_WRITING_BUF.value
-                        )
-                        current_buf_write_status = self._coerce_int(current_buf_write_status) or 0
-                        new_buf_write_status = 1 if buffered_write_active else 0
-                        if current_buf_write_status != new_buf_write_status:
-                            logging.info(
-                                "Buffered frame write status: %s (framesInFlight=%s buffer=%s)",
-                                "active" if new_buf_write_status else "idle",
-                                frames_in_flight,
-                                buffer_size,
-                            )
-                            self.redis_controller.set_value(
-                                ParameterKey.IS_WRITING_BUF.value,
-                                new_buf_write_status,
-                            )
-
-                        # Add current framerate value to the list
-                        if self.current_framerate is not None:
-                            self.framerate_values.append(self.current_framerate)
-                            
-                        expected_fps = self._coerce_float(self.redis_controller.get_value('fps'))
-
-                        drop_alerts_enabled = (
-                            self.is_recording
-                            and not self.awaiting_fresh_framecount
-                            and not self.recording_was_preroll
-                            and not self._storage_preroll_active()
-                            and not self._recording_reconfigure_grace_active(now)
-                            and not self.user_changing_fps
-                        )
+    def handle_stats_payload(self, payload, now: datetime.datetime | None = None) -> None:
+        """Parse one cp_stats payload and run it through the stats stages."""
+        try:
+            record = parse_stats(payload)
+            if record is None:
+                logging.warning(f"Received unexpected data format: {payload!r}")
+                return
+            self.process_stats(record, now or datetime.datetime.now())
+        except json.JSONDecodeError as e:
+            logging.error(f"Failed to parse JSON data: {e}")
+        except (TypeError, ValueError) as e:
+            logging.error(f"Type error in stats data: {e}")
+
+    def process_stats(self, record: StatsRecord, now: datetime.datetime) -> None:
+        updates: dict[str, object] = {}
+
+        camera = self._stats_counters(record, now)
+        self._stats_timecode(record, camera, updates)
+        self._stats_frame_intervals(camera, updates)
+        self._stats_buffer(updates)
+        self._stats_overflow_prediction(updates)
+
+        # Update framecount in Redis (only if it has changed, and doesnt report a lower number than before, except 0
+        self._maybe_publish_framecount(self.frame_count)
+        self._maybe_stop_for_frame_limit()
 
-                        if drop_alerts_enabled:
-                            if self.hw_dropped_frames is not None:
-                                # Tier 1 – unbiased hw counter (cinepi-raw ≥ droppedFrames build).
-                                # Each unit is exactly one frame that was not written to disk
-                                # (inter-frame gap rounded to ≥2 frame periods). No jitter bias.
-                                dropped_slots = self.hw_dropped_frames
-                                if dropped_slots > self.drop_frame_count_current_take:
-                                    new_slots = dropped_slots - self.drop_frame_count_current_take
-                                    self.drop_frame_count_current_take = dropped_slots
-                                    self.redis_controller.set_value(ParameterKey.DROP_FRAME_COUNT.value, dropped_slots)
-                                    self._pulse_drop_frame_relay(expected_fps)
-                                    if not self.drop_frame:
-                                        self.drop_frame = True
-                                        self.redis_controller.set_value(ParameterKey.DROP_FRAME.value, 1)
-                                    logging.info(
-                                        "Drop frame detected (hw): %d hole(s) (total this take: %d).",
-                                        new_slots,
-                                        dropped_slots,
-                                    )
-                                    if self.drop_frame_timer:
-                                        self.drop_frame_timer.cancel()
-                                    self.drop_frame_timer = threading.Timer(0.5, self.reset_drop_frame)
-                                    self.drop_frame_timer.start()
-
-                            elif self.tc_frame_count is not None and raw_frame_count is not None:
-                                # Tier 2 – TC-diff fallback (firmware with tcFrameCount but not
-                                # droppedFrames). The TC counter has a +1 floor bias; the deadband
-                                # absorbs single-slot jitter so ordinary timing noise does not
-                                # trigger a false drop alert.
-                                dropped_slots = max(0, self.tc_frame_count - raw_frame_count)
-                                if (
-                                    dropped_slots > self.tc_drop_jitter_tolerance_frames
-                                    and dropped_slots > self.drop_frame_count_current_take
-                                ):
-                                    new_slots = dropped_slots - self.drop_frame_count_current_take
-                                    self.drop_frame_count_current_take = dropped_slots
-                                    self.redis_controller.set_value(ParameterKey.DROP_FRAME_COUNT.value, dropped_slots)
-                                    self._pulse_drop_frame_relay(expected_fps)
-                                    if not self.drop_frame:
-                                        self.drop_frame = True
-                                        self.redis_controller.set_value(ParameterKey.DROP_FRAME.value, 1)
-                                    logging.info(
-                                        "Drop frame detected (tc-diff): %d slot(s) (total this take: %d).",
-                                        new_slots,
-                                        dropped_slots,
-                                    )
-                                    if self.drop_frame_timer:
-                                        self.drop_frame_timer.cancel()
-                                    self.drop_frame_timer = threading.Timer(0.5, self.reset_drop_frame)
-                                    self.drop_frame_timer.start()
-
-                            elif self.current_framerate is not None and expected_fps is not None:
-                                # Tier 3 – FPS-deviation fallback (oldest firmware, no TC support).
-                                if abs(self.current_framerate - expected_fps) > 1:
-                                    self.drop_frame_count_current_take += 1
-                                    self.redis_controller.set_value(ParameterKey.DROP_FRAME_COUNT.value, self.drop_frame_count_current_take)
-                                    self._pulse_drop_frame_relay(expected_fps)
-                                    if not self.drop_frame:
-                                        self.drop_frame = True
-                                        self.redis_controller.set_value(ParameterKey.DROP_FRAME.value, 1)
-                                    logging.info("Drop frame detected (fps-dev fallback, count=%d).", self.drop_frame_count_current_take)
-                                    if self.drop_frame_timer:
-                                        self.drop_frame_timer.cancel()
-                                    self.drop_frame_timer = threading.Timer(0.5, self.reset_drop_frame)
-                                    self.drop_frame_timer.start()
-
-                        # Disk-write-failure alert — independent of the timing-based
-                        # drop tiers above. A write failure means a delivered, encoded
-                        # frame never reached disk; there is no inter-frame gap, so the
-                        # drop tiers never see it. Warn live so the operator knows the
-                        # drive cannot keep up — otherwise the post-take file count is
-                        # the first and only signal that frames were lost.
-                        write_alerts_enabled = (
-                            self.is_recording
-                            and not self.awaiting_fresh_framecount
-                            and not self._storage_preroll_active()
-                        )
-                        if write_alerts_enabled and self.hw_write_failures is not None:
-                            if self.hw_write_failures > self.write_failure_count_current_take:
-                                new_failures = self.hw_write_failures - self.write_failure_count_current_take
-                                self.write_failure_count_current_take = self.hw_write_failures
-                                logging.warning(
-                                    "Disk write failure: %d frame(s) could not be written to disk "
-                                    "(total this take: %d). The drive cannot keep up — frames are "
-                                    "being lost. Use exFAT or ext4 for sustained recording.",
-                                    new_failures,
-                                    self.hw_write_failures,
-                                )
-                                if not self.drop_frame:
-                                    self.drop_frame = True
-                                    self.redis_controller.set_value(ParameterKey.DROP_FRAME.value, 1)
-                                self._pulse_drop_frame_relay(expected_fps)
-                                if self.drop_frame_timer:
-                                    self.drop_frame_timer.cancel()
-                                self.drop_frame_timer = threading.Timer(0.5, self.reset_drop_frame)
-                                self.drop_frame_timer.start()
-
-                        if self.current_framerate is not None and self.current_framerate > 0:
-                            self.framecount_check_interval = max(0.5, 2 / self.current_framerate)
-                        else:
-                            self.framecount_check_interval = max(0.5, 2 / 1)
-
-                        # Check if framecount is changing
-                        self.check_framecount_changing()
-                        self._update_live_frames_in_sync()
-                        self.last_stats_message_time = now
-                        
-                        # # Calculate average framerate of last 100 frames
-                        # avg_framerate = self.calculate_average_framerate_last_100_frames()
-
-                        # # Adjust FPS if necessary
-                        # current_time = datetime.datetime.now()
-                        # if (current_time - self.last_fps_adjustment_time).total_seconds() >= self.fps_adjustment_interval:
-                        #     self.adjust_fps(avg_framerate)
-                        #     self.last_fps_adjustment_time = current_time
-
-
-                    except json.JSONDecodeError as e:
-                        logging.error(f"Failed to parse JSON data: {e}")
-                    except (TypeError, ValueError) as e:
-                        logging.error(f"Type error in stats data: {e}")
-                else:
-                    logging.warning(f"Received unexpected data format: {message_data}")
-                    
+        self._stats_buffering_flags(updates)
+        if updates:
+            # One batched write for everything this message changed.
+            self.redis_controller.set_values(updates)
+
+        expected_fps = self.redis_controller.get_float('fps')
+
+        if self._drop_alerts_enabled(now):
+            self._stats_drop_detection(record, camera, expected_fps)
+        self._stats_write_failures(camera, expected_fps)
+
+        if self.current_framerate is not None and self.current_framerate > 0:
+            self.framecount_check_interval = max(0.5, 2 / self.current_framerate)
+        else:
+            self.framecount_check_interval = max(0.5, 2 / 1)
+
+        # Check if framecount is changing
+        self.check_framecount_changing()
+        self._update_live_frames_in_sync()
+        self.last_stats_message_time = now
+
+    # ───────────────────  cp_stats stages  ───────────────────────────────────
+    def _stats_counters(self, record: StatsRecord, now: datetime.datetime) -> CameraStatsState:
+        # droppedFrames: unbiased hole count from cinepi-raw.
+        # Guard against the startup race: cinepi-raw's
+        # resetFrameCount() is called during encoder setup, but
+        # the first process() call can fire before the reset
+        # completes and publish the *previous* clip's counter.
+        # Only accept the value once awaiting_fresh_framecount
+        # is cleared (i.e. the first valid frame count has
+        # been seen), by which point the reset has taken effect.
+        # writeFailures: frames that reached the disk writer but
+        # failed to write (open/write/close error or short write).
+        # Unlike droppedFrames (sensor-timing holes) a write
+        # failure has no inter-frame gap, so the timing-based drop
+        # tiers never see it — this is the only live signal that a
+        # storage device silently cannot keep up (e.g. NTFS under
+        # sustained 4K). Same startup-race guard as droppedFrames.
+        #
+        # The logical framecount follows the furthest camera recording this
+        # take, so interleaved cam0/cam1 messages never look like a counter
+        # reset while an idle or stopped camera's count is ignored.
+        camera = self.camera_stats.camera(record.camera_port)
+        raw_frame_count = None
+        if record.frame_count is not None:
+            camera.set_frame_count(record.frame_count)
+            raw_frame_count = self.camera_stats.frame_count
+        self.frame_count = self._logical_framecount_from_raw(raw_frame_count, now)
+        camera.update(record, not self.awaiting_fresh_framecount)
+        if record.color_temp:
+            self.colorTemp = record.color_temp
+        return camera
+
+    def _stats_timecode(self, record: StatsRecord, camera: CameraStatsState, updates: dict) -> None:
+        # The payload's `timestamp` carries no camera identity; `cameraPort`
+        # routes it to the matching tc_cam* key. Unchanged timestamps are
+        # skipped before any formatting happens.
+        timestamp = record.timestamp
+        if timestamp is None or timestamp == camera.last_timestamp:
+            return
+        camera.last_timestamp = timestamp
+        key = ParameterKey.TC_CAM1.value if camera.port == 'cam1' else ParameterKey.TC_CAM0.value
+        fps_user = self.redis_controller.get_float(ParameterKey.FPS_USER.value, 24.0)
+        tc = self.redis_controller.nanoseconds_to_timecode(timestamp, fps_user)
+        if self.redis_controller.get_value(key) != tc:
+            updates[key] = tc
+
+    def _stats_frame_intervals(self, camera: CameraStatsState, updates: dict) -> None:
+        # The sensor-timestamp window of the camera that sent this message
+        # gives current_framerate; fps_actual follows cam0 only, rounded so
+        # a steady rate does not rewrite the key on every frame.
+        fps = camera.fps
+        self.current_framerate = fps
+        if fps is None or camera.port == 'cam1':
+            return
+        fps_actual = round(fps, 3)
+        if self.redis_controller.get_float(ParameterKey.FPS_ACTUAL.value) != fps_actual:
+            updates[ParameterKey.FPS_ACTUAL.value] = fps_actual
+
+    def frame_stats_summary(self, camera_port: str | None = None) -> dict:
+        """Interval statistics for one camera, or all cameras keyed by port."""
+        if camera_port is not None:
+            return self.camera_stats.camera(camera_port).intervals.summary()
+        return self.camera_stats.summary()
+
+    def fps_history(self, seconds: int = 60, camera_port: str | None = None) -> dict:
+        """Per-second ``[time, min, mean, max]`` measured fps, per camera."""
+        now = time.time()
+        cameras = self.camera_stats.cameras
+        ports = [camera_port] if camera_port else sorted(cameras)
+        return {
+            port: [
+                [second, round(low, 3), round(mean, 3), round(high, 3)]
+                for second, low, mean, high in cameras[port].fps_history.query(seconds, now=now)
+            ]
+            for port in ports
+            if port in cameras
+        }
+
+    def publish_frame_stats(self) -> dict:
+        """Write the current per-camera summary to the frame_stats key."""
+        summary = self.frame_stats_summary()
+        self.redis_controller.set_value(
+            ParameterKey.FRAME_STATS.value, json.dumps(summary, separators=(",", ":"))
+        )
+        return summary
+
+    @property
+    def bufferSize(self) -> int:
+        return self.camera_stats.buffer_size
+
+    @property
+    def framesInFlight(self) -> int | None:
+        return self.camera_stats.frames_in_flight
+
+    @property
+    def hw_write_failures(self) -> int | None:
+        return self.camera_stats.write_failures
+
+    @property
+    def write_failure_count_current_take(self) -> int:
+        return self.camera_stats.write_failure_count
+
+    def _stats_buffer(self, updates: dict) -> None:
+        # Drive the GUI buffer VU from the peak backlog
+        # (bufferSizeMax) cinepi-raw saw since the last stats
+        # message, so a transient disk-write spike between two
+        # delivered frames is visible instead of being missed by
+        # instantaneous sampling. Falls back to bufferSize when
+        # the running cinepi-raw build does not publish the peak.
+        # With two cameras the fuller buffer is shown.
+        display_buffer = self.camera_stats.buffer_peak
+        if display_buffer is None:
+            return
+        if self.redis_controller.get_int(ParameterKey.BUFFER.value) != display_buffer:
+            updates[ParameterKey.BUFFER.value] = display_buffer
+
+    def _stats_overflow_prediction(self, updates: dict) -> None:
+        controller = self.redis_controller
+        key = ParameterKey.BUFFER_OVERFLOW_ETA.value
+        eta = None
+        if self.is_recording:
+            capacity = controller.get_int(ParameterKey.BUFFER_SIZE.value, 0)
+            level = self.camera_stats.buffer_peak
+            if capacity > 0 and level is not None:
+                inflow = controller.get_float(ParameterKey.FPS.value)
+                drain = None
+                size = frame_mib(
+                    controller.get_int(ParameterKey.WIDTH.value),
+                    controller.get_int(ParameterKey.HEIGHT.value),
+                    controller.get_int(ParameterKey.BIT_DEPTH.value),
+                )
+                write_mib_s = controller.get_float(ParameterKey.WRITE_SPEED_TO_DRIVE.value)
+                if size and write_mib_s is not None:
+                    # the drive is shared by every camera's writer
+                    drain = write_mib_s / size / max(1, len(self.camera_stats.cameras))
+                eta = self.buffer_predictor.update(
+                    level, capacity, time.monotonic(), inflow_fps=inflow, drain_fps=drain
+                )
+        value = -1 if eta is None else int(eta)
+        current = controller.get_int(key)
+        # Hysteresis (1 s or 10 %) so a jittery estimate does not rewrite
+        # the key on every frame.
+        if value < 0:
+            if current is not None and current >= 0:
+                updates[key] = value
+        elif current is None or current < 0 or abs(value - current) >= max(1, 0.1 * current):
+            if current != value:
+                updates[key] = value
+        if (
+            eta is not None
+            and eta <= self.buffer_guard_seconds
+            and not self.buffer_guard_fired
+            and not self.recording_was_preroll
+            and self.buffer_overflow_callback is not None
+        ):
+            self.buffer_guard_fired = True
+            logging.warning("RAM buffer predicted full in %.1f s; stepping down.", eta)
+            try:
+                self.buffer_overflow_callback(eta)
+            except Exception as exc:
+                logging.error("Buffer overflow callback failed: %s", exc)
+
+    def _stats_buffering_flags(self, updates: dict) -> None:
+        # Any camera with frames in flight (or, on older builds, a disk
+        # backlog) counts as buffering.
+        backlog = self.camera_stats.is_buffering
+
+        new_buffering_status = 1 if backlog else 0
+        if self.redis_controller.get_int('is_buffering') != new_buffering_status:
+            logging.debug(f"Updating is_buffering to {new_buffering_status}")
+            updates['is_buffering'] = new_buffering_status
+
+        new_buf_write_status = 1 if backlog and not self.is_recording else 0
+        if self.redis_controller.get_int(ParameterKey.IS_WRITING_BUF.value, 0) != new_buf_write_status:
+            logging.info(
+                "Buffered frame write status: %s (framesInFlight=%s buffer=%s)",
+                "active" if new_buf_write_status else "idle",
+                self.framesInFlight,
+                self.bufferSize,
+            )
+            updates[ParameterKey.IS_WRITING_BUF.value] = new_buf_write_status
+
+    def _drop_alerts_enabled(self, now: datetime.datetime) -> bool:
+        return (
+            self.is_recording
+            and not self.awaiting_fresh_framecount
+            and not self.recording_was_preroll
+            and not self._storage_preroll_active()
+            and not self._recording_reconfigure_grace_active(now)
+            and not self.user_changing_fps
+        )
+
+    def _stats_drop_detection(
+        self,
+        record: StatsRecord,
+        camera: CameraStatsState,
+        expected_fps: float | None,
+    ) -> None:
+        counted = camera.drop_count
+        drop = camera.detect_drops(
+            record.frame_count,
+            expected_fps,
+            self.tc_drop_jitter_tolerance_frames,
+        )
+        if drop is None:
+            return
+        tier, total = drop
+        camera.drop_count = total
+        # drop_frame_count_current_take counts slots per sensor, so with two
+        # cameras it follows the worse one.
+        self.drop_frame_count_current_take = self.camera_stats.drop_count
+        self.redis_controller.set_value(
+            ParameterKey.DROP_FRAME_COUNT.value, self.drop_frame_count_current_take
+        )
+        self._pulse_drop_frame_relay(expected_fps)
+        self._raise_drop_frame_flag()
+        if tier == "hw":
+            logging.info(
+                "Drop frame detected (hw, %s): %d hole(s) (total this take: %d).",
+                camera.port,
+                total - counted,
+                total,
+            )
+        elif tier == "tc-diff":
+            logging.info(
+                "Drop frame detected (tc-diff, %s): %d slot(s) (total this take: %d).",
+                camera.port,
+                total - counted,
+                total,
+            )
+        else:
+            logging.info("Drop frame detected (fps-dev fallback, %s, count=%d).", camera.port, total)
+
+    def _stats_write_failures(self, camera: CameraStatsState, expected_fps: float | None) -> None:
+        # Disk-write-failure alert — independent of the timing-based
+        # drop tiers. A write failure means a delivered, encoded
+        # frame never reached disk; there is no inter-frame gap, so the
+        # drop tiers never see it. Warn live so the operator knows the
+        # drive cannot keep up — otherwise the post-take file count is
+        # the first and only signal that frames were lost.
+        if camera.write_failures is None or camera.write_failures <= camera.write_failure_count:
+            return
+        if not (
+            self.is_recording
+            and not self.awaiting_fresh_framecount
+            and not self._storage_preroll_active()
+        ):
+            return
+        new_failures = camera.new_write_failures()
+        logging.warning(
+            "Disk write failure: %d frame(s) could not be written to disk "
+            "(total this take: %d). The drive cannot keep up — frames are "
+            "being lost. Use exFAT or ext4 for sustained recording.",
+            new_failures,
+            self.write_failure_count_current_take,
+        )
+        self._raise_drop_frame_flag()
+        self._pulse_drop_frame_relay(expected_fps)
+
+    def _raise_drop_frame_flag(self) -> None:
+        """Set the drop_frame key and (re)arm its 0.5 s reset timer."""
+        if not self.drop_frame:
+            self.drop_frame = True
+            self.redis_controller.set_value(ParameterKey.DROP_FRAME.value, 1)
+        if self.drop_frame_timer:
+            self.drop_frame_timer.cancel()
+        self.drop_frame_timer = self.timers.call_later(0.5, self.reset_drop_frame)
 
     def _pulse_drop_frame_relay(self, expected_fps: float | None) -> None:
         """Emit a short drop-frame relay pulse for REC tone interruption."""
@@ -1134,8 +1193,7 @@ class RedisListener:
 
         if self.drop_frame_relay_timer:
             self.drop_frame_relay_timer.cancel()
-        self.drop_frame_relay_timer = threading.Timer(frame_duration_s, self.reset_drop_frame_relay)
-        self.drop_frame_relay_timer.start()
+        self.drop_frame_relay_timer = self.timers.call_later(frame_duration_s, self.reset_drop_frame_relay)
 
     def reset_drop_frame_relay(self):
         self.redis_controller.set_value(ParameterKey.DROP_FRAME_RELAY.value, 0)
@@ -1168,18 +1226,12 @@ class RedisListener:
 
         if self.fps_change_timer:
             self.fps_change_timer.cancel()
-        self.fps_change_timer = threading.Timer(leeway, self._reset_user_changing_fps)
-        self.fps_change_timer.start()
+        self.fps_change_timer = self.timers.call_later(leeway, self._reset_user_changing_fps)
 
     def _storage_is_still_flushing(self) -> bool:
-        keys = (
-            ParameterKey.IS_WRITING_BUF.value,
-            ParameterKey.IS_BUFFERING.value,
-            ParameterKey.IS_WRITING.value,
-        )
-        for key in keys:
+        for key in self.FLUSH_STATE_KEYS:
             try:
-                if self._coerce_int(self.redis_controller.get_value(key)) == 1:
+                if self.redis_controller.get_int(key) == 1:
                     return True
             except Exception:
                 pass
@@ -1193,10 +1245,7 @@ class RedisListener:
 
     def _clear_frame_warning_state(self) -> None:
         self.drop_frame_count_current_take = 0
-        self.tc_frame_count = None
-        self.hw_dropped_frames = None
-        self.hw_write_failures = None
-        self.write_failure_count_current_take = 0
+        self.camera_stats.clear_take()
         self.drop_frame = False
         self.frames_off_sync_latched_current_take = False
         if self.drop_frame_timer:
@@ -1212,8 +1261,9 @@ class RedisListener:
         self.redis_controller.set_value(ParameterKey.FRAMES_IN_SYNC.value, 1)
 
     def _clear_post_recording_state(self) -> None:
+        self.dng_index.stop()
+        self.take_frame_presence = {}
         self.recording_was_preroll = False
-        self.framerate_values = []
         self.frame_limit_target_slots = None
         self.frame_limit_requested_slots = None
         self.frame_limit_anchor_time = None
@@ -1235,56 +1285,82 @@ class RedisListener:
             self.final_analysis_pending = False
             self.final_analysis_sequence = None
 
+    def _on_flush_state_changed(self, data=None) -> None:
+        self._wake_final_analysis()
+
+    def _wake_final_analysis(self) -> None:
+        with self.final_analysis_cond:
+            self.final_analysis_cond.notify_all()
+
     def _schedule_final_analysis(self) -> None:
         take_sequence = self.take_sequence
-        with self.final_analysis_lock:
+        with self.final_analysis_cond:
             self.final_analysis_pending = True
-            if (
-                self.final_analysis_thread
-                and self.final_analysis_thread.is_alive()
-                and self.final_analysis_sequence == take_sequence
-            ):
+            if self.final_analysis_sequence == take_sequence:
                 return
-
             self.final_analysis_sequence = take_sequence
-            self.final_analysis_thread = threading.Thread(
-                target=self._final_analysis_worker,
-                args=(take_sequence,),
-                name="FinalFrameAnalysis",
-                daemon=True,
-            )
-            self.final_analysis_thread.start()
+            self.final_analysis_queue.append(take_sequence)
+            if self.final_analysis_thread is None or not self.final_analysis_thread.is_alive():
+                self.final_analysis_thread = threading.Thread(
+                    target=self._final_analysis_loop,
+                    name="FinalFrameAnalysis",
+                    daemon=True,
+                )
+                self.final_analysis_thread.start()
+            self.final_analysis_cond.notify_all()
+
+    def _final_analysis_loop(self) -> None:
+        while True:
+            with self.final_analysis_cond:
+                while not self.final_analysis_queue:
+                    self.final_analysis_cond.wait()
+                take_sequence = self.final_analysis_queue.popleft()
+            try:
+                self._final_analysis_worker(take_sequence)
+            except Exception as exc:
+                logging.error("Final frame analysis failed: %s", exc)
 
-    def _final_analysis_worker(self, take_sequence: int) -> None:
-        start_wait = time.time()
+    def _wait_for_flush(self, take_sequence: int) -> bool | None:
+        """Block until the buffers drain; None if the take was superseded.
+
+        Returns True when the flush went idle, False on timeout. Called with
+        final_analysis_cond held; flag transitions notify it.
+        """
+        deadline = time.monotonic() + self.final_analysis_timeout_s
         logged_wait = False
-        flush_timed_out = False
-        while (time.time() - start_wait) < self.final_analysis_timeout_s:
+        while True:
             if take_sequence != self.take_sequence:
-                with self.final_analysis_lock:
-                    if self.final_analysis_sequence == take_sequence:
-                        self.final_analysis_pending = False
-                        self.final_analysis_sequence = None
-                return
+                return None
             if not self._storage_is_still_flushing():
-                break
+                if logged_wait:
+                    logging.info("Buffered frame write complete; running final frame-sync analysis.")
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
             if not logged_wait:
                 logging.info("Waiting for buffered frames to finish writing before frame-sync analysis.")
                 logged_wait = True
-            time.sleep(self.final_analysis_poll_s)
-        else:
+            self.final_analysis_cond.wait(min(remaining, self.final_analysis_recheck_s))
+
+    def _final_analysis_worker(self, take_sequence: int) -> None:
+        with self.final_analysis_cond:
+            flushed = self._wait_for_flush(take_sequence)
+            if flushed is None:
+                if self.final_analysis_sequence == take_sequence:
+                    self.final_analysis_pending = False
+                    self.final_analysis_sequence = None
+                return
+        if not flushed:
             logging.warning(
                 "Buffered frame flush did not go idle within %.1fs; analyzing with stable on-disk count.",
                 self.final_analysis_timeout_s,
             )
-            flush_timed_out = True
-
-        if logged_wait and not flush_timed_out:
-            logging.info("Buffered frame write complete; running final frame-sync analysis.")
 
         try:
             if take_sequence == self.take_sequence:
                 self.analyze_frames()
+                self._write_take_report()
         finally:
             if take_sequence == self.take_sequence:
                 self._clear_post_recording_state()
@@ -1353,8 +1429,7 @@ class RedisListener:
         self.framecount_segment_base = 0
         self.last_rise_time = None
         self.framecount_changing = False
-        self.bufferSize = 0
-        self.framesInFlight = None
+        self.camera_stats.reset()
         self.frames_off_sync_latched_current_take = False
         self.redis_controller.set_value('framecount', 0)
         self.active_sensor_labels.clear()
@@ -1391,9 +1466,13 @@ class RedisListener:
                     self.last_stats_message_time = None
                     self.recording_folder_hints = []
                     self.recording_folder_hint_set.clear()
+                    self._start_dng_index()
                     self.awaiting_fresh_framecount = True
                     self.fresh_framecount_guard_start_time = self.recording_start_time
                     self.drop_frame_count_current_take = 0
+                    self.camera_stats.clear_take()
+                    self.buffer_predictor.reset()
+                    self.buffer_guard_fired = False
                     self.frames_off_sync_latched_current_take = False
                     self.live_sync_suppressed_current_take = False
                     self.redis_controller.set_value(ParameterKey.DROP_FRAME_COUNT.value, 0)
@@ -1401,9 +1480,11 @@ class RedisListener:
                     self.redis_controller.set_value(ParameterKey.DROP_FRAME_DURING_LAST_TAKE.value, 0)
                     self.redis_controller.set_value(ParameterKey.IS_WRITING_BUF.value, 0)
                     self.recording_end_time = None
-                    with self.final_analysis_lock:
+                    with self.final_analysis_cond:
                         self.final_analysis_pending = False
                         self.final_analysis_sequence = None
+                        # a worker still waiting on the previous take gives up
+                        self.final_analysis_cond.notify_all()
                     logging.info(f"Recording started at: {self.recording_start_time}")
 
                     self.recording_was_preroll = self._storage_preroll_active()
@@ -1414,13 +1495,10 @@ class RedisListener:
                     self.frame_limit_stop_requested = False
 
                     # Lock the FPS at start (configured value)
-                    try:
-                        self.fps_at_rec_start = float(self.redis_controller.get_value('fps_user'))
-                    except (TypeError, ValueError):
-                        self.fps_at_rec_start = None
+                    self.fps_at_rec_start = self.redis_controller.get_float('fps_user')
                     self._reset_fps_timeline()
 
-                    self.framerate = float(self.redis_controller.get_value('fps_user'))  # keep if you still use it elsewhere
+                    self.framerate = self.redis_controller.get_float('fps_user', self.framerate)  # keep if you still use it elsewhere
                     self.allow_initial_zero = True
 
                     if self.drop_frame_timer:
@@ -1438,6 +1516,7 @@ class RedisListener:
                         if self.recording_start_time:
                             self.recording_end_time = datetime.datetime.now()
                             logging.info(f"Recording stopped at: {self.recording_end_time}")
+                            self.publish_frame_stats()
                             if (self.framesInFlight is not None and self.framesInFlight > 0) or self.bufferSize > 0:
                                 self.redis_controller.set_value(ParameterKey.IS_WRITING_BUF.value, 1)
                             if self.recording_was_preroll:
@@ -1483,26 +1562,6 @@ class RedisListener:
                 )
                 continue
 
-
-    def calculate_current_framerate(self):
-        if len(self.sensor_timestamps) > 1:
-            timestamps_in_seconds = [ts / 1_000_000 for ts in self.sensor_timestamps]
-            time_diffs = [t2 - t1 for t1, t2 in zip(timestamps_in_seconds, timestamps_in_seconds[1:])]
-            
-            if time_diffs:
-                average_time_diff = sum(time_diffs) / len(time_diffs)
-                logging.debug(f"Time differences between consecutive frames: {time_diffs}")
-                logging.debug(f"Average time difference: {average_time_diff}")
-                
-                self.current_framerate = ((1.0 / average_time_diff) * 1000) if average_time_diff != 0 else 0
-                logging.debug(f"Calculated current framerate: {self.current_framerate:.6f} FPS")
-            else:
-                logging.warning("Time differences calculation resulted in an empty list.")
-                self.current_framerate = None
-        else:
-            self.current_framerate = None
-        self.redis_controller.set_value('fps_actual', self.current_framerate)
-        
     # ------------------------ DNG enumeration helpers ------------------------
     _DNG_SUFFIX = ('.dng', '.DNG')
     _IDX_RE = re.compile(r'_(\d+)\.dng$', re.IGNORECASE)
@@ -1565,10 +1624,11 @@ class RedisListener:
 
         return None
 
-    def _scan_dngs_once(self, folder_path: str):
+    def _scan_dngs_once(self, folder_path: str, presence: FramePresenceBitmap | None = None):
         """
         Single pass: count valid DNG files and find the highest frame index.
-        Skips non-files and zero-length/in-flight files.
+        Skips non-files and zero-length/in-flight files. Frame numbers are
+        also marked in *presence* when given.
         Returns (count, last_idx:int|None, last_name:str|None, latest_mtime:float|None).
         """
         cnt = 0
@@ -1598,6 +1658,8 @@ class RedisListener:
                     m = self._IDX_RE.search(name)
                     if m:
                         idx = int(m.group(1))
+                        if presence is not None:
+                            presence.add(idx)
                         if last_idx is None or idx > last_idx:
                             last_idx = idx
                             last_name = name
@@ -1606,6 +1668,24 @@ class RedisListener:
 
         return cnt, last_idx, last_name, latest_mtime
 
+    def _start_dng_index(self) -> None:
+        root = getattr(self.ssd_monitor, "mount_path", None)
+        if root is not None and not getattr(self.ssd_monitor, "is_mounted", True):
+            root = None
+        if not self.dng_index.start(root):
+            logging.debug("DNG index unavailable; final analysis will scan clip folders.")
+
+    def _dng_count(self, folder_path: str, settle_s: float = 0.35):
+        """(count, last_idx, last_name) from the live index, else a rescan."""
+        snap = self.dng_index.snapshot(folder_path, settle_s)
+        if snap is not None:
+            frames = self.dng_index.frames(folder_path)
+            if frames is not None:
+                logging.debug("DNG index: %s", snap)
+                self.take_frame_presence[folder_path] = frames
+                return snap.count, snap.last_idx, snap.last_name
+        return self._stable_dng_count(folder_path, settle_s)
+
     def _stable_dng_count(self, folder_path: str, settle_s: float = 0.35, max_attempts: int = 4):
         """
         Repeat scans until the count is identical twice in a row AND the newest
@@ -1614,7 +1694,9 @@ class RedisListener:
         last = None
         last_latest_mtime = None
         for _ in range(max_attempts):
-            cnt, li, ln, latest_mtime = self._scan_dngs_once(folder_path)
+            presence = FramePresenceBitmap()
+            cnt, li, ln, latest_mtime = self._scan_dngs_once(folder_path, presence)
+            self.take_frame_presence[folder_path] = presence
             now = time.time()
 
             # Same count twice in a row?
@@ -1631,6 +1713,80 @@ class RedisListener:
         return last or 0, None, None
 
 
+    FRAME_HOLES_MAX_RANGES = 32     # hole ranges per clip in the Redis key
+
+    def _publish_frame_presence(self) -> None:
+        """Publish the exact missing-frame ranges of each analysed clip to
+        Redis and write the full list as a sidecar next to the DNGs."""
+        if not self.take_frame_presence:
+            return
+        summary = {}
+        for folder, bitmap in sorted(self.take_frame_presence.items()):
+            label = os.path.basename(folder)
+            clip_summary = bitmap.summary(max_ranges=self.FRAME_HOLES_MAX_RANGES)
+            summary[label] = clip_summary
+            if clip_summary["missing"]:
+                logging.info(
+                    "%s: %d frame(s) missing in %d range(s): %s%s",
+                    label,
+                    clip_summary["missing"],
+                    clip_summary["hole_ranges"],
+                    clip_summary["holes"],
+                    " …" if clip_summary["truncated"] else "",
+                )
+            if bitmap.count:
+                try:
+                    write_sidecar(folder, bitmap, clip=label)
+                except OSError as exc:
+                    logging.warning("Could not write frame-presence sidecar for %s: %s", label, exc)
+        self.redis_controller.set_value(
+            ParameterKey.FRAME_HOLES.value, json.dumps(summary, separators=(",", ":"))
+        )
+
+    TAKE_REPORTS_KEY = "take_reports"     # Redis list of take_report summaries
+    TAKE_REPORTS_KEEP = 500
+
+    def _write_take_report(self) -> None:
+        """Write take_report.json into each analysed clip folder and index it."""
+        folders = sorted(self.take_frame_presence)
+        if not folders:
+            return
+        monitor = self.ssd_monitor
+        storage = {
+            "filesystem": getattr(monitor, "filesystem_type", None),
+            "recorder_profile": getattr(monitor, "recorder_profile", None),
+            "device_type": getattr(monitor, "device_type", None),
+            "space_left_gb": getattr(monitor, "space_left_gb", None),
+        }
+        report = build_take_report(
+            clip=os.path.basename(folders[0]),
+            folders=folders,
+            started=self.recording_start_time,
+            ended=self.recording_end_time,
+            fps=self.fps_at_rec_start,
+            framecount=self.frame_count,
+            cameras=self.camera_stats.take_summary(),
+            presence=self.take_frame_presence,
+            drop_frame_count=self.drop_frame_count_current_take,
+            write_failure_count=self.write_failure_count_current_take,
+            storage=storage,
+            samples=list(getattr(monitor, "telemetry", ())),
+        )
+        paths = []
+        for folder in folders:
+            try:
+                paths.append(write_take_report(folder, report))
+            except OSError as exc:
+                logging.warning("Could not write take report to %s: %s", folder, exc)
+        entry = json.dumps(index_entry(report, paths), separators=(",", ":"))
+        self.redis_controller.set_value(ParameterKey.TAKE_REPORT.value, entry)
+        try:
+            self.redis_client.lpush(self.TAKE_REPORTS_KEY, entry)
+            self.redis_client.ltrim(self.TAKE_REPORTS_KEY, 0, self.TAKE_REPORTS_KEEP - 1)
+        except Exception as exc:
+            logging.debug("Could not index take report: %s", exc)
+        logging.info("Take report written: %s", ", ".join(paths) or "(no writable clip folder)")
+
     def analyze_frames(self):
         """
         Compare the actual number of DNGs on disk with the theoretical count.
@@ -1642,9 +1798,10 @@ class RedisListener:
             return
 
         quiet_summary = self.recording_was_preroll
+        self.take_frame_presence = {}
 
         # --------------------------- 1) collect candidate dirs -----------------
-        folders = self.ssd_monitor.get_latest_recording_infos()
+        folders = self.ssd_monitor.get_latest_recording_infos(index=self.dng_index)
         per_sensor = []   # (label, fs_count|None, monitor_count|None, last_idx|None, last_name|None)
         seen_resolved: set[str] = set()
         segmented_recording = False
@@ -1670,7 +1827,7 @@ class RedisListener:
                 last_name = None
                 if resolved:
                     seen_resolved.add(os.path.abspath(resolved))
-                    c, li, ln = self._stable_dng_count(resolved)
+                    c, li, ln = self._dng_count(resolved)
                     fs_count, last_idx, last_name = c, li, ln
                     if fs_count is None:
                         fs_count = 0
@@ -1686,7 +1843,7 @@ class RedisListener:
                 continue
             seen_resolved.add(resolved_abs)
             label = os.path.basename(resolved_abs)
-            c, li, ln = self._stable_dng_count(resolved_abs)
+            c, li, ln = self._dng_count(resolved_abs)
             per_sensor.append((label, c, None, li, ln))
 
         # If we found nothing, also try the parents of last_dng_cam0/1 directly
@@ -1699,9 +1856,11 @@ class RedisListener:
                 if not os.path.isdir(d):
                     continue
                 label = os.path.basename(d)
-                c, li, ln = self._stable_dng_count(d)
+                c, li, ln = self._dng_count(d)
                 per_sensor.append((label, c, None, li, ln))
 
+        self._publish_frame_presence()
+
         # ------------------------------ 2) totals ------------------------------
         if not per_sensor:
             if not quiet_summary:
@@ -2033,30 +2192,12 @@ class RedisListener:
         self.fps_at_rec_start = None
         self.fps_timeline = []
 
-
-    def calculate_average_framerate_last_100_frames(self):
-        if len(self.sensor_timestamps) > 1:
-            timestamps_in_seconds = [ts / 1_000_000 for ts in self.sensor_timestamps]
-            time_diffs = [t2 - t1 for t1, t2 in zip(timestamps_in_seconds, timestamps_in_seconds[1:])]
-            
-            if time_diffs:
-                average_time_diff = sum(time_diffs) / len(time_diffs)
-                average_fps = (1.0 / average_time_diff) * 1000 if average_time_diff != 0 else 0
-                #logging.info(f"Average framerate of the last 100 frames: {average_fps:.6f} FPS : fps: {self.redis_controller.get_value('fps')}")
-                
-                return average_fps
-            else:
-                logging.warning("Time differences calculation resulted in an empty list.")
-        else:
-            logging.warning("Not enough sensor timestamps to calculate average framerate.")
-        return None
-    
     def adjust_fps(self, avg_framerate):
         if avg_framerate is None:
             return
 
-        desired_fps = round(float(self.redis_controller.get_value('fps_user')))
-        current_fps = float(self.redis_controller.get_value('fps'))
+        desired_fps = round(self.redis_controller.get_float('fps_user'))
+        current_fps = self.redis_controller.get_float('fps')
         
         fps_difference = desired_fps - avg_framerate
         
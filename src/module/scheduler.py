@@ -0,0 +1,152 @@
+"""Shared monotonic timer service.
+
+Replaces one-shot ``threading.Timer`` objects (one OS thread each) with a
+single heap-ordered worker thread. ``call_later`` returns a cancellable
+``TimerHandle``; re-arming a debounce timer is a heap push, not a thread
+spawn, and ``pending()`` lists what is scheduled.
+
+Callbacks run one after another on the service thread, so they must be
+short — hand long work (joins, file I/O) to a thread of its own.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+
+class TimerHandle:
+    """One scheduled callback; ``cancel()`` is idempotent."""
+
+    __slots__ = ("when", "seq", "fn", "args", "name", "cancelled", "fired", "_service")
+
+    def __init__(self, service, when: float, seq: int, fn, args, name: str):
+        self._service = service
+        self.when = when
+        self.seq = seq
+        self.fn = fn
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.fired = False
+
+    def __lt__(self, other: "TimerHandle") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    @property
+    def active(self) -> bool:
+        """True until the callback has run or the handle was cancelled."""
+        return not (self.cancelled or self.fired)
+
+    def is_alive(self) -> bool:
+        # threading.Timer compatibility
+        return self.active
+
+    def remaining(self) -> float:
+        return max(0.0, self.when - time.monotonic()) if self.active else 0.0
+
+    def cancel(self) -> None:
+        self._service.cancel(self)
+
+
+class TimerService:
+    def __init__(self, name: str = "TimerService"):
+        self.name = name
+        self._heap: list[TimerHandle] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._cancelled = 0
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self.fired_count = 0
+
+    def call_later(self, delay: float, fn, *args, name: str | None = None) -> TimerHandle:
+        """Run ``fn(*args)`` after *delay* seconds on the service thread."""
+        when = time.monotonic() + max(0.0, float(delay))
+        handle = TimerHandle(self, when, next(self._seq), fn, args,
+                             name or getattr(fn, "__name__", repr(fn)))
+        with self._cond:
+            heapq.heappush(self._heap, handle)
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            if self._heap[0] is handle:
+                self._cond.notify()
+        return handle
+
+    def cancel(self, handle: TimerHandle | None) -> None:
+        if handle is None:
+            return
+        with self._cond:
+            if not handle.active:
+                return
+            handle.cancelled = True
+            self._cancelled += 1
+            # Lazy deletion; compact when cancelled entries dominate (a burst
+            # of re-armed debounce timers).
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [h for h in self._heap if not h.cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def pending(self) -> list[dict]:
+        """Scheduled callbacks, soonest first."""
+        now = time.monotonic()
+        with self._cond:
+            live = sorted(h for h in self._heap if h.active)
+        return [{"name": h.name, "due_in_s": round(max(0.0, h.when - now), 4)} for h in live]
+
+    def stop(self) -> None:
+        """Drop everything scheduled and end the worker thread."""
+        with self._cond:
+            for handle in self._heap:
+                handle.cancelled = True
+            self._heap = []
+            self._cancelled = 0
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    heap = self._heap
+                    while heap and heap[0].cancelled:
+                        heapq.heappop(heap)
+                        self._cancelled -= 1
+                    if not heap:
+                        self._cond.wait()
+                        continue
+                    delay = heap[0].when - time.monotonic()
+                    if delay <= 0:
+                        handle = heapq.heappop(heap)
+                        handle.fired = True
+                        break
+                    self._cond.wait(delay)
+            try:
+                handle.fn(*handle.args)
+            except Exception:
+                logging.exception("Timer callback %s failed", handle.name)
+            self.fired_count += 1
+
+
+_shared: TimerService | None = None
+_shared_lock = threading.Lock()
+
+
+def get_timer_service() -> TimerService:
+    """Process-wide TimerService used by the controller modules."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TimerService()
+        return _shared
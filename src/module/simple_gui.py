@@ -193,7 +193,10 @@ class SimpleGUI(threading.Thread):
         
         # Load sensor values from Redis upon instantiation
         self.load_sensor_values_from_redis()
-        self.redis_controller.redis_parameter_changed.subscribe(self._handle_redis_change)
+        # only flags a redraw – cheap enough to run on the emitting thread
+        self.redis_controller.redis_parameter_changed.subscribe(
+            self._handle_redis_change, synchronous=True
+        )
 
         self.start()
 
@@ -372,8 +375,8 @@ class SimpleGUI(threading.Thread):
 
     def _display_restart_allowed(self) -> bool:
         return not (
-            _to_bool(self.redis_controller.get_value(ParameterKey.IS_RECORDING.value) or 0)
-            or _to_bool(self.redis_controller.get_value(ParameterKey.IS_WRITING.value) or 0)
+            self.redis_controller.get_bool(ParameterKey.IS_RECORDING.value)
+            or self.redis_controller.get_bool(ParameterKey.IS_WRITING.value)
         )
 
     def _maybe_restart_camera_for_display_attach(self):
@@ -681,8 +684,8 @@ class SimpleGUI(threading.Thread):
         self._maybe_refresh_slow_values()
         self.load_sensor_values_from_redis()
         resolution_value = self.estimate_resolution_in_k()
-        resolution_switching = _to_bool(
-            self.redis_controller.get_value(ParameterKey.RESOLUTION_SWITCHING.value, 0)
+        resolution_switching = self.redis_controller.get_bool(
+            ParameterKey.RESOLUTION_SWITCHING.value
         )
         display_width = self.width
         display_height = self.height
@@ -763,7 +766,7 @@ class SimpleGUI(threading.Thread):
             "shutter_label":  "SHUTTER",
             "shutter_speed":  shutter_speed,
             "fps_label":      "FPS",
-            "fps":            round(float(self.redis_controller.get_value(ParameterKey.FPS_USER.value))),
+            "fps":            round(self.redis_controller.get_float(ParameterKey.FPS_USER.value)),
             "wb_label":       "WB",
             "color_temp":     f"{self.redis_controller.get_value(ParameterKey.WB_USER.value)} K",
             "color_temp_libcamera": f"/ {self.redis_listener.colorTemp}K",
@@ -801,11 +804,11 @@ class SimpleGUI(threading.Thread):
             "cam": "CAM", "raw": "RAW", "ram_label": "RAM",
             "cpu_label": "CPU", "cpu_temp_label": "TEMP",
             "media_label": "MEDIA", "mon": "MON",
-            "drop_frame_live": int(self.redis_controller.get_value(ParameterKey.DROP_FRAME.value) or 0) == 1,
-            "drop_frame_count": int(self.redis_controller.get_value(ParameterKey.DROP_FRAME_COUNT.value) or 0),
-            "drop_frame_during_last_take": int(self.redis_controller.get_value(ParameterKey.DROP_FRAME_DURING_LAST_TAKE.value) or 0) == 1,
-            "tc_hole_count": int(self.redis_controller.get_value(ParameterKey.TC_HOLE_COUNT.value) or 0),
-            "missing_frame_count": int(self.redis_controller.get_value(ParameterKey.MISSING_FRAME_COUNT.value) or 0),
+            "drop_frame_live": self.redis_controller.get_bool(ParameterKey.DROP_FRAME.value),
+            "drop_frame_count": self.redis_controller.get_int(ParameterKey.DROP_FRAME_COUNT.value, 0),
+            "drop_frame_during_last_take": self.redis_controller.get_bool(ParameterKey.DROP_FRAME_DURING_LAST_TAKE.value),
+            "tc_hole_count": self.redis_controller.get_int(ParameterKey.TC_HOLE_COUNT.value, 0),
+            "missing_frame_count": self.redis_controller.get_int(ParameterKey.MISSING_FRAME_COUNT.value, 0),
 
         }
         # drop_frame_latched drives the persistent UI warning overlay.
@@ -818,10 +821,9 @@ class SimpleGUI(threading.Thread):
             values["drop_frame_live"]             # real-time TC hole pulse (advisory)
             or values["drop_frame_during_last_take"]  # genuine missing files last take
         )
-        try:
-            values["frames_in_sync"] = int(self.redis_controller.get_value(ParameterKey.FRAMES_IN_SYNC.value) or 1) == 1
-        except (TypeError, ValueError):
-            values["frames_in_sync"] = True
+        values["frames_in_sync"] = self.redis_controller.get_bool(
+            ParameterKey.FRAMES_IN_SYNC.value, True
+        )
         values["frames_off_sync"] = not values["frames_in_sync"]
 
         # ── audio stats ─────────────────────────────────────────────────
@@ -830,14 +832,11 @@ class SimpleGUI(threading.Thread):
         # mic_wav_saved (grey post-take label) persists even if the mic was
         # unplugged after the take, as long as a valid WAV file exists.
         if self.ssd_monitor:
-            try:
-                rec_active = any([
-                    int(self.redis_controller.get_value(ParameterKey.REC.value) or 0) == 1,
-                    int(self.redis_controller.get_value(ParameterKey.IS_WRITING_BUF.value) or 0) == 1,
-                    int(self.redis_controller.get_value(ParameterKey.IS_BUFFERING.value) or 0) == 1,
-                ])
-            except (TypeError, ValueError):
-                rec_active = False
+            rec_active = (
+                self.redis_controller.get_bool(ParameterKey.REC.value)
+                or self.redis_controller.get_bool(ParameterKey.IS_WRITING_BUF.value)
+                or self.redis_controller.get_bool(ParameterKey.IS_BUFFERING.value)
+            )
 
             if values["mic_connected"] and rec_active:
                 values["mic_wav_recording"] = True
@@ -869,10 +868,7 @@ class SimpleGUI(threading.Thread):
 
         # ── Zoom factor (preview punch-in) ────────────────────────────────
         default_zoom = float(self.settings.get("preview", {}).get("default_zoom", 1.0))
-        try:
-            z = float(self.redis_controller.get_value(ParameterKey.ZOOM.value) or 1.0)
-        except (TypeError, ValueError):
-            z = 1.0
+        z = self.redis_controller.get_float(ParameterKey.ZOOM.value) or 1.0
         values["zoom_is_default"] = abs(z - default_zoom) <= 1e-3
         values["zoom_factor"] = f"{z:.1f}"
 
@@ -887,9 +883,16 @@ class SimpleGUI(threading.Thread):
             preroll_active = False
 
         # ─── recording time ───
-        raw_rt = None if preroll_active else self.redis_controller.get_value(
-            ParameterKey.RECORDING_TIME.value
+        start_ns = 0 if preroll_active else self.redis_controller.get_int(
+            ParameterKey.RECORDING_START_NS.value, 0
         )
+        if start_ns > 0:
+            # derive elapsed time locally (works in "timestamp" timer mode)
+            raw_rt = max(0.0, (time.time_ns() - start_ns) / 1e9)
+        else:
+            raw_rt = None if preroll_active else self.redis_controller.get_value(
+                ParameterKey.RECORDING_TIME.value
+            )
 
         if raw_rt is not None:
             s = str(raw_rt).strip()
@@ -953,7 +956,7 @@ class SimpleGUI(threading.Thread):
 
         # ── add right-column data when CAM1 exists ────────────────
         if sensor_right and cam1:
-            sensor_mode = int(self.redis_controller.get_value(ParameterKey.SENSOR_MODE.value) or 0)
+            sensor_mode = self.redis_controller.get_int(ParameterKey.SENSOR_MODE.value, 0)
             pk   = cam1["model"] + ("_mono" if cam1["mono"] else "")
             res1 = self.sensor_detect.get_resolution_info(pk, sensor_mode)
             w1   = res1.get("width", 1920)
@@ -1470,7 +1473,7 @@ class SimpleGUI(threading.Thread):
         base_y = self.disp_height - GAP_BOTTOM - BAR_H
         base_x = BASE_X
 
-        rec         = int(self.redis_controller.get_value(ParameterKey.REC.value) or 0)
+        rec         = self.redis_controller.get_bool(ParameterKey.REC.value)
         border_col  = (50, 50, 50) if rec else (249, 249, 249)
         back_col    = (50, 50, 50)
 
@@ -1520,7 +1523,7 @@ class SimpleGUI(threading.Thread):
         except (TypeError, ValueError):
             preroll_active = 0
 
-        drop_frame_live = int(self.redis_controller.get_value(ParameterKey.DROP_FRAME.value) or 0) == 1
+        drop_frame_live = self.redis_controller.get_bool(ParameterKey.DROP_FRAME.value)
         frames_off_sync = bool(values.get("frames_off_sync"))
         now = time.time()
         if frames_off_sync and not self._frames_off_sync_prev:
@@ -1539,17 +1542,17 @@ class SimpleGUI(threading.Thread):
             self.color_mode = "inverse"
 
         if not preroll_active and not drop_frame_live and not sync_flash_live:
-            if int(self.redis_controller.get_value(ParameterKey.IS_WRITING.value) or 0) == 1:
+            if self.redis_controller.get_bool(ParameterKey.IS_WRITING.value):
                 # at least one camera is actively writing frames to disk
                 self.current_background_color = "red"
                 self.color_mode = "inverse"
 
-            elif int(self.redis_controller.get_value(ParameterKey.IS_WRITING_BUF.value) or 0):
+            elif self.redis_controller.get_bool(ParameterKey.IS_WRITING_BUF.value):
                 # recording has stopped but buffer still flushing to disk
                 self.current_background_color = "green"
                 self.color_mode = "inverse"
 
-            elif int(self.redis_controller.get_value(ParameterKey.IS_BUFFERING.value) or 0):
+            elif self.redis_controller.get_bool(ParameterKey.IS_BUFFERING.value):
                 # cameras are building up the RAM buffer
                 self.current_background_color = "green"
                 self.color_mode = "inverse"
@@ -7,15 +7,11 @@ import smbus
 from pathlib import Path
 from typing import Optional, Tuple, List
 import datetime
-import re
+import json
 import errno
+from collections import deque
 
-try:
-    from systemd import journal            # python3-systemd package
-    _HAVE_JOURNAL = True
-except ImportError:
-    _HAVE_JOURNAL = False    # fallback will use `journalctl -f`
-
+import psutil
 
 try:
     import pyudev           # Hot-plug backend (falls back to polling)
@@ -27,6 +23,11 @@ except ImportError:
 # project-local imports
 # ----------------------------------------------------------------------
 from module.redis_controller import ParameterKey
+from module.block_io_monitor import BlockIOMonitor
+from module.clip_catalog import ClipCatalog, scan_clip
+from module.erase_engine import EraseEngine
+from module.storage_events import GONE_EVENTS, MOUNTED_EVENTS, StorageEvent, StorageEventClient
+from module.take_report import read_cpu_temp_c
 from module.storage_profiles import (
     DEFAULT_RECORDER_PROFILE,
     NO_STORAGE_FILESYSTEM,
@@ -42,6 +43,7 @@ from module.storage_profiles import (
 # ----------------------------------------------------------------------
 REDIS_KEY_IS_RECORDING = ParameterKey.IS_RECORDING.value     # "1" while cinepi-raw is running
 REDIS_KEY_FSCK_STATUS  = "FSCK_STATUS"      # "OK …"  |  "FAIL …"
+TELEMETRY_SAMPLES      = 3600               # ~1 h of space-check samples for take reports
 EXT4_MOUNT_OPTIONS = "rw,noatime,nodiratime,commit=60"
 YANK_ERRNOS = {
     errno.EIO,
@@ -112,6 +114,8 @@ class SSDMonitor:
         self._last_space  = 0.0
         self._last_space_ts = 0.0
         self._write_speed   = 0.0       # current write speed in MB/s
+        # (time, write MB/s, RAM %, CPU °C) per space check; read by the take report
+        self.telemetry: deque = deque(maxlen=TELEMETRY_SAMPLES)
         
         self._last_cfe_mount_try = 0.
         self._last_recording_log = {}
@@ -121,6 +125,22 @@ class SSDMonitor:
         # — via a misread EIO — triggers a false unmount/remount loop. Cleared
         # on unmount so a re-inserted or repaired drive is scanned fresh.
         self._unreadable_dirs: set[str] = set()
+        # Per-drive clip → DNG/WAV/frame/bytes totals, kept across boots so
+        # finding the latest recording does not walk every clip folder.
+        self.clip_catalog = ClipCatalog()
+        # Device-level write MB/s, latency and dirty-page backlog while mounted;
+        # replaces the free-space-delta write speed when the stats are readable.
+        self.block_io = BlockIOMonitor(redis_controller)
+        self._erase_engine: Optional[EraseEngine] = None
+        self._erase_lock = threading.Lock()     # guards the _erase_engine reservation
+        # Typed mount events from storage-automount; while connected they
+        # replace findmnt polling for device swaps under /media/RAW.
+        self.storage_events = StorageEventClient(self._on_storage_event)
+        self._state_lock = threading.RLock()
+        # Device storage-automount just reported gone: its lazy umount can
+        # keep /media/RAW mounted for a moment and must not be re-adopted.
+        self._released_device: Optional[str] = None
+        self.last_event_latency_ms: Optional[float] = None
 
         # next fsck schedule (run once right after boot/mount)
         self._next_fsck_ts = time.time()
@@ -136,23 +156,17 @@ class SSDMonitor:
             target=self._run, daemon=True, name="SSDMonitor"
         )
 
-        # --- watch storage-automount logs -----------------------------------
-        # self._jthread = threading.Thread(
-        #     target=self._journal_loop, daemon=True, name="SSDJournal"
-        # )
-        # self._jthread.start()
-        # logging.info("SSDMonitor journal listener started.")
-
-
         self._cfe_hat_present = self._detect_cfe_hat()
         self._init_redis_defaults()
+        self.storage_events.start()
         self._thread.start()
         logging.info("SSD monitoring thread started.")
 
     def stop(self) -> None:
         self._stop_evt.set()
         self._thread.join()
-        self._jthread.join()
+        self.block_io.stop()
+        self.storage_events.stop()
         logging.info("SSD monitoring stopped.")
 
     # ------------------------------------------------------------------
@@ -301,13 +315,24 @@ class SSDMonitor:
     # state changes
     # ------------------------------------------------------------------
     def _check_mount_status(self) -> None:
+        with self._state_lock:
+            self._sync_mount_status()
+
+    def _sync_mount_status(self) -> None:
         mounted_now = os.path.ismount(self._mount_path)
 
         if mounted_now and not self._is_mounted:
+            if self._released_device and self._get_device_name() == self._released_device:
+                return
             self._handle_mount()
         elif not mounted_now and self._is_mounted:
             self._handle_unmount()
-        elif self._is_mounted:
+        elif not mounted_now:
+            self._released_device = None
+        elif self.storage_events.connected:
+            # Device swaps arrive as promote events; no findmnt needed.
+            self._update_space_left()
+        else:
             # The storage-automount service can swap the device behind
             # /media/RAW in place (a standby promoted with `mount --move`)
             # without the mount-point ever disappearing. Detect that the
@@ -323,11 +348,43 @@ class SSDMonitor:
             else:
                 self._update_space_left()
 
-    def _handle_mount(self) -> None:
+    def _on_storage_event(self, event: StorageEvent) -> None:
+        if event.path != str(self._mount_path):
+            logging.debug("storage-automount: %s %s at %s", event.event, event.device, event.path)
+            return
+        with self._state_lock:
+            if event.event in MOUNTED_EVENTS:
+                if self._is_mounted and event.device_name == self._device_name:
+                    return                       # snapshot of a known drive
+                self._released_device = None
+                self._handle_mount(event)
+            elif event.event in GONE_EVENTS:
+                if not self._is_mounted:
+                    return
+                self._released_device = event.device_name
+                self._handle_unmount()
+            else:
+                return
+        latency = event.latency_ms()
+        if latency is not None:
+            self.last_event_latency_ms = latency
+            logging.info(
+                "RAW %s of %s reached Redis %.0f ms after the udev event",
+                event.event, event.device, latency,
+            )
+
+    def _handle_mount(self, event: Optional[StorageEvent] = None) -> None:
         self._is_mounted  = True
-        self._device_name = self._get_device_name()
-        self._device_type = self._detect_device_type()
-        self._filesystem_type = self._detect_filesystem_type()
+        if event is not None and event.device_name:
+            self._device_name = event.device_name
+            self._device_type = event.device_type or self._detect_device_type()
+        else:
+            self._device_name = self._get_device_name()
+            self._device_type = self._detect_device_type()
+        if event is not None and event.fstype:
+            self._filesystem_type = normalize_storage_filesystem(event.fstype)
+        else:
+            self._filesystem_type = self._detect_filesystem_type()
         self._mount_options = self._detect_mount_options()
         self._recorder_profile = recorder_profile_name_for_filesystem(
             self._filesystem_type
@@ -335,6 +392,8 @@ class SSDMonitor:
         self._update_space_left(force=True)
         if not self._is_mounted or self._space_left is None:
             return
+        self.clip_catalog.open(self._mount_path)
+        self.block_io.start(self._device_name)
 
         self._redis_set_many({
             ParameterKey.STORAGE_TYPE.value: self._device_type.lower(),
@@ -373,6 +432,8 @@ class SSDMonitor:
         # Forget the per-mount bad-directory cache so a re-inserted or repaired
         # drive is scanned fresh next time it mounts.
         self._unreadable_dirs.clear()
+        self.clip_catalog.close()
+        self.block_io.stop()
         # … Redis clean-up stays unchanged …
         self._redis_set_many({
             ParameterKey.STORAGE_TYPE.value: "none",
@@ -415,7 +476,27 @@ class SSDMonitor:
     # ------------------------------------------------------------------
     # helpers
     # ------------------------------------------------------------------
+    def _proc_mount_entry(self) -> Optional[Tuple[str, str, str]]:
+        """(source, fstype, options) of /media/RAW from /proc/self/mounts.
+
+        Same values findmnt reports, without forking it on every check.
+        """
+        target = str(self._mount_path)
+        entry = None
+        try:
+            with open("/proc/self/mounts") as fh:
+                for line in fh:
+                    fields = line.split()
+                    if len(fields) >= 4 and fields[1].replace("\\040", " ") == target:
+                        entry = (fields[0], fields[2], fields[3])   # last one wins
+        except OSError:
+            return None
+        return entry
+
     def _get_device_name(self) -> Optional[str]:
+        entry = self._proc_mount_entry()
+        if entry and entry[0].startswith("/dev/"):
+            return os.path.basename(entry[0])
         try:
             out = subprocess.check_output(
                 ["findmnt", "--noheadings", "--output", "SOURCE",
@@ -427,6 +508,9 @@ class SSDMonitor:
             return None
 
     def _detect_filesystem_type(self) -> str:
+        entry = self._proc_mount_entry()
+        if entry and entry[1]:
+            return normalize_storage_filesystem(entry[1])
         try:
             out = subprocess.check_output(
                 ["findmnt", "--noheadings", "--output", "FSTYPE", str(self._mount_path)],
@@ -447,6 +531,9 @@ class SSDMonitor:
         return "unknown"
 
     def _detect_mount_options(self) -> str:
+        entry = self._proc_mount_entry()
+        if entry:
+            return entry[2]
         try:
             return subprocess.check_output(
                 ["findmnt", "--noheadings", "--output", "OPTIONS", str(self._mount_path)],
@@ -743,7 +830,9 @@ class SSDMonitor:
             st = os.statvfs(self._mount_path)
             gb = (st.f_bavail * st.f_frsize) / (1024 ** 3)
 
-            if self._last_space_ts > 0:
+            if self.block_io.running:
+                self._write_speed = self.block_io.write_mib_s
+            elif self._last_space_ts > 0:
                 delta_gb = self._last_space - gb
                 delta_t = now - self._last_space_ts
                 if delta_t > 0 and delta_gb > 0:
@@ -753,12 +842,15 @@ class SSDMonitor:
             else:
                 self._write_speed = 0.0
 
-            if self._redis:
+            if self._redis and not self.block_io.running:
                 self._redis.set_value(
                     ParameterKey.WRITE_SPEED_TO_DRIVE.value,
                     f"{self._write_speed:.2f}")
 
             prev_left = self._space_left if self._space_left is not None else self._last_space
+            self.telemetry.append(
+                (now, round(self._write_speed, 2), psutil.virtual_memory().percent, read_cpu_temp_c())
+            )
 
         except OSError as exc:
             logging.error("statvfs failed: %s", exc)
@@ -915,6 +1007,21 @@ class SSDMonitor:
             logging.error("erase_drive(): cannot erase while recording is active")
             return False
 
+        # Reserve the erase before anything slow so a second request cannot
+        # slip past the check; cancel_erase() works from here on.
+        engine = EraseEngine(self._mount_path, progress=self._publish_erase_progress)
+        with self._erase_lock:
+            if self._erase_engine is not None:
+                logging.error("erase_drive(): an erase is already running")
+                return False
+            self._erase_engine = engine
+        try:
+            return self._erase_reserved(engine)
+        finally:
+            with self._erase_lock:
+                self._erase_engine = None
+
+    def _erase_reserved(self, engine: EraseEngine) -> bool:
         # Refuse while buffered frames are still flushing to disk — the DNG
         # writer has files open and rm -rf will fail with EBUSY.
         for key in ("is_writing_buf", "is_buffering"):
@@ -946,36 +1053,45 @@ class SSDMonitor:
         )
         time.sleep(0.3)
 
-        errors = []
-
-        def _rm(path: Path) -> None:
-            for attempt in range(1, 3):
-                result = subprocess.run(
-                    ["sudo", "rm", "-rf", str(path)],
-                    capture_output=True, text=True,
-                )
-                if result.returncode == 0:
-                    return
-                if attempt < 2:
-                    time.sleep(0.5)
-            errors.append(result.stderr.strip() or str(path))
-
-        threads = [threading.Thread(target=_rm, args=(p,), daemon=True) for p in items]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-
-        if errors:
-            logging.error("erase_drive(): errors: %s", "; ".join(errors))
-            self._update_space_left(force=True)
+        # Bounded in-process delete; only paths we may not remove go to a
+        # single `sudo rm -rf`.
+        try:
+            result = engine.run()
+        except OSError as exc:
+            logging.error("erase_drive(): cannot erase %s: %s", self._mount_path, exc)
             return False
 
         subprocess.call(["sync"])
-        logging.info("erase_drive(): removed all files from %s", self._mount_path)
+        self.clip_catalog.clear()
         self._update_space_left(force=True)
+        if result.cancelled:
+            logging.info(
+                "erase_drive(): cancelled after %d files (%.2f GB)",
+                result.files, result.bytes / 1e9,
+            )
+            return False
+        if result.errors:
+            logging.error("erase_drive(): errors: %s", "; ".join(result.errors[:10]))
+            return False
+        logging.info(
+            "erase_drive(): removed %d files (%.2f GB) from %s in %.1f s",
+            result.files, result.bytes / 1e9, self._mount_path, result.elapsed_s,
+        )
         return True
 
+    def cancel_erase(self) -> bool:
+        """Stop a running erase_drive(); True when one was running."""
+        with self._erase_lock:
+            engine = self._erase_engine
+        if engine is None:
+            return False
+        engine.cancel()
+        return True
+
+    def _publish_erase_progress(self, progress: dict) -> None:
+        if self._redis:
+            self._redis.set_value(ParameterKey.ERASE_PROGRESS.value, json.dumps(progress))
+
     def format_drive(self, filesystem: Optional[str] = None) -> bool:
         """Format the RAW drive with the requested filesystem."""
         if not self._is_mounted:
@@ -1155,27 +1271,32 @@ class SSDMonitor:
     # ------------------------------------------------------------------
     # recording-finder helpers (unchanged)
     # ------------------------------------------------------------------
-    def get_latest_recording_infos(self, window_seconds: int = 1
+    def get_latest_recording_infos(self, window_seconds: int = 1, index=None
                                    ) -> List[Tuple[str, int, int]]:
+        """Clip folders touched in the last *window_seconds*.
+
+        *index* is an optional :class:`module.dng_index.DngIndex`; folders it
+        has tracked are reported from it instead of being walked.
+        """
         if not self._is_mounted:
             logging.debug("RAW drive not mounted — skipping folder scan.")
             return []
         try:
-            subdirs = [p for p in self._mount_path.iterdir() if p.is_dir()]
+            with os.scandir(self._mount_path) as it:
+                stamped_subdirs = [
+                    (Path(e.path), e.stat().st_mtime_ns)
+                    for e in it if e.is_dir(follow_symlinks=False)
+                ]
         except OSError as exc:
             if not self._handle_storage_error(exc, action="scan"):
                 logging.warning("Unable to scan %s: %s", self._mount_path, exc)
             return []
-        if not subdirs:
-            return []
-        try:
-            stamped_subdirs = [(p, p.stat().st_mtime) for p in subdirs]
-        except OSError as exc:
-            if not self._handle_storage_error(exc, action="inspect recordings on"):
-                logging.warning("Unable to inspect recordings on %s: %s", self._mount_path, exc)
+        if not stamped_subdirs:
             return []
-        latest_ts = max(mtime for _, mtime in stamped_subdirs)
-        cutoff = latest_ts - window_seconds
+        catalog = self.clip_catalog
+        catalog.retain(p.name for p, _ in stamped_subdirs)
+        latest_ns = max(mtime for _, mtime in stamped_subdirs)
+        cutoff = latest_ns - int(window_seconds * 1e9)
         candidates = [(p, mtime) for p, mtime in stamped_subdirs if mtime >= cutoff]
         candidates.sort(key=lambda item: item[1])
         preroll_active = False
@@ -1189,50 +1310,41 @@ class SSDMonitor:
             except (TypeError, ValueError, AttributeError):
                 preroll_active = False
         infos = []
-        for d, _mtime in candidates:
+        for d, mtime_ns in candidates:
             if str(d) in self._unreadable_dirs:
                 # Known-bad directory from an earlier scan this mount — skip
                 # quietly instead of re-reading and re-logging it every cycle.
                 continue
-            dng = wav = 0
-            max_frame_idx = -1
-            try:
-                for f in d.rglob("*"):
-                    if not f.is_file():
-                        continue
-                    suf = f.suffix.lower()
-                    if suf == ".dng":
-                        dng += 1
-                        stem = f.stem
-                        underscore = stem.rfind("_")
-                        if underscore >= 0:
-                            try:
-                                idx = int(stem[underscore + 1:])
-                                if idx > max_frame_idx:
-                                    max_frame_idx = idx
-                            except ValueError:
-                                pass
-                    elif suf == ".wav":
-                        wav += 1
-            except OSError as exc:
-                if self._handle_storage_error(exc, action="count files on"):
-                    # Genuine storage loss (root-level failure) — stop scanning.
-                    return []
-                # Localized failure: a corrupt/unreadable clip dir, not a lost
-                # drive. Remember it, log once, and keep scanning the rest so a
-                # single bad directory doesn't hide other valid recordings.
-                if str(d) not in self._unreadable_dirs:
-                    self._unreadable_dirs.add(str(d))
-                    logging.warning(
-                        "Skipping unreadable recording directory %s: %s", d, exc
-                    )
-                continue
+            snap = index.snapshot(d, recursive=True) if index is not None else None
+            if snap is not None:
+                dng, wav = snap.count, snap.wav_count
+                max_frame_idx = snap.last_idx if snap.last_idx is not None else -1
+            else:
+                try:
+                    # Unchanged clips come from the catalog; changed or new
+                    # ones are walked once and cached.
+                    entry = catalog.get(d, mtime_ns) or scan_clip(str(d))
+                except OSError as exc:
+                    if self._handle_storage_error(exc, action="count files on"):
+                        # Genuine storage loss (root-level failure) — stop scanning.
+                        return []
+                    # Localized failure: a corrupt/unreadable clip dir, not a lost
+                    # drive. Remember it, log once, and keep scanning the rest so a
+                    # single bad directory doesn't hide other valid recordings.
+                    if str(d) not in self._unreadable_dirs:
+                        self._unreadable_dirs.add(str(d))
+                        logging.warning(
+                            "Skipping unreadable recording directory %s: %s", d, exc
+                        )
+                    continue
+                dng, wav, max_frame_idx = entry.dng, entry.wav, entry.max_idx
             last_logged = self._last_recording_log.get(d.name)
             if not preroll_active and last_logged != (dng, wav):
                 logging.info("Latest recording “%s”: %d DNG | %d WAV",
                              d.name, dng, wav)
                 self._last_recording_log[d.name] = (dng, wav)
             infos.append((str(d), dng, wav, max_frame_idx))
+        catalog.save()
         return infos
 
     def get_latest_recording_info(self) -> Tuple[Optional[str], int, int, int]:
@@ -1249,75 +1361,3 @@ class SSDMonitor:
     def get_mount_status(self) -> bool:   # just in case other code uses it
         """Old API – true if /media/RAW is currently mounted."""
         return self._is_mounted
-
-    # ---------- journal subscriber --------------------------------------
-    def _journal_loop(self) -> None:
-        """
-        Listen to storage-automount.service log lines and translate them
-        into SSDMonitor events.  Works with python-systemd if available,
-        otherwise falls back to running `journalctl -fu`.
-        """
-        def _process_line(line: str) -> None:
-            """
-            Parse one message coming from the `storage-automount.service`
-            and update our state – while forwarding every message verbatim.
-            """
-            msg = line.strip()
-
-            # ── state-changing lines we care about ───────────────────────────
-            if   "Mounted /dev"             in msg and "OK" in msg:
-                self._handle_mount()
-
-            elif "Unmounted /dev"           in msg:
-                self._handle_unmount()
-
-            elif "Insert: mount succeeded"  in msg:
-                self._handle_mount()
-
-            elif "Eject: unmount succeeded" in msg:
-                self._handle_unmount()
-
-            elif "NVMe controller" in msg and "state=dead" in msg:
-                # service already tried to lazy-unmount – reflect that instantly
-                self._handle_unmount()
-
-            # ── forward *every* message so it appears in the SSDMonitor log ──
-            #    (makes debugging easier – you see everything in one place)
-            level = "INFO"                  # sensible default
-            m = re.search(r"\] (\w+):", msg)  # ] DEBUG:, ] WARNING:, …
-            if m:
-                level = m.group(1).upper()
-
-            if level == "DEBUG":
-                logging.info("%s", msg)
-            elif level == "INFO":
-                logging.info ("%s", msg)
-            elif level == "WARNING":
-                logging.warning("%s", msg)
-            else:                            # ERROR, CRITICAL, …
-                logging.error("%s", msg)
-
-            # small optimisation: keep our cached state in sync right now
-            self._check_mount_status()
-
-
-        if _HAVE_JOURNAL:
-            j = journal.Reader()
-            j.add_match(_SYSTEMD_UNIT="storage-automount.service")
-            j.seek_tail()
-            j.get_previous()                  # position at last entry
-            j.seek_tail()
-            while not self._stop_evt.is_set():
-                if j.wait(1000) == journal.APPEND:
-                    for entry in j:
-                        _process_line(entry["MESSAGE"])
-        else:
-            # Portable fallback using journalctl -fu …
-            cmd = ["journalctl", "-fu", "storage-automount", "-n", "0", "-o", "cat"]
-            with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
-                while not self._stop_evt.is_set():
-                    line = proc.stdout.readline()
-                    if not line:              # EOF (service stopped)
-                        time.sleep(0.5)
-                        continue
-                    _process_line(line)
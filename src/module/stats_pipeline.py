@@ -0,0 +1,129 @@
+"""Parsing and drop-detection helpers for cinepi-raw ``cp_stats`` messages.
+
+``parse_stats`` turns one raw pub/sub payload into a ``StatsRecord`` with
+every field already coerced, so ``RedisListener`` never touches the JSON
+dict again. The drop-detection tiers are plain functions of the counters
+they compare, which keeps them testable without a running listener.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+
+__all__ = [
+    "StatsRecord",
+    "parse_stats",
+    "hw_drop_slots",
+    "tc_diff_drop_slots",
+    "fps_deviates",
+]
+
+
+def _as_float(value) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="ignore")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _as_int(value) -> int | None:
+    # Most counters arrive as JSON integers; keep those exact (nanosecond
+    # timestamps do not survive a round trip through float).
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    number = _as_float(value)
+    return int(number) if number is not None else None
+
+
+class StatsRecord:
+    """One decoded cp_stats message. Missing fields are ``None``."""
+
+    __slots__ = (
+        "buffer_size",
+        "buffer_size_max",
+        "frames_in_flight",
+        "frame_count",
+        "tc_frame_count",
+        "dropped_frames",
+        "write_failures",
+        "color_temp",
+        "sensor_timestamp",
+        "timestamp",
+        "camera_port",
+        "framerate",
+    )
+
+    def __init__(self, data: dict):
+        get = data.get
+        self.buffer_size = _as_int(get("bufferSize"))
+        self.buffer_size_max = _as_int(get("bufferSizeMax"))
+        self.frames_in_flight = _as_int(get("framesInFlight"))
+        self.frame_count = _as_int(get("frameCount"))
+        self.tc_frame_count = _as_int(get("tcFrameCount"))
+        self.dropped_frames = _as_int(get("droppedFrames"))
+        self.write_failures = _as_int(get("writeFailures"))
+        self.color_temp = get("colorTemp")
+        self.sensor_timestamp = _as_int(get("sensorTimestamp"))
+        self.timestamp = _as_int(get("timestamp"))
+        # cp_stats is shared by every cinepi-raw process; older builds omit
+        # cameraPort, which means the single-camera (cam0) setup.
+        self.camera_port = get("cameraPort", "cam0")
+        self.framerate = _as_float(get("framerate"))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"StatsRecord({fields})"
+
+
+def parse_stats(payload: bytes | str) -> StatsRecord | None:
+    """Decode a cp_stats payload.
+
+    Returns ``None`` when the payload is not a JSON object at all (the
+    caller logs it as an unexpected format). Malformed JSON raises
+    ``json.JSONDecodeError``; undecodable bytes raise ``ValueError``.
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.strip()
+        if payload[:1] != b"{" or payload[-1:] != b"}":
+            return None
+    else:
+        payload = payload.strip()
+        if not (payload.startswith("{") and payload.endswith("}")):
+            return None
+    return StatsRecord(json.loads(payload))
+
+
+# ── drop-detection tiers ─────────────────────────────────────────────────
+def hw_drop_slots(dropped_frames: int, counted: int) -> int:
+    """Tier 1: new holes reported by cinepi-raw's unbiased droppedFrames."""
+    return dropped_frames - counted if dropped_frames > counted else 0
+
+
+def tc_diff_drop_slots(
+    tc_frame_count: int, frame_count: int, counted: int, tolerance: float
+) -> int:
+    """Tier 2: total dropped slots from tcFrameCount - frameCount, or 0.
+
+    The TC counter has a +1 floor bias; differences within *tolerance* are
+    treated as jitter.
+    """
+    slots = max(0, tc_frame_count - frame_count)
+    if slots > tolerance and slots > counted:
+        return slots
+    return 0
+
+
+def fps_deviates(current_fps: float, expected_fps: float, threshold: float = 1.0) -> bool:
+    """Tier 3: measured rate is more than *threshold* fps off the target."""
+    return abs(current_fps - expected_fps) > threshold
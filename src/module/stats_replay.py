@@ -0,0 +1,428 @@
+"""Capture and deterministic replay of cp_stats / cp_controls traffic.
+
+    cd src
+    python3 -m module.stats_replay capture take.cpcap.gz --duration 60
+    python3 -m module.stats_replay replay take.cpcap.gz --speed 10
+    python3 -m module.stats_replay replay take.cpcap.gz --speed max
+    python3 -m module.stats_replay replay take.cpcap.gz --redis localhost:6379 --publish-only
+
+A capture is gzip-compressed JSON lines: one header object, then one
+``[t_us, "s", payload]`` (cp_stats) or ``[t_us, "c", key, value]``
+(cp_controls) array per message, *t_us* being microseconds since the first
+message. Control values are fetched with GET as the notification arrives,
+so key-only publishers (cinepi-raw) are captured as well.
+
+Replay builds a RedisController, RedisListener and Timekeeper on either an
+in-process ``MemoryRedis`` (default) or a real Redis, and publishes the
+recorded messages at 1x, Nx or maximum speed. In-process, the replay waits
+for every subscriber to go idle whenever the channel changes, so a stats
+message never overtakes the control change recorded before it.
+``--publish-only`` just feeds a Redis that a running Cinemate listens to.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import fnmatch
+import gzip
+import json
+import logging
+import threading
+import time
+
+from module.redis_controller import RedisController
+from module.redis_listener import RedisListener
+from module.timekeeper import Timekeeper
+
+STATS_CHANNEL = "cp_stats"
+CONTROLS_CHANNEL = "cp_controls"
+CAPTURE_FORMAT = "cinemate-cp-capture"
+CAPTURE_VERSION = 1
+
+
+# ── capture file ─────────────────────────────────────────────────────────────
+def _open(path, mode: str):
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_capture(path, records, *, start_ns: int | None = None, **meta) -> int:
+    """Write *records* (``(t_us, "s", payload)`` / ``(t_us, "c", key, value)``)."""
+    header = {"format": CAPTURE_FORMAT, "version": CAPTURE_VERSION,
+              "start_ns": start_ns if start_ns is not None else time.time_ns(), **meta}
+    count = 0
+    with _open(path, "w") as fh:
+        fh.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for record in records:
+            fh.write(json.dumps(list(record), separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def read_capture(path) -> tuple[dict, list[tuple]]:
+    """Return ``(header, records)``; raises ValueError on a foreign file."""
+    with _open(path, "r") as fh:
+        lines = iter(fh)
+        try:
+            header = json.loads(next(lines))
+        except StopIteration:
+            raise ValueError(f"{path}: empty capture") from None
+        if not isinstance(header, dict) or header.get("format") != CAPTURE_FORMAT:
+            raise ValueError(f"{path}: not a {CAPTURE_FORMAT} file")
+        records = [tuple(json.loads(line)) for line in lines if line.strip()]
+    return header, records
+
+
+def capture(client, path, *, duration: float | None = None, stop: threading.Event | None = None) -> int:
+    """Record cp_stats and cp_controls from *client* until *duration*/*stop*."""
+    ps = client.pubsub()
+    ps.subscribe(STATS_CHANNEL, CONTROLS_CHANNEL)
+    stop = stop or threading.Event()
+    t0 = None
+    deadline = None if duration is None else time.monotonic() + duration
+
+    def records():
+        nonlocal t0
+        try:
+            while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+                msg = ps.get_message(timeout=0.25)
+                if not msg or msg.get("type") != "message":
+                    continue
+                now = time.monotonic_ns()
+                if t0 is None:
+                    t0 = now
+                t_us = (now - t0) // 1000
+                channel = msg["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                data = msg["data"]
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8", errors="replace")
+                if channel == STATS_CHANNEL:
+                    yield (t_us, "s", data)
+                else:
+                    value = client.get(data)
+                    if value is not None:
+                        yield (t_us, "c", data, value.decode("utf-8", errors="replace"))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ps.close()
+
+    return write_capture(path, records(), channels=[STATS_CHANNEL, CONTROLS_CHANNEL])
+
+
+# ── in-process Redis ─────────────────────────────────────────────────────────
+def _as_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class MemoryPubSub:
+    def __init__(self, server: "MemoryRedis"):
+        self._server = server
+        self._queue: collections.deque = collections.deque()
+        self.channels: set[str] = set()
+        self.waiting = False
+        self.closed = False
+
+    def subscribe(self, *channels):
+        with self._server._cond:
+            self.channels.update(channels)
+            self.closed = False
+            if self not in self._server._pubsubs:
+                self._server._pubsubs.append(self)
+
+    def unsubscribe(self, *channels):
+        with self._server._cond:
+            if channels:
+                self.channels.difference_update(channels)
+            else:
+                self.channels.clear()
+
+    def close(self):
+        with self._server._cond:
+            self.closed = True
+            self._queue.clear()
+            if self in self._server._pubsubs:
+                self._server._pubsubs.remove(self)
+            self._server._cond.notify_all()
+
+    def get_message(self, timeout: float | None = 0.0):
+        cond = self._server._cond
+        with cond:
+            if not self._queue and timeout != 0 and not self.closed:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                self.waiting = True
+                cond.notify_all()                 # wakes wait_idle()
+                try:
+                    while not self._queue and not self.closed:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            break
+                        cond.wait(remaining)
+                finally:
+                    self.waiting = False
+            return self._queue.popleft() if self._queue else None
+
+    def listen(self):
+        while not self.closed:
+            msg = self.get_message(timeout=None)
+            if msg is not None:
+                yield msg
+
+    @property
+    def idle(self) -> bool:
+        return self.closed or (self.waiting and not self._queue)
+
+
+class MemoryPipeline:
+    def __init__(self, server: "MemoryRedis"):
+        self._server = server
+        self._ops: list[tuple] = []
+
+    def set(self, key, value):
+        self._ops.append(("set", key, value))
+        return self
+
+    def publish(self, channel, data):
+        self._ops.append(("publish", channel, data))
+        return self
+
+    def execute(self):
+        return [getattr(self._server, op)(*args) for op, *args in self._ops]
+
+
+class MemoryRedis:
+    """Thread-safe subset of StrictRedis used by the controller modules."""
+
+    def __init__(self, **_kwargs):
+        self._data: dict[str, bytes] = {}
+        self._lists: dict[str, list[bytes]] = {}
+        self._pubsubs: list[MemoryPubSub] = []
+        self._cond = threading.Condition()
+
+    def get(self, key):
+        return self._data.get(key.decode() if isinstance(key, bytes) else key)
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value):
+        with self._cond:
+            self._data[key] = _as_bytes(value)
+        return True
+
+    def scan_iter(self, match="*", count=None):
+        return [key.encode() for key in list(self._data) if fnmatch.fnmatchcase(key, match)]
+
+    def lpush(self, key, *values) -> int:
+        with self._cond:
+            items = self._lists.setdefault(key, [])
+            for value in values:
+                items.insert(0, _as_bytes(value))
+            return len(items)
+
+    def ltrim(self, key, start: int, end: int) -> bool:
+        with self._cond:
+            items = self._lists.get(key, [])
+            self._lists[key] = items[start:None if end == -1 else end + 1]
+        return True
+
+    def lrange(self, key, start: int, end: int) -> list:
+        items = self._lists.get(key, [])
+        return items[start:None if end == -1 else end + 1]
+
+    def publish(self, channel, data) -> int:
+        message = {"type": "message", "pattern": None,
+                   "channel": channel.encode(), "data": _as_bytes(data)}
+        with self._cond:
+            receivers = [ps for ps in self._pubsubs if channel in ps.channels]
+            for ps in receivers:
+                ps._queue.append(dict(message))
+            if receivers:
+                self._cond.notify_all()
+        return len(receivers)
+
+    def pubsub(self):
+        return MemoryPubSub(self)
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Block until every subscriber has consumed its queue and waits again."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not all(ps.idle for ps in self._pubsubs):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+
+# ── replay ───────────────────────────────────────────────────────────────────
+class _FpsSink:
+    """Stands in for CinePiController.update_fps when Timekeeper corrects."""
+
+    def __init__(self, redis_controller):
+        self.redis_controller = redis_controller
+
+    def update_fps(self, value):
+        self.redis_controller.set_value("fps", value)
+
+
+class _NoStorage:
+    """SSDMonitor stand-in: no drive, so final analysis finds no clips."""
+
+    mount_path = None
+    is_mounted = False
+
+    def get_latest_recording_infos(self, window_seconds=1, index=None):
+        return []
+
+
+class ReplayStack:
+    """RedisController + RedisListener + Timekeeper on one Redis client."""
+
+    def __init__(self, client, *, timekeeper: bool = True):
+        self.client = client
+        self.controller = RedisController(redis_client=client)
+        # RedisListener subscribes and starts its pub/sub threads itself.
+        self.listener = RedisListener(self.controller, ssd_monitor=_NoStorage(), redis_client=client)
+        self.timekeeper = Timekeeper(self.controller, _FpsSink(self.controller)) if timekeeper else None
+        if self.timekeeper:
+            self.timekeeper.start()
+
+    def settle(self, timeout: float = 5.0) -> bool:
+        """Let queued notifications and coalesced writes run to completion."""
+        wait_idle = getattr(self.client, "wait_idle", None)
+        if wait_idle is None:
+            return True
+        ok = wait_idle(timeout)
+        self.controller.flush()
+        return wait_idle(timeout) and ok
+
+    def close(self) -> None:
+        if self.timekeeper:
+            self.timekeeper.stop()
+        self.controller.stop_listener()
+        for ps in (self.listener.pubsub_stats, self.listener.pubsub_controls):
+            ps.close()
+
+
+def publish_record(client, record) -> None:
+    if record[1] == "s":
+        client.publish(STATS_CHANNEL, record[2])
+    else:
+        _, _, key, value = record
+        client.set(key, value)
+        client.publish(CONTROLS_CHANNEL, key)
+
+
+def replay(records, client, *, speed: float | None = 1.0, barrier=None) -> dict:
+    """Publish *records* into *client*; ``speed=None`` replays flat out.
+
+    *barrier* (e.g. ``ReplayStack.settle``) is called whenever the channel
+    changes and once at the end; it defaults to ``client.wait_idle`` when
+    the client is a MemoryRedis.
+    """
+    wait_idle = barrier or getattr(client, "wait_idle", None)
+    stalls = 0
+    last_channel = None
+    t0 = time.perf_counter()
+    cpu0 = time.process_time()
+    for record in records:
+        if speed:
+            delay = t0 + record[0] / 1e6 / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if wait_idle and last_channel is not None and record[1] != last_channel:
+            if not wait_idle():
+                stalls += 1
+        last_channel = record[1]
+        publish_record(client, record)
+    if wait_idle and not wait_idle():
+        stalls += 1
+    wall_s = time.perf_counter() - t0
+    cpu_s = time.process_time() - cpu0
+    n = len(records)
+    return {
+        "messages": n,
+        "stats_messages": sum(1 for r in records if r[1] == "s"),
+        "wall_s": round(wall_s, 4),
+        "cpu_s": round(cpu_s, 4),
+        "msg_per_s": round(n / wall_s, 1) if wall_s > 0 else None,
+        "cpu_us_per_msg": round(cpu_s * 1e6 / n, 2) if n else None,
+        "barrier_stalls": stalls,
+    }
+
+
+def _parse_speed(text: str) -> float | None:
+    text = text.strip().lower()
+    if text in ("max", "0", "inf"):
+        return None
+    speed = float(text.removesuffix("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be > 0 or 'max'")
+    return speed
+
+
+def _redis_client(address: str):
+    import redis
+
+    host, _, port = address.partition(":")
+    return redis.StrictRedis(host=host or "localhost", port=int(port or 6379), db=0)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    cap = sub.add_parser("capture", help="record cp_stats / cp_controls from Redis")
+    cap.add_argument("path")
+    cap.add_argument("--redis", default="localhost:6379", help="host:port")
+    cap.add_argument("--duration", type=float, help="seconds (default: until Ctrl-C)")
+
+    rep = sub.add_parser("replay", help="replay a capture")
+    rep.add_argument("path")
+    rep.add_argument("--speed", type=_parse_speed, default=1.0, help="1, 10, … or 'max'")
+    rep.add_argument("--redis", help="host:port of a real Redis (default: in-process fake)")
+    rep.add_argument("--publish-only", action="store_true",
+                     help="only publish; do not start an in-process listener stack")
+    rep.add_argument("--no-timekeeper", action="store_true")
+    rep.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.command == "capture":
+        count = capture(_redis_client(args.redis), args.path, duration=args.duration)
+        print(f"captured {count} messages → {args.path}")
+        return 0
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    header, records = read_capture(args.path)
+    client = _redis_client(args.redis) if args.redis else MemoryRedis()
+    if args.publish_only and not args.redis:
+        ap.error("--publish-only needs --redis")
+    stack = None if args.publish_only else ReplayStack(client, timekeeper=not args.no_timekeeper)
+    try:
+        result = replay(records, client, speed=args.speed, barrier=stack.settle if stack else None)
+        if stack:
+            listener = stack.listener
+            result["framecount"] = listener.frame_count
+            result["drop_frame_count"] = listener.drop_frame_count_current_take
+            result["frame_stats"] = listener.frame_stats_summary()
+    finally:
+        if stack:
+            stack.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
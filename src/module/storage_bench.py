@@ -0,0 +1,502 @@
+"""Storage benchmark that measures dynamic-resolution profile rows.
+
+Simulates cinepi-raw's DNG write pattern on a mounted path: one directory
+per clip, frames of the mode's ``file_size_mb`` (from ``sensors.json``)
+produced at a fixed fps into a RAM queue and written by the recorder
+profile's disk workers (``storage_profiles.py`` worker count and CPU
+affinity). Each file is flushed with ``fdatasync`` so a short trial
+measures the drive rather than the page cache.
+
+For every sensor mode the frame rate is ramped (doubling, then bisecting)
+until the queue backs up or frames are dropped; the highest clean rate is
+written to ``dynamic_resolution_profiles.json`` as a ``confidence:
+measured`` row, replacing an earlier row for the same sensor, resolution,
+storage type, filesystem and media model.
+
+Runs against any mounted path, e.g. a tmpfs or loop device::
+
+    python3 -m module.storage_bench /media/RAW --sensor imx477
+    python3 -m module.storage_bench /tmp/bench --sensor imx585 --mode 0 \\
+        --storage-type ssd --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from module.dynamic_resolution import DEFAULT_PROFILE_NAME, DEFAULT_PROFILES_FILE
+from module.storage_profiles import (
+    normalize_filesystem,
+    recorder_profile_for_filesystem,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SENSORS_FILE = REPO_ROOT / "resources" / "sensors.json"
+MIB = 1024 * 1024
+TRIAL_SECONDS = 5.0
+BUFFER_TOLERANCE_FRAMES = 2     # queued frames still counted as "keeping up"
+
+
+@dataclass
+class TrialResult:
+    fps: float
+    frames: int = 0
+    written: int = 0
+    dropped: int = 0
+    buffer_peak: int = 0
+    backlog: int = 0
+    write_mib_s: float = 0.0
+    latency_p95_ms: float = 0.0
+    passed: bool = False
+    latencies: list = field(default_factory=list, repr=False)
+
+
+def _norm(value) -> str:
+    return str(value or "").strip().lower()
+
+
+def parse_cpu_list(text: str | None) -> set[int] | None:
+    """``"1-2"`` / ``"0,2"`` → {1, 2}; None when empty or invalid."""
+    cpus: set[int] = set()
+    for part in str(text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+        except ValueError:
+            return None
+    return cpus or None
+
+
+def mount_info(path: str | os.PathLike, mounts_file: str = "/proc/mounts") -> dict:
+    """Device, filesystem and options of the mount holding *path*."""
+    target = os.path.realpath(path)
+    best = {"mount_point": "/", "device": "", "filesystem": "unknown", "options": ""}
+    try:
+        with open(mounts_file, "r", encoding="utf-8") as fh:
+            lines = fh.readlines()
+    except OSError:
+        return best
+    best_len = -1
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        point = fields[1].replace("\\040", " ")
+        inside = target == point or target.startswith(point.rstrip("/") + "/")
+        if inside and len(point) > best_len:
+            best_len = len(point)
+            best = {
+                "mount_point": point,
+                "device": fields[0],
+                "filesystem": normalize_filesystem(fields[2], default="unknown"),
+                "options": fields[3],
+            }
+    return best
+
+
+def media_model(device: str, sys_root: str = "/sys") -> str:
+    """Vendor/model string of the block device behind *device*."""
+    name = os.path.basename(device or "")
+    if not name:
+        return "unknown"
+    node = os.path.realpath(os.path.join(sys_root, "class", "block", name))
+    # Partitions sit one level below the disk that owns the device/ link.
+    for candidate in (node, os.path.dirname(node)):
+        parts = []
+        for attr in ("vendor", "model"):
+            try:
+                with open(os.path.join(candidate, "device", attr), "r", encoding="utf-8") as fh:
+                    value = fh.read().strip()
+            except OSError:
+                continue
+            if value:
+                parts.append(value)
+        if parts:
+            return " ".join(parts)
+    return "unknown"
+
+
+def sensor_modes(database: dict, sensor: str) -> tuple[list[dict], list[str]]:
+    """Modes and aliases of *sensor* from a loaded sensors.json."""
+    sensors = database.get("sensors", {})
+    key = _norm(sensor)
+    entry = sensors.get(key)
+    if entry is None:
+        for name, info in sensors.items():
+            if key in (_norm(a) for a in info.get("aliases", [])):
+                entry = info
+                break
+    if entry is None:
+        return [], []
+    return list(entry.get("modes", [])), list(entry.get("aliases", []))
+
+
+def _mode_file_bytes(mode: dict) -> int:
+    size_mb = mode.get("file_size_mb") or mode.get("file_size")
+    if size_mb:
+        return int(float(size_mb) * MIB)
+    bpp = (mode.get("bit_depth") or 16) / 8
+    return int(mode["width"] * mode["height"] * bpp)
+
+
+# ── trial ──────────────────────────────────────────────────────────────
+def run_trial(
+    root: str | os.PathLike,
+    *,
+    file_bytes: int,
+    fps: float,
+    duration_s: float = TRIAL_SECONDS,
+    writers: int = 2,
+    affinity: set[int] | None = None,
+    sync: bool = True,
+    buffer_frames: int | None = None,
+    tolerance_frames: int = BUFFER_TOLERANCE_FRAMES,
+    payload: bytes | None = None,
+) -> TrialResult:
+    """Produce frames at *fps* for *duration_s* and write them to a clip dir."""
+    result = TrialResult(fps=fps)
+    clip = Path(root, f"BENCH_{datetime.datetime.now():%Y%m%d_%H%M%S}_{fps:g}fps")
+    clip.mkdir(parents=True, exist_ok=True)
+    payload = payload if payload is not None and len(payload) == file_bytes else os.urandom(file_bytes)
+    frames: queue.Queue = queue.Queue()
+    lock = threading.Lock()
+    bytes_written = 0
+
+    def writer() -> None:
+        nonlocal bytes_written
+        if affinity:
+            try:
+                os.sched_setaffinity(0, affinity & os.sched_getaffinity(0) or os.sched_getaffinity(0))
+            except (AttributeError, OSError):
+                pass
+        while True:
+            idx = frames.get()
+            if idx is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                fd = os.open(clip / f"BENCH_{idx:06d}.dng", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, payload)
+                    if sync:
+                        os.fdatasync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as exc:
+                # A failed write is a lost frame, as in cinepi-raw.
+                logging.warning("storage bench: write failed: %s", exc)
+                with lock:
+                    result.dropped += 1
+                continue
+            latency = time.perf_counter() - t0
+            with lock:
+                bytes_written += file_bytes
+                result.written += 1
+                result.latencies.append(latency)
+
+    threads = [threading.Thread(target=writer, name=f"BenchWriter{i}", daemon=True) for i in range(writers)]
+    for t in threads:
+        t.start()
+    try:
+        interval = 1.0 / fps
+        total = max(1, int(round(duration_s * fps)))
+        start = time.perf_counter()
+        for idx in range(total):
+            delay = start + idx * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            depth = frames.qsize()
+            if buffer_frames is not None and depth >= buffer_frames:
+                result.dropped += 1
+                continue
+            frames.put(idx)
+            result.frames += 1
+            result.buffer_peak = max(result.buffer_peak, depth + 1)
+        result.backlog = frames.qsize()
+        for _ in threads:
+            frames.put(None)
+        for t in threads:
+            t.join(timeout=max(10.0, 4 * duration_s))
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(clip, ignore_errors=True)
+
+    # Sustained rate over the trial window (longer when a backlog had to drain).
+    result.write_mib_s = round(bytes_written / MIB / max(elapsed, duration_s), 1)
+    if result.latencies:
+        ordered = sorted(result.latencies)
+        result.latency_p95_ms = round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 2)
+    # A couple of queued frames absorb latency spikes (cinepi-raw's in-flight
+    # buffers do the same); a queue that grows or any drop means the drive fell behind.
+    result.passed = (
+        result.dropped == 0
+        and result.written == result.frames
+        and result.buffer_peak <= writers + tolerance_frames
+        and result.backlog <= tolerance_frames
+    )
+    return result
+
+
+def find_max_fps(
+    root: str | os.PathLike,
+    *,
+    file_bytes: int,
+    max_fps: float,
+    start_fps: float = 1.0,
+    duration_s: float = TRIAL_SECONDS,
+    progress=None,
+    **trial_kwargs,
+) -> tuple[int, TrialResult | None, list[TrialResult]]:
+    """Ramp fps (doubling, then bisecting) to the highest rate that keeps up."""
+    max_fps = int(max_fps)
+    trials: list[TrialResult] = []
+    payload = os.urandom(file_bytes)
+
+    def trial(fps: int) -> TrialResult | None:
+        need = file_bytes * fps * duration_s * 1.2
+        if shutil.disk_usage(root).free < need:
+            logging.warning("storage bench: not enough free space for %d fps", fps)
+            return None
+        result = run_trial(root, file_bytes=file_bytes, fps=fps, duration_s=duration_s,
+                           payload=payload, **trial_kwargs)
+        trials.append(result)
+        if progress is not None:
+            progress(result)
+        return result
+
+    best, best_result, failed = 0, None, None
+    fps = max(1, min(int(start_fps), max_fps))
+    while True:
+        result = trial(fps)
+        if result is None or not result.passed:
+            failed = fps
+            break
+        best, best_result = fps, result
+        if fps >= max_fps:
+            break
+        fps = min(max_fps, fps * 2)
+    if failed is not None:
+        lo, hi = best, failed
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            result = trial(mid)
+            if result is not None and result.passed:
+                lo, best, best_result = mid, mid, result
+            else:
+                hi = mid
+    return best, best_result, trials
+
+
+# ── profile rows ───────────────────────────────────────────────────────
+def build_row(
+    *,
+    sensor: str,
+    sensor_aliases: list[str],
+    storage_type: str,
+    filesystem: str,
+    media: str,
+    mode: dict,
+    max_fps: int,
+    result: TrialResult | None,
+    duration_s: float,
+    sensor_limited: bool,
+    mount_options: str = "",
+) -> dict:
+    today = datetime.date.today().isoformat()
+    notes = f"Measured by `bench storage` on {today}"
+    if result is not None:
+        notes += f": {result.write_mib_s} MiB/s, p95 write {result.latency_p95_ms} ms"
+    if sensor_limited:
+        notes += "; sensor-limited (drive kept up at the mode's max fps)"
+    if mount_options:
+        notes += f"; mount options {mount_options}"
+    return {
+        "sensor": _norm(sensor),
+        "sensor_aliases": list(sensor_aliases),
+        "storage_type": storage_type,
+        "filesystem": normalize_filesystem(filesystem, default="unknown"),
+        "media_model": media,
+        "width": int(mode["width"]),
+        "height": int(mode["height"]),
+        "bit_depth": mode.get("bit_depth"),
+        "max_fps_no_buffer": max_fps,
+        "test_duration_seconds": duration_s,
+        "buffer_peak_frames": result.buffer_peak if result is not None else None,
+        "drop_frames": result.dropped if result is not None else None,
+        "confidence": "measured",
+        "notes": notes + ".",
+    }
+
+
+def _row_key(row: dict) -> tuple:
+    storage = row.get("storage_type", "any")
+    return (
+        _norm(row.get("sensor")),
+        frozenset(_norm(v) for v in (storage if isinstance(storage, list) else [storage])),
+        _norm(row.get("filesystem")),
+        _norm(row.get("media_model")),
+        row.get("width"),
+        row.get("height"),
+        row.get("bit_depth"),
+    )
+
+
+def merge_rows(path: str | os.PathLike, rows: list[dict], profile: str = DEFAULT_PROFILE_NAME) -> int:
+    """Write *rows* into the profile file, replacing same-context rows.
+
+    Returns the number of rows that replaced an existing one.
+    """
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        data = {"schema_version": 1, "profiles": {}}
+    table = data.setdefault("profiles", {}).setdefault(profile, [])
+    index = {_row_key(r): i for i, r in enumerate(table) if isinstance(r, dict)}
+    replaced = 0
+    for row in rows:
+        key = _row_key(row)
+        if key in index:
+            old = table[index[key]]
+            if not row.get("sensor_aliases"):
+                row["sensor_aliases"] = old.get("sensor_aliases", [])
+            table[index[key]] = row
+            replaced += 1
+        else:
+            index[key] = len(table)
+            table.append(row)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return replaced
+
+
+def bench_modes(
+    root: str | os.PathLike,
+    *,
+    sensor: str,
+    modes: list[dict],
+    sensor_aliases: list[str] = (),
+    storage_type: str,
+    filesystem: str | None = None,
+    media: str | None = None,
+    duration_s: float = TRIAL_SECONDS,
+    sync: bool = True,
+    progress=None,
+) -> list[dict]:
+    """Benchmark each mode on *root* and return measured profile rows."""
+    info = mount_info(root)
+    filesystem = filesystem or info["filesystem"]
+    media = media or media_model(info["device"])
+    profile = recorder_profile_for_filesystem(filesystem)
+    writers = max(1, int(profile["disk_workers"]))
+    affinity = parse_cpu_list(profile["disk_affinity"])
+    bench_root = Path(root, ".cinemate_storage_bench")
+    bench_root.mkdir(parents=True, exist_ok=True)
+    rows = []
+    try:
+        for mode in modes:
+            file_bytes = _mode_file_bytes(mode)
+            max_fps = mode.get("max_fps") or mode.get("fps_max") or 120
+            logging.info(
+                "storage bench: %s %dx%d %s-bit, %.1f MiB/frame, up to %s fps, %d writers on %s",
+                sensor, mode["width"], mode["height"], mode.get("bit_depth"),
+                file_bytes / MIB, max_fps, writers, filesystem,
+            )
+            best, result, _trials = find_max_fps(
+                bench_root,
+                file_bytes=file_bytes,
+                max_fps=max_fps,
+                duration_s=duration_s,
+                writers=writers,
+                affinity=affinity,
+                sync=sync,
+                progress=progress,
+            )
+            if best <= 0:
+                logging.warning("storage bench: %dx%d could not sustain 1 fps; no row written",
+                                mode["width"], mode["height"])
+                continue
+            rows.append(build_row(
+                sensor=sensor,
+                sensor_aliases=list(sensor_aliases),
+                storage_type=storage_type,
+                filesystem=filesystem,
+                media=media,
+                mode=mode,
+                max_fps=best,
+                result=result,
+                duration_s=duration_s,
+                sensor_limited=best >= int(max_fps),
+                mount_options=info["options"],
+            ))
+    finally:
+        shutil.rmtree(bench_root, ignore_errors=True)
+    return rows
+
+
+def _log_trial(result: TrialResult) -> None:
+    logging.info(
+        "  %5g fps  %s  written %d/%d  buffer peak %d  %.1f MiB/s  p95 %.1f ms",
+        result.fps, "ok    " if result.passed else "BEHIND", result.written, result.frames,
+        result.buffer_peak, result.write_mib_s, result.latency_p95_ms,
+    )
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("path", help="mounted directory to benchmark")
+    ap.add_argument("--sensor", required=True)
+    ap.add_argument("--mode", type=int, action="append", help="sensor mode (repeatable; default: all)")
+    ap.add_argument("--storage-type", default="ssd", help="ssd | nvme | cfe")
+    ap.add_argument("--filesystem", help="override the detected filesystem")
+    ap.add_argument("--media-model", help="override the detected media model")
+    ap.add_argument("--duration", type=float, default=TRIAL_SECONDS, help="seconds per trial")
+    ap.add_argument("--sensors", default=str(DEFAULT_SENSORS_FILE))
+    ap.add_argument("--profiles", default=str(REPO_ROOT / DEFAULT_PROFILES_FILE))
+    ap.add_argument("--no-sync", action="store_true", help="skip fdatasync (measures the page cache)")
+    ap.add_argument("--dry-run", action="store_true", help="print rows instead of writing them")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    database = json.loads(Path(args.sensors).read_text(encoding="utf-8"))
+    modes, aliases = sensor_modes(database, args.sensor)
+    if args.mode:
+        modes = [m for m in modes if m.get("mode") in args.mode]
+    if not modes:
+        ap.error(f"no modes for sensor {args.sensor!r}")
+    rows = bench_modes(
+        args.path,
+        sensor=args.sensor,
+        modes=modes,
+        sensor_aliases=aliases,
+        storage_type=args.storage_type,
+        filesystem=args.filesystem,
+        media=args.media_model,
+        duration_s=args.duration,
+        sync=not args.no_sync,
+        progress=_log_trial,
+    )
+    if args.dry_run:
+        print(json.dumps(rows, indent=2))
+    else:
+        replaced = merge_rows(args.profiles, rows)
+        print(f"wrote {len(rows)} measured rows to {args.profiles} ({replaced} replaced)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
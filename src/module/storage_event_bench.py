@@ -0,0 +1,162 @@
+"""Latency from a udev event to ``is_mounted`` in Redis.
+
+Run on the Pi while cinemate is running, then plug, pull or eject the RAW
+drive a few times::
+
+    cd ~/cinemate/src && python3 -m module.storage_event_bench --count 6
+
+For every RAW mount / promote / unmount / yank event from storage-automount
+it prints how long the service took to announce it (udev → event) and how
+long until cinemate's ``is_mounted`` change arrived on the Redis value
+channel (udev → Redis). Both ends use CLOCK_MONOTONIC, which every process
+on the Pi shares.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+import redis
+
+from module.redis_controller import VALUE_CHANNEL_SUFFIX, ParameterKey
+from module.storage_events import (
+    EVENTS_SOCKET,
+    GONE_EVENTS,
+    MOUNTED_EVENTS,
+    StorageEvent,
+    StorageEventClient,
+)
+
+IS_MOUNTED_PREFIX = f"{ParameterKey.IS_MOUNTED.value}="
+
+
+@dataclass
+class LatencySample:
+    event: str
+    device: str | None
+    event_ms: float | None          # udev → event sent by storage-automount
+    redis_ms: float | None = None   # udev → is_mounted seen in Redis (None = never)
+
+
+class LatencyTracker:
+    """Pairs RAW mount events with the ``is_mounted`` change they cause."""
+
+    def __init__(self, mount_path: str = "/media/RAW", *, timeout_s: float = 10.0):
+        self.mount_path = mount_path
+        self.timeout_s = timeout_s
+        self.pending: list[tuple[StorageEvent, str]] = []
+        self.samples: list[LatencySample] = []
+
+    def on_event(self, event: StorageEvent) -> None:
+        if event.path != self.mount_path or event.udev_ts is None:
+            return
+        if event.event in MOUNTED_EVENTS:
+            self.pending.append((event, "1"))
+        elif event.event in GONE_EVENTS:
+            self.pending.append((event, "0"))
+
+    def on_is_mounted(self, value: str, now: float) -> None:
+        # Oldest pending event expecting this value; anything queued before
+        # it was superseded without a visible change.
+        for i, (event, expected) in enumerate(self.pending):
+            if expected == value:
+                for skipped, _ in self.pending[:i]:
+                    self._record(skipped, None)
+                self._record(event, now)
+                del self.pending[:i + 1]
+                return
+
+    def expire(self, now: float) -> None:
+        while self.pending and now - self.pending[0][0].udev_ts > self.timeout_s:
+            self._record(self.pending.pop(0)[0], None)
+
+    def _record(self, event: StorageEvent, seen: float | None) -> None:
+        event_ms = (event.ts - event.udev_ts) * 1000.0 if event.ts is not None else None
+        redis_ms = event.latency_ms(seen) if seen is not None else None
+        self.samples.append(LatencySample(event.event, event.device, event_ms, redis_ms))
+
+
+def summarize(values: list[float]) -> dict | None:
+    """count / median / p95 / max of *values* in ms, or None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return {
+        "count": len(ordered),
+        "median": round(statistics.median(ordered), 1),
+        "p95": round(p95, 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def _fmt(value: float | None) -> str:
+    return f"{value:8.1f} ms" if value is not None else "       –   "
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m module.storage_event_bench",
+        description="Measure udev → storage event → Redis is_mounted latency for the RAW drive.",
+    )
+    parser.add_argument("--count", type=int, default=6, help="events to measure (default 6)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="seconds to wait for is_mounted after an event (default 10)")
+    parser.add_argument("--socket", default=EVENTS_SOCKET, help="storage-automount event socket")
+    parser.add_argument("--mount-path", default="/media/RAW")
+    parser.add_argument("--channel", default="cp_controls", help="cinemate Redis channel")
+    args = parser.parse_args(argv)
+
+    tracker = LatencyTracker(args.mount_path, timeout_s=args.timeout)
+    lock = threading.Lock()
+
+    def _on_event(event: StorageEvent) -> None:
+        with lock:
+            tracker.on_event(event)
+
+    client = StorageEventClient(_on_event, path=args.socket)
+    pubsub = redis.StrictRedis(host="localhost", port=6379, db=0).pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(f"{args.channel}{VALUE_CHANNEL_SUFFIX}")
+    client.start()
+    print(f"Waiting for {args.count} RAW event(s) on {args.socket}; "
+          f"plug, pull or eject the drive at {args.mount_path} (Ctrl-C to stop).")
+    printed = 0
+    try:
+        while printed < args.count:
+            message = pubsub.get_message(timeout=0.2)
+            now = time.monotonic()
+            with lock:
+                if message and message.get("type") == "message":
+                    data = message["data"]
+                    text = data.decode() if isinstance(data, bytes) else str(data)
+                    if text.startswith(IS_MOUNTED_PREFIX):
+                        tracker.on_is_mounted(text[len(IS_MOUNTED_PREFIX):], now)
+                tracker.expire(now)
+                fresh = tracker.samples[printed:]
+            for sample in fresh:
+                print(f"{sample.event:8s} {sample.device or '?':16s} "
+                      f"udev→event {_fmt(sample.event_ms)}   udev→redis {_fmt(sample.redis_ms)}")
+            printed += len(fresh)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.stop()
+        pubsub.close()
+
+    for label, attr in (("udev→event", "event_ms"), ("udev→redis", "redis_ms")):
+        stats = summarize([getattr(s, attr) for s in tracker.samples if getattr(s, attr) is not None])
+        if stats:
+            print(f"{label}: n={stats['count']} median {stats['median']} ms, "
+                  f"p95 {stats['p95']} ms, max {stats['max']} ms")
+    missed = sum(1 for s in tracker.samples if s.redis_ms is None)
+    if missed:
+        print(f"{missed} event(s) never changed is_mounted within {args.timeout:g} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""Mount events from the storage-automount service.
+
+storage-automount publishes one JSON object per line on a Unix socket for
+every mount state change it makes::
+
+    {"event": "promote", "device": "/dev/sda1", "path": "/media/RAW",
+     "fstype": "ext4", "kind": "usb_ssd", "udev_ts": 812.31, "ts": 812.47}
+
+``event`` is one of ``mount``, ``standby``, ``promote``, ``unmount`` or
+``yank``. ``udev_ts`` / ``ts`` are CLOCK_MONOTONIC seconds (shared by every
+process on the Pi) for when the triggering udev / watchdog / button event
+was seen and when the event was sent; ``udev_ts`` is null for the state
+snapshot sent right after connecting.
+
+:class:`StorageEventClient` keeps a connection open on its own thread and
+reconnects when the service restarts, so SSDMonitor learns about a new or
+vanished RAW drive without tailing the journal or forking findmnt/blkid.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+EVENTS_SOCKET = os.getenv("STORAGE_AUTOMOUNT_EVENTS", "/run/storage-automount/events.sock")
+
+MOUNTED_EVENTS = ("mount", "promote")
+GONE_EVENTS = ("unmount", "yank")
+
+# storage-automount media kind → SSDMonitor device type. "nvme_hat" is left
+# out: the service cannot tell an NVMe HAT from a CFE card, SSDMonitor can.
+_DEVICE_TYPES = {
+    "cfe_nvme": "CFE",
+    "usb_nvme": "SSD",
+    "usb_ssd": "SSD",
+}
+
+
+@dataclass
+class StorageEvent:
+    event: str
+    device: str | None = None
+    path: str | None = None
+    fstype: str | None = None
+    kind: str | None = None
+    udev_ts: float | None = None
+    ts: float | None = None
+
+    @classmethod
+    def from_json(cls, line: str | bytes) -> "StorageEvent | None":
+        try:
+            data = json.loads(line)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("event"), str):
+            return None
+        return cls(
+            event=data["event"],
+            device=data.get("device"),
+            path=data.get("path"),
+            fstype=data.get("fstype"),
+            kind=data.get("kind"),
+            udev_ts=data.get("udev_ts"),
+            ts=data.get("ts"),
+        )
+
+    @property
+    def device_name(self) -> str | None:
+        """``sda1`` for ``/dev/sda1``."""
+        return os.path.basename(self.device) if self.device else None
+
+    @property
+    def device_type(self) -> str | None:
+        """SSDMonitor device type, or None when it has to be probed."""
+        return _DEVICE_TYPES.get(self.kind or "")
+
+    def latency_ms(self, now: float | None = None) -> float | None:
+        """Milliseconds from the triggering event until *now*."""
+        if self.udev_ts is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return (now - self.udev_ts) * 1000.0
+
+
+class StorageEventClient:
+    """Reads events from storage-automount and hands them to *on_event*."""
+
+    def __init__(self, on_event, *, path: str = EVENTS_SOCKET, reconnect_s: float = 2.0):
+        self.on_event = on_event
+        self.path = path
+        self.reconnect_s = reconnect_s
+        self._sock: socket.socket | None = None
+        self._stop_evt = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.connected = False
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_evt.clear()
+        self._thread = threading.Thread(target=self._run, name="StorageEvents", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_evt.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.reconnect_s + 1.0)
+
+    def _run(self) -> None:
+        logged_missing = False
+        while not self._stop_evt.is_set():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError as exc:
+                sock.close()
+                if not logged_missing:
+                    logging.info("Storage event channel %s unavailable (%s); polling mount state.",
+                                 self.path, exc.strerror or exc)
+                    logged_missing = True
+                self._stop_evt.wait(self.reconnect_s)
+                continue
+            logged_missing = False
+            self._sock = sock
+            self.connected = True
+            logging.info("Connected to storage event channel %s", self.path)
+            try:
+                self._read(sock)
+            except OSError as exc:
+                logging.debug("Storage event channel read failed: %s", exc)
+            finally:
+                self.connected = False
+                self._sock = None
+                sock.close()
+            if not self._stop_evt.is_set():
+                logging.info("Storage event channel closed; reconnecting.")
+                self._stop_evt.wait(self.reconnect_s)
+
+    def _read(self, sock: socket.socket) -> None:
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                if self._stop_evt.is_set():
+                    return
+                event = StorageEvent.from_json(line)
+                if event is None:
+                    logging.debug("Ignoring malformed storage event: %r", line[:200])
+                    continue
+                try:
+                    self.on_event(event)
+                except Exception as exc:
+                    logging.exception("Storage event handler failed: %s", exc)
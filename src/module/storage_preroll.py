@@ -291,13 +291,7 @@ class StoragePreroll:
     # redis helpers
     # ------------------------------------------------------------------
     def _get_float(self, key: str) -> Optional[float]:
-        try:
-            value = self.redis_controller.get_value(key)
-            if value is None:
-                return None
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+        return self.redis_controller.get_float(key)
 
     def _wait_for_value(
         self, key: str, expected: str, timeout: float, poll: float = 0.1
@@ -320,12 +314,7 @@ class StoragePreroll:
         if not camera_name:
             camera_name = self.sensor_detect.camera_model
 
-        try:
-            sensor_mode = int(
-                self.redis_controller.get_value(ParameterKey.SENSOR_MODE.value) or 0
-            )
-        except (TypeError, ValueError):
-            sensor_mode = 0
+        sensor_mode = self.redis_controller.get_int(ParameterKey.SENSOR_MODE.value, 0)
 
         if not camera_name:
             return None
@@ -0,0 +1,120 @@
+"""Per-take performance report.
+
+At the end of a take RedisListener assembles what it and SSDMonitor saw
+during the take — inter-frame interval histogram, buffer and in-flight
+peaks, hw drop / write-failure counters, missing-frame ranges, the drive
+write-speed curve, RAM and CPU temperature samples and the storage profile
+— into ``take_report.json`` next to the DNGs. The per-frame cost is a few
+counter updates in CameraStatsState; the telemetry samples are appended to
+SSDMonitor's ring at its space-check interval.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+
+REPORT_NAME = "take_report.json"
+REPORT_VERSION = 1
+CPU_TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp"
+
+
+def read_cpu_temp_c(path: str = CPU_TEMP_PATH) -> float | None:
+    """SoC temperature in °C from sysfs, None where unavailable."""
+    try:
+        with open(path, "r", encoding="ascii") as fh:
+            return round(int(fh.read().strip()) / 1000.0, 1)
+    except (OSError, ValueError):
+        return None
+
+
+def _series(samples, index: int, start: float) -> tuple[list, float | None]:
+    points = [[round(s[0] - start, 1), s[index]] for s in samples if s[index] is not None]
+    peak = max((p[1] for p in points), default=None)
+    return points, peak
+
+
+def build_take_report(
+    *,
+    clip: str,
+    folders: list[str],
+    started: datetime.datetime | None,
+    ended: datetime.datetime | None,
+    fps: float | None,
+    framecount: int | None,
+    cameras: dict,
+    presence: dict,
+    drop_frame_count: int,
+    write_failure_count: int,
+    storage: dict,
+    samples,
+) -> dict:
+    """Assemble the report dict.
+
+    *cameras* is ``CameraStatsAggregator.take_summary()``, *presence* maps
+    clip folder → FramePresenceBitmap and *samples* holds SSDMonitor
+    telemetry tuples ``(time, write_mb_s, ram_percent, cpu_temp_c)``.
+    """
+    start_ts = started.timestamp() if started else 0.0
+    samples = [s for s in samples if s[0] >= start_ts] if started else list(samples)
+    write_speed, write_peak = _series(samples, 1, start_ts)
+    ram, ram_peak = _series(samples, 2, start_ts)
+    temp, temp_peak = _series(samples, 3, start_ts)
+    return {
+        "version": REPORT_VERSION,
+        "clip": clip,
+        "folders": [os.path.basename(f) for f in folders],
+        "started": started.isoformat() if started else None,
+        "ended": ended.isoformat() if ended else None,
+        "duration_s": round((ended - started).total_seconds(), 3) if started and ended else None,
+        "fps": fps,
+        "framecount": framecount,
+        "drop_frame_count": drop_frame_count,
+        "write_failure_count": write_failure_count,
+        "cameras": cameras,
+        "holes": {
+            os.path.basename(folder): bitmap.summary()
+            for folder, bitmap in sorted(presence.items())
+        },
+        "storage": {
+            **storage,
+            "write_speed_mb_s": write_speed,
+            "write_speed_peak_mb_s": write_peak,
+        },
+        "system": {
+            "ram_percent": ram,
+            "ram_percent_peak": ram_peak,
+            "cpu_temp_c": temp,
+            "cpu_temp_c_peak": temp_peak,
+        },
+    }
+
+
+def write_take_report(folder: str | os.PathLike, report: dict) -> str:
+    path = os.path.join(os.fspath(folder), REPORT_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def index_entry(report: dict, paths: list[str]) -> dict:
+    """Compact summary stored in Redis for cross-take queries."""
+    cameras = report.get("cameras") or {}
+    return {
+        "clip": report.get("clip"),
+        "started": report.get("started"),
+        "duration_s": report.get("duration_s"),
+        "framecount": report.get("framecount"),
+        "drop_frame_count": report.get("drop_frame_count"),
+        "write_failure_count": report.get("write_failure_count"),
+        "missing_frames": sum(h.get("missing", 0) for h in report.get("holes", {}).values()),
+        "buffer_size_max_peak": max(
+            (c.get("buffer_size_max_peak") or 0 for c in cameras.values()), default=None
+        ),
+        "write_speed_peak_mb_s": report["storage"].get("write_speed_peak_mb_s"),
+        "recorder_profile": report["storage"].get("recorder_profile"),
+        "paths": paths,
+    }
@@ -0,0 +1,148 @@
+"""SMPTE time-code formatting for CinePi.
+
+Integer frame arithmetic with pre-built "00".."99" tables and a cached
+local-midnight offset, so formatting a time-of-day code costs no
+``time.localtime`` call and no float rounding per frame.
+
+Rates of 29.97 and 59.94 fps use drop-frame labels (``hh:mm:ss;ff``); every
+other rate is counted at its nominal integer rate (23.976 → 24), which
+keeps the code aligned with wall-clock time like the previous formatter.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+
+NS_PER_SECOND = 1_000_000_000
+SECONDS_PER_DAY = 86_400
+NS_PER_DAY = SECONDS_PER_DAY * NS_PER_SECOND
+
+_PAIRS = tuple(f"{i:02d}" for i in range(100))
+_DROP_FRAMES = {30: 2, 60: 4}      # labels skipped per minute (except every 10th)
+
+
+def is_drop_frame_rate(frame_rate: float) -> bool:
+    """True for the NTSC rates that use drop-frame labels (29.97, 59.94)."""
+    nominal = int(round(frame_rate))
+    return nominal in _DROP_FRAMES and abs(frame_rate - nominal * 1000 / 1001) < 0.005
+
+
+class TimecodeFormatter:
+    """Convert frame counts, seconds or nanoseconds to SMPTE time-code."""
+
+    __slots__ = (
+        "frame_rate", "nominal", "drop_frame", "separator", "frames_per_day",
+        "_num", "_den", "_drop", "_frames_per_min", "_frames_per_10min",
+    )
+
+    def __init__(self, frame_rate: float, drop_frame: bool | None = None):
+        if frame_rate <= 0:
+            raise ValueError(f"frame rate must be positive, got {frame_rate!r}")
+        self.frame_rate = float(frame_rate)
+        self.nominal = max(1, int(round(frame_rate)))
+        if drop_frame is None:
+            drop_frame = is_drop_frame_rate(frame_rate)
+        if drop_frame and self.nominal not in _DROP_FRAMES:
+            raise ValueError(f"drop-frame is only defined for 29.97/59.94, got {frame_rate!r}")
+        self.drop_frame = bool(drop_frame)
+        self.separator = ";" if self.drop_frame else ":"
+
+        if self.drop_frame:
+            # real rate nominal*1000/1001 → frames = ns * num // den
+            self._num = self.nominal * 1000
+            self._den = 1001 * NS_PER_SECOND
+            self._drop = _DROP_FRAMES[self.nominal]
+            self._frames_per_min = self.nominal * 60 - self._drop
+            self._frames_per_10min = self.nominal * 600 - self._drop * 9
+            self.frames_per_day = self._frames_per_10min * 6 * 24
+        else:
+            self._num = self.nominal
+            self._den = NS_PER_SECOND
+            self._drop = 0
+            self._frames_per_min = self.nominal * 60
+            self._frames_per_10min = self.nominal * 600
+            self.frames_per_day = self.nominal * SECONDS_PER_DAY
+
+    # ------------------------------------------------------------------
+    def ns_to_frames(self, ns: int) -> int:
+        """Nearest whole frame for a duration in nanoseconds."""
+        return (ns * self._num + self._den // 2) // self._den
+
+    def frames_to_timecode(self, frames: int) -> str:
+        """Label for a frame count; hours are not wrapped (elapsed time)."""
+        frames = int(frames)
+        if frames < 0:
+            frames = 0
+        if self.drop_frame:
+            drop = self._drop
+            tens, rem = divmod(frames, self._frames_per_10min)
+            frames += drop * 9 * tens
+            if rem > drop:
+                frames += drop * ((rem - drop) // self._frames_per_min)
+
+        nominal = self.nominal
+        seconds, ff = divmod(frames, nominal)
+        minutes, ss = divmod(seconds, 60)
+        hours, mm = divmod(minutes, 60)
+        pairs = _PAIRS
+        hh = pairs[hours] if hours < 100 else str(hours)
+        return f"{hh}:{pairs[mm]}:{pairs[ss]}{self.separator}{pairs[ff]}"
+
+    def seconds_to_timecode(self, seconds: float) -> str:
+        return self.frames_to_timecode(self.ns_to_frames(int(round(seconds * NS_PER_SECOND))))
+
+    def ns_to_timecode(self, ns: int) -> str:
+        return self.frames_to_timecode(self.ns_to_frames(int(ns)))
+
+    def time_of_day_timecode(self, ns_since_midnight: int) -> str:
+        """Like ns_to_timecode but wraps at 24 h so hours run 00…23."""
+        return self.frames_to_timecode(
+            self.ns_to_frames(int(ns_since_midnight)) % self.frames_per_day
+        )
+
+
+@lru_cache(maxsize=32)
+def _formatter(rate_key: float, drop_frame: bool | None) -> TimecodeFormatter:
+    return TimecodeFormatter(rate_key, drop_frame)
+
+
+def formatter_for(frame_rate: float, drop_frame: bool | None = None) -> TimecodeFormatter:
+    """Shared formatter for *frame_rate* (cached per rate)."""
+    return _formatter(round(float(frame_rate), 3), drop_frame)
+
+
+class TimeOfDayClock:
+    """Map epoch nanoseconds to nanoseconds since local midnight.
+
+    The local-midnight epoch is computed with one ``time.localtime`` call and
+    reused until the timestamp leaves that day or *revalidate_s* has passed
+    (which picks up DST and time-zone changes).
+    """
+
+    def __init__(self, revalidate_s: float = 60.0):
+        self.revalidate_ns = int(revalidate_s * NS_PER_SECOND)
+        # (valid_from_ns, valid_until_ns, midnight_ns) – swapped as one tuple
+        # so concurrent readers never mix two windows.
+        self._window = (0, -1, 0)
+        self.recomputes = 0
+
+    def _recompute(self, epoch_ns: int) -> int:
+        seconds = epoch_ns // NS_PER_SECOND
+        lt = time.localtime(seconds)
+        since_midnight = lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec
+        midnight_ns = (seconds - since_midnight) * NS_PER_SECOND
+        now_ns = seconds * NS_PER_SECOND
+        self._window = (
+            max(midnight_ns, now_ns - self.revalidate_ns),
+            min(midnight_ns + NS_PER_DAY, now_ns + self.revalidate_ns),
+            midnight_ns,
+        )
+        self.recomputes += 1
+        return midnight_ns
+
+    def since_midnight_ns(self, epoch_ns: int) -> int:
+        valid_from, valid_until, midnight_ns = self._window
+        if not valid_from <= epoch_ns < valid_until:
+            midnight_ns = self._recompute(epoch_ns)
+        return (epoch_ns - midnight_ns) % NS_PER_DAY
@@ -42,7 +42,10 @@ class Timekeeper:
         self._last_sample_time: Optional[float] = None
         self._last_framecount: Optional[int] = None
         # React to Redis events (recording state + fps adjustments)
-        self.redis_controller.redis_parameter_changed.subscribe(self._handle_redis_event)
+        self.redis_controller.redis_parameter_changed.subscribe(
+            self._handle_redis_event,
+            keys=(ParameterKey.REC, ParameterKey.FPS, ParameterKey.FPS_USER),
+        )
     # ------------------------------------------------------------------
     def start(self) -> None:
         """Start the monitoring thread."""
@@ -161,11 +164,11 @@ class Timekeeper:
         adjustment = max(-self.max_adjustment, min(self.max_adjustment, adjustment))
         target_fps = user_fps + adjustment
         target_fps = max(user_fps - self.max_deviation, min(user_fps + self.max_deviation, target_fps))
-        fps_max = self._safe_float(self.redis_controller.get_value(ParameterKey.FPS_MAX.value))
+        fps_max = self.redis_controller.get_float(ParameterKey.FPS_MAX.value)
         if fps_max is not None:
             target_fps = min(target_fps, fps_max)
         target_fps = max(1.0, target_fps)
-        current_fps = self._safe_float(self.redis_controller.get_value(ParameterKey.FPS.value))
+        current_fps = self.redis_controller.get_float(ParameterKey.FPS.value)
         if current_fps is None:
             current_fps = target_fps
         if abs(target_fps - current_fps) < 1e-3:
@@ -190,10 +193,10 @@ class Timekeeper:
             self._last_framecount = framecount
     # ------------------------------------------------------------------
     def _restore_user_fps(self) -> None:
-        user_fps = self._safe_float(self.redis_controller.get_value(ParameterKey.FPS_USER.value))
+        user_fps = self.redis_controller.get_float(ParameterKey.FPS_USER.value)
         if user_fps is None or user_fps <= 0:
             return
-        current_fps = self._safe_float(self.redis_controller.get_value(ParameterKey.FPS.value))
+        current_fps = self.redis_controller.get_float(ParameterKey.FPS.value)
         if current_fps is None:
             current_fps = user_fps
         if abs(current_fps - user_fps) < 1e-3:
@@ -206,18 +209,12 @@ class Timekeeper:
         self.cinepi_controller.update_fps(round(user_fps, 6))
     # ------------------------------------------------------------------
     def _get_framecount(self) -> int:
-        value = self.redis_controller.get_value(ParameterKey.FRAMECOUNT.value, 0)
-        try:
-            return int(float(value))
-        except (TypeError, ValueError):
-            logging.debug("Invalid framecount value %r – defaulting to 0", value)
-            return 0
+        return self.redis_controller.get_int(ParameterKey.FRAMECOUNT.value, 0)
     # ------------------------------------------------------------------
     def _get_user_fps(self) -> Optional[float]:
-        user_value = self.redis_controller.get_value(ParameterKey.FPS_USER.value)
-        fps = self._safe_float(user_value)
+        fps = self.redis_controller.get_float(ParameterKey.FPS_USER.value)
         if fps is None:
-            fps = self._safe_float(self.redis_controller.get_value(ParameterKey.FPS.value))
+            fps = self.redis_controller.get_float(ParameterKey.FPS.value)
         return fps
     # ------------------------------------------------------------------
     def _user_is_changing_fps(self) -> bool:
@@ -231,13 +228,3 @@ class Timekeeper:
         if isinstance(value, str):
             return value.strip() not in {"", "0", "false", "False"}
         return bool(value)
-    # ------------------------------------------------------------------
-    @staticmethod
-    def _safe_float(value) -> Optional[float]:
-        try:
-            if value is None:
-                return None
-            return float(value)
-        except (TypeError, ValueError):
-            logging.debug("Invalid float value %r", value)
-            return None